@@ -2,10 +2,16 @@ from collections import deque
 import sys
 import threading
 import time
-from typing import Union
+from typing import Optional, Union
 
 from classes.protein import Protein
 
+# the reasons a run can stop for, see `BaseAlgorithm.stopped`
+COMPLETED = "completed"
+TIME_BUDGET = "time_budget"
+TARGET_SCORE = "target_score"
+MAX_EVALUATIONS = "max_evaluations"
+
 
 class BaseAlgorithm():
     """A superclass with some common properties and methods used by algorithms
@@ -19,11 +25,20 @@ class BaseAlgorithm():
     verbose: bool
         flag that controls whether the algorithm prints extra information
         while it is running
+    evaluations: int
+        the amount of folds the last run scored
+    stop_reason: Optional[str]
+        why the last run stopped: COMPLETED, TIME_BUDGET, TARGET_SCORE or
+        MAX_EVALUATIONS; None while it is running
 
     Methods
     -------
     log(msg="", start=False, end=False):
         prints a message if the verbose flag is set
+    set_limits(time_budget=None, target_score=None, max_evaluations=None):
+        sets when the next run should stop early
+    stopped(score=None):
+        returns whether the run should stop, and remembers why
 
     """
     def __init__(self, protein: Union[Protein, str]) -> None:
@@ -58,6 +73,11 @@ class BaseAlgorithm():
         self.__log = deque()
         self.__thread = None
 
+        # when to stop a run early, see `set_limits`
+        self.evaluations = 0
+        self.stop_reason = None
+        self.set_limits()
+
     @property
     def protein(self) -> Protein:
         """Returns a copy of the protein this algorithm was initiated with
@@ -124,6 +144,67 @@ class BaseAlgorithm():
         # add message to the queue
         self.__log.append(msg)
 
+    def set_limits(
+        self,
+        time_budget: Optional[float] = None,
+        target_score: Optional[int] = None,
+        max_evaluations: Optional[int] = None
+    ) -> None:
+        """Sets when the run that starts now should stop early, and resets
+        the amount of evaluations and the reason to stop
+
+        Parameters
+        ----------
+        time_budget : float, optional
+            the most seconds to run for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as a fold reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most folds to score, by default no limit
+        """
+        self.evaluations = 0
+        self.stop_reason = None
+        self.__deadline = None
+        if time_budget is not None:
+            self.__deadline = time.monotonic() + time_budget
+        self.__target_score = target_score
+        self.__max_evaluations = max_evaluations
+
+    def stopped(self, score: Optional[int] = None) -> bool:
+        """Returns whether the run should stop, cheap enough to be checked
+        after every evaluation
+
+        Once any limit is reached, the reason is kept in `stop_reason` and
+        the run should stop from then on.
+
+        Parameters
+        ----------
+        score : int, optional
+            the best score found so far, to compare with the target score
+
+        Returns
+        -------
+        bool
+            whether a limit set by `BaseAlgorithm.set_limits` was reached
+        """
+        if self.stop_reason is not None:
+            return True
+
+        if score is not None and self.__target_score is not None and \
+                score <= self.__target_score:
+            self.stop_reason = TARGET_SCORE
+        elif self.__max_evaluations is not None and \
+                self.evaluations >= self.__max_evaluations:
+            self.stop_reason = MAX_EVALUATIONS
+        elif self.__deadline is not None and \
+                time.monotonic() >= self.__deadline:
+            self.stop_reason = TIME_BUDGET
+        else:
+            return False
+
+        return True
+
     def parallel(self) -> Protein:
         """
         Function that must be implemented by any child processes that use
@@ -0,0 +1,363 @@
+from multiprocessing import get_context
+import numpy as np
+import random
+from typing import List, Optional, Union
+
+from algorithms.BaseAlgorithm import COMPLETED, BaseAlgorithm
+from classes import batch
+from classes.chain import Chain, Option
+from classes.conformation import ANGLES
+from classes.protein import Protein
+
+# the column of every turn in the pheromone matrix, by the quarter turns
+# from one direction to the next: straight, left and right; turning back
+# makes aminos overlap, so it has no column
+TURN_COLUMNS = np.array([0, 1, -1, 2])
+
+# the column of the turn from every direction to every next direction
+COLUMNS = {
+    (previous, direction): int(TURN_COLUMNS[
+        (int(ANGLES[direction + 2]) - int(ANGLES[previous + 2])) % 4
+    ])
+    for previous in (-2, -1, 1, 2)
+    for direction in (-2, -1, 1, 2)
+    if direction != -previous
+}
+
+# the sequence every worker builds conformations of, set once per worker by
+# `_keep`
+_sequence = None
+
+
+def _keep(sequence: str) -> None:
+    """Initializer of the worker processes, stores the sequence to build
+    conformations of"""
+    global _sequence
+    _sequence = sequence
+
+
+def _build(task: tuple) -> np.ndarray:
+    """Builds a batch of conformations in a worker process, see `build_ants`
+
+    Parameters
+    ----------
+    task : tuple
+        the pheromone matrix, the amount of conformations, the weights of
+        the pheromone and of the heuristic and the seed of the batch
+    """
+    pheromone, amount, alpha, beta, seed = task
+    return build_ants(
+        _sequence, pheromone, amount, alpha, beta, random.Random(seed)
+    )
+
+
+def turn_columns(directions: np.ndarray) -> np.ndarray:
+    """Returns the column in the pheromone matrix of every turn of many
+    conformations
+
+    Parameters
+    ----------
+    directions : np.ndarray
+        one row of directions per conformation, every conformation must be
+        completely folded
+
+    Returns
+    -------
+    np.ndarray
+        one row per conformation, with the column of the turn into every
+        direction but the first
+    """
+    directions = batch.check_directions(directions)
+    angles = ANGLES[directions[:, :-1] + 2].astype(np.int8)
+    return TURN_COLUMNS[(angles[:, 1:] - angles[:, :-1]) % 4]
+
+
+def build_ants(
+        sequence: str,
+        pheromone: np.ndarray,
+        amount: int,
+        alpha: float = 1.0,
+        beta: float = 2.0,
+        rng: random.Random = random) -> np.ndarray:
+    """Returns the directions of conformations built one amino at a time
+    by ants
+
+    Every amino is placed by turning straight, left or right, picked with
+    odds of the pheromone on that turn of the amino to the power of alpha,
+    times one minus the energy of the bonds the amino forms there to the
+    power of beta. The chains are grown with `Chain.grow`, so they never
+    run into a pocket that is too small for them.
+
+    Parameters
+    ----------
+    sequence : str
+        the types of the aminos, one character per amino
+    pheromone : np.ndarray
+        the pheromone on every turn, a row for every direction but the first
+        and a column for every turn, see `TURN_COLUMNS`
+    amount : int
+        the amount of conformations to build
+    alpha : float, optional
+        the weight of the pheromone, by default 1.0
+    beta : float, optional
+        the weight of the bonds, by default 2.0
+    rng : random.Random, optional
+        the random number generator to use, by default the random module
+
+    Returns
+    -------
+    np.ndarray
+        one row of directions per conformation
+    """
+    chain = Chain(sequence)
+    weights = (pheromone ** alpha).tolist()
+
+    def choose(options: List[Option]) -> Option:
+        index = chain.placed - 1
+        if not index:
+            return options[0]
+
+        previous, row = chain.directions[index - 1], weights[index - 1]
+        odds = [
+            row[COLUMNS[previous, direction]] * (1 - gain) ** beta
+            for direction, gain in options
+        ]
+        return rng.choices(options, odds)[0]
+
+    folds = np.zeros((amount, len(sequence)), dtype=np.int8)
+    for row in folds:
+        chain.grow(choose)
+        row[:] = chain.directions.tolist()
+        while chain.placed > 1:
+            chain.retract()
+
+    return folds
+
+
+class AntColony(BaseAlgorithm):
+    """Ant colony optimisation for folding proteins
+
+    Every iteration, a colony of ants each builds a conformation one amino
+    at a time, picking the turn into every amino by the pheromone on it and
+    by the bonds it forms, see `build_ants`; the whole colony is scored at
+    once, see `batch.evaluate`. Afterwards, the pheromone evaporates and the
+    best ants of the iteration and the best conformation so far lay
+    pheromone on the turns they took, each in proportion to its score
+    relative to the best score so far. The pheromone on every amino never
+    drops below a fraction of its strongest turn, so no turn is ever ruled
+    out. The pheromone is a single matrix, shared by the whole colony and
+    updated all at once.
+
+    Attributes
+    ----------
+    ants: int
+        the amount of conformations to build every iteration
+    alpha: float
+        the weight of the pheromone when picking a turn
+    beta: float
+        the weight of the bonds when picking a turn
+    evaporation: float
+        the fraction of the pheromone that evaporates every iteration
+    deposits: int
+        the amount of the best ants of every iteration that lay pheromone
+    minimum: float
+        the least pheromone on any turn, relative to the strongest turn of
+        the same amino
+    pheromone: np.ndarray
+        the pheromone on every turn after the last run, a row for every
+        direction but the first and a column for straight, left and right
+    iterations: int
+        the amount of iterations the last run did
+    """
+    def __init__(
+        self,
+        protein: Union[Protein, str],
+        ants: int = 50,
+        alpha: float = 1.0,
+        beta: float = 2.0,
+        evaporation: float = 0.2,
+        deposits: int = 5,
+        minimum: float = 0.05
+    ) -> None:
+        """Constructor method for AntColony
+
+        Parameters
+        ----------
+        protein : Union[Protein, str]
+            the protein this algorithm is to run on
+        ants : int, optional
+            the amount of conformations to build every iteration,
+            by default 50
+        alpha : float, optional
+            the weight of the pheromone when picking a turn, by default 1.0
+        beta : float, optional
+            the weight of the bonds when picking a turn, by default 2.0
+        evaporation : float, optional
+            the fraction of the pheromone that evaporates every iteration,
+            by default 0.2
+        deposits : int, optional
+            the amount of the best ants of every iteration that lay
+            pheromone, by default 5
+        minimum : float, optional
+            the least pheromone on any turn, relative to the strongest turn
+            of the same amino, by default 0.05
+        """
+        super().__init__(protein)
+        self.ants = max(1, ants)
+        self.alpha = alpha
+        self.beta = beta
+        self.evaporation = evaporation
+        self.deposits = min(max(0, deposits), self.ants)
+        self.minimum = minimum
+        self.pheromone = np.ones((max(0, len(self.prot_str) - 2), 3))
+        self.iterations = 0
+
+    def build(self, pool=None, processes: int = 1) -> np.ndarray:
+        """Returns the conformations of a colony of ants
+
+        Parameters
+        ----------
+        pool : Pool, optional
+            the worker processes to build parts of the colony in, by default
+            the colony is built in this process
+        processes : int, optional
+            the amount of worker processes in the pool, the amount of parts
+            to build the colony in, by default 1
+
+        Returns
+        -------
+        np.ndarray
+            one row of directions per ant, see `build_ants`
+        """
+        if pool is None:
+            return build_ants(
+                self.prot_str, self.pheromone, self.ants, self.alpha,
+                self.beta
+            )
+
+        tasks = [
+            (self.pheromone, len(part), self.alpha, self.beta,
+             random.getrandbits(32))
+            for part in np.array_split(np.arange(self.ants), processes)
+            if len(part)
+        ]
+        return np.concatenate(pool.map(_build, tasks))
+
+    def update(self, folds: np.ndarray, scores: np.ndarray) -> None:
+        """Evaporates the pheromone and lets the best ants lay pheromone on
+        the turns they took, in place
+
+        Parameters
+        ----------
+        folds : np.ndarray
+            the directions of the ants to lay pheromone, and of no others
+        scores : np.ndarray
+            the score of every ant
+        """
+        pheromone = self.pheromone
+        pheromone *= 1 - self.evaporation
+        if len(folds) and len(pheromone):
+            amounts = scores / min(-1, self.best.score)
+            columns = turn_columns(folds)
+            rows = np.broadcast_to(np.arange(len(pheromone)), columns.shape)
+            np.add.at(pheromone, (rows, columns), amounts[:, None])
+
+        np.maximum(
+            pheromone, self.minimum * pheromone.max(axis=1, keepdims=True),
+            out=pheromone
+        )
+
+    def run(
+        self,
+        iterations: int = 100,
+        verbose: bool = False,
+        processes: int = 1,
+        start_method: Optional[str] = None,
+        time_budget: Optional[float] = None,
+        target_score: Optional[int] = None,
+        max_evaluations: Optional[int] = None
+    ) -> Protein:
+        """Starts the algorithm
+
+        Parameters
+        ----------
+        iterations : int, optional
+            the amount of colonies to build, by default 100
+        verbose : bool, optional
+            whether to log messages to stdout, by default False
+        processes : int, optional
+            the amount of worker processes to build every colony in, by
+            default 1 building it in this process
+        start_method : str, optional
+            how to start the workers, see `ParallelHillClimber.run`;
+            by default the platform default
+        time_budget : float, optional
+            the most seconds to run for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as an ant reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most conformations to build, by default no limit; why the run
+            stopped is kept in `stop_reason`, see `BaseAlgorithm.set_limits`
+
+        Returns
+        -------
+        Protein
+            the best solution found by any ant
+        """
+        self.verbose = verbose
+        self.set_limits(time_budget, target_score, max_evaluations)
+        self.pheromone = np.ones((max(0, len(self.prot_str) - 2), 3))
+        self.iterations = 0
+
+        pool = None
+        if processes > 1:
+            pool = get_context(start_method).Pool(
+                processes, _keep, (self.prot_str,)
+            )
+
+        # the directions and score of the best ant so far
+        elite, elite_score = None, None
+
+        try:
+            # limits are only honoured once an ant built a fold to return
+            while self.iterations < max(1, iterations):
+                if self.best.is_valid and self.stopped(self.best.score):
+                    break
+
+                folds = self.build(pool, processes)
+                scores, _ = batch.evaluate(self.prot_str, folds)
+                self.evaluations += len(folds)
+                self.iterations += 1
+
+                best = np.argmin(scores)
+                if elite is None or scores[best] < elite_score:
+                    elite, elite_score = folds[best].copy(), scores[best]
+                if elite_score <= self.best.score:
+                    self.best = Protein(self.prot_str, elite.tolist())
+
+                # the best ants of the iteration and the best so far
+                picked = np.argsort(scores, kind="stable")[:self.deposits]
+                self.update(
+                    np.concatenate((folds[picked], [elite])),
+                    np.append(scores[picked], elite_score)
+                )
+
+                self.log(
+                    f"iteration: {self.iterations}; " +
+                    f"best score: {self.best.score}; " +
+                    f"mean score: {scores.mean():.2f}",
+                    start=True
+                )
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        if self.stop_reason is None:
+            self.stop_reason = COMPLETED
+        self.log(
+            f"Best solution: {self.best}; score: {self.best.score}; " +
+            f"iterations: {self.iterations}",
+            end=True
+        )
+        return self.best
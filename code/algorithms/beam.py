@@ -0,0 +1,278 @@
+import numpy as np
+import random
+from typing import Optional, Tuple, Union
+
+from algorithms.greedy import greedy
+from classes import batch
+from classes.chain import Chain, FLOOD_LIMIT
+from classes.conformation import ENERGY, NEIGHBOUR_DELTAS, STEPS, TYPE_TABLE
+from classes.protein import Protein
+
+# the directions every partial fold is extended in, and their unit steps
+DIRECTIONS = np.array([-2, -1, 1, 2], dtype=np.int8)
+STEP_X, STEP_Y = STEPS[DIRECTIONS + 2].T
+
+# a partial fold of every candidate: their directions, the coordinates of
+# their aminos, their scores and whether they went straight so far
+Level = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def extend(
+        types: np.ndarray,
+        placed: int,
+        level: Level) -> Tuple[Level, np.ndarray, np.ndarray]:
+    """Places the next amino of many partial folds at once, in every
+    direction that does not make aminos overlap
+
+    Only the bonds of the new amino are scored, and mirror images are skipped
+    by never turning down before turning up; the direction of the first amino
+    of the folds that went straight so far must be right.
+
+    Parameters
+    ----------
+    types : np.ndarray
+        the type of each amino as a code, see `conformation.TYPE_CODES`
+    placed : int
+        the amount of aminos every fold has placed already
+    level : Level
+        the partial folds to extend
+
+    Returns
+    -------
+    Tuple[Level, np.ndarray, np.ndarray]
+        the extended folds, the index of the fold each was extended from and
+        whether each new amino is next to or diagonal from any amino but
+        the two before it, as only those can close off a pocket
+    """
+    directions, xs, ys, scores, straight = level
+    new_x = xs[:, placed - 1, None] + STEP_X
+    new_y = ys[:, placed - 1, None] + STEP_Y
+
+    # compare the new points to the points of all aminos placed before
+    dx = np.abs(xs[:, None, :placed] - new_x[:, :, None])
+    dy = np.abs(ys[:, None, :placed] - new_y[:, :, None])
+    valid = ~np.any((dx == 0) & (dy == 0), axis=2)
+    valid[straight, 0] = False
+    bonds = (dx[:, :, :-1] + dy[:, :, :-1]) == 1
+    gains = bonds @ ENERGY[types[placed], types[:placed - 1]]
+    touches = np.any(
+        np.maximum(dx[:, :, :-2], dy[:, :, :-2]) == 1, axis=2
+    )
+
+    parents, sides = np.nonzero(valid)
+    directions, xs, ys = directions[parents], xs[parents], ys[parents]
+    directions[:, placed - 1] = DIRECTIONS[sides]
+    xs[:, placed] = new_x[parents, sides]
+    ys[:, placed] = new_y[parents, sides]
+    level = (
+        directions, xs, ys,
+        scores[parents] + gains[parents, sides],
+        straight[parents] & (DIRECTIONS[sides] == 1),
+    )
+    return level, parents, touches[parents, sides]
+
+
+def look_ahead(
+        types: np.ndarray,
+        placed: int,
+        level: Level,
+        depth: int) -> np.ndarray:
+    """Returns the best score every partial fold can reach by placing up to
+    depth more aminos, trying every way to place them
+
+    Parameters
+    ----------
+    types : np.ndarray
+        the type of each amino as a code, see `conformation.TYPE_CODES`
+    placed : int
+        the amount of aminos every fold has placed already
+    level : Level
+        the partial folds to look ahead from
+    depth : int
+        the most aminos to place, fewer when the protein is done before
+
+    Returns
+    -------
+    np.ndarray
+        the best score of every fold, infinite for folds that run into a
+        dead end before then
+    """
+    best = level[3].astype(float)
+    steps = min(depth, len(types) - placed)
+    if steps <= 0:
+        return best
+
+    origins = np.arange(len(best))
+    for step in range(steps):
+        level, parents, _ = extend(types, placed + step, level)
+        origins = origins[parents]
+
+    best[:] = np.inf
+    np.minimum.at(best, origins, level[3])
+    return best
+
+
+def has_room(
+        xs: np.ndarray,
+        ys: np.ndarray,
+        placed: int,
+        limit: Optional[int] = None) -> bool:
+    """Returns whether there are enough empty points connected to the last
+    placed amino of a partial fold to place the rest of the aminos
+
+    Parameters
+    ----------
+    xs : np.ndarray
+        the x coordinate of every amino of the fold
+    ys : np.ndarray
+        the y coordinate of every amino of the fold
+    placed : int
+        the amount of aminos placed so far
+    limit : int, optional
+        the most empty points to count, by default as many as there are
+        aminos left
+
+    Returns
+    -------
+    bool
+        whether the empty points around the last placed amino hold at least
+        as many points as there are aminos left, or as the limit
+    """
+    needed = len(xs) - placed
+    if limit is not None:
+        needed = min(needed, limit)
+    taken = set(zip(xs[:placed].tolist(), ys[:placed].tolist()))
+    frontier = [(int(xs[placed - 1]), int(ys[placed - 1]))]
+    found = 0
+    while frontier and found < needed:
+        x, y = frontier.pop()
+        for step_x, step_y in NEIGHBOUR_DELTAS:
+            point = (x + step_x, y + step_y)
+            if point not in taken:
+                taken.add(point)
+                frontier.append(point)
+                found += 1
+
+    return found >= needed
+
+
+def beam_search(
+        protein: Union[Protein, str],
+        width: int = 10,
+        depth: int = 1,
+        rng: random.Random = random) -> Protein:
+    """Folds the aminos that are not folded yet one at a time, keeping the
+    best partial folds at every step
+
+    Every step, each of the partial folds in the beam is extended by one
+    amino in every direction, all at once, and the best of them by the score
+    they can reach within the next aminos are kept, see `look_ahead`; ties
+    are broken at random. A width of 1 without looking ahead folds greedily.
+    Folds that run into a dead end within the aminos looked ahead at, or
+    that closed themselves off in a pocket too small for the rest of the
+    chain, are dropped; pockets larger than `chain.FLOOD_LIMIT` are not
+    looked for. When every fold of the beam runs into a dead end anyway, the
+    best of them is taken back one, two, four... aminos at a time until the
+    rest has room, and the rest is folded greedily, see `greedy.greedy`.
+
+    Parameters
+    ----------
+    protein : Union[Protein, str]
+        the protein to fold, which is folded in place; the directions it
+        already has up to the first 0 are kept
+    width : int, optional
+        the amount of partial folds to keep at every step, by default 10
+    depth : int, optional
+        the amount of aminos to look ahead, by default 1; every step looks
+        at up to width * 4 * 3 ** depth partial folds
+    rng : random.Random, optional
+        the random number generator to break ties with,
+        by default the random module
+
+    Returns
+    -------
+    Protein
+        the folded protein
+
+    Raises
+    ------
+    ValueError
+        raises a ValueError when the directions the protein already has
+        leave no room for the rest of the aminos
+    """
+    # massage protein to Protein if a string was given
+    if isinstance(protein, str):
+        protein = Protein(protein)
+
+    if not isinstance(protein, Protein):
+        raise TypeError(
+            f"positional parameter 'protein' must be a Protein object, "
+            f" was {protein}."
+        )
+
+    old = protein.directions
+    chain = Chain(protein.types, old)
+    length, placed = len(chain), chain.placed
+    if placed == length:
+        return protein
+
+    # start from the aminos that are placed already, skipping mirror images
+    # only when there are none
+    types = np.frombuffer(
+        protein.types.encode("ascii", "replace").translate(TYPE_TABLE),
+        dtype=np.int8
+    )
+    directions = np.array([chain.directions], dtype=np.int8)
+    xs, ys = batch.coordinates(directions)
+    if placed == 1:
+        directions[0, 0] = 1
+        xs[0, 1], placed = 1, 2
+    level = (
+        directions, xs.astype(np.intc), ys.astype(np.intc),
+        np.array([chain.score]), np.array([chain.placed == 1])
+    )
+    jitter = np.random.default_rng(rng.getrandbits(64))
+    width = max(1, width)
+
+    while placed < length:
+        children, _, touches = extend(types, placed, level)
+        reach = look_ahead(types, placed + 1, children, depth)
+        alive = np.flatnonzero(reach < np.inf)
+        if not alive.size:
+            break
+
+        # the best children that are not trapped in a small pocket, ties
+        # broken at random
+        keys = reach[alive] + jitter.random(alive.size)
+        keep = []
+        for child in alive[np.argsort(keys)]:
+            if not touches[child] or has_room(
+                    children[1][child], children[2][child], placed + 1,
+                    FLOOD_LIMIT):
+                keep.append(child)
+                if len(keep) == width:
+                    break
+        if not keep:
+            break
+        level = tuple(values[keep] for values in children)
+        placed += 1
+
+    if placed == length:
+        best = level[0][np.argmin(level[3])]
+    else:
+        # the beam ran into a dead end, take the best fold back until the
+        # rest fits
+        best, xs, ys = (values[0] for values in level[:3])
+        back = 1
+        start = max(chain.placed, placed - back)
+        while start > chain.placed and not has_room(xs, ys, start):
+            back *= 2
+            start = max(chain.placed, placed - back)
+        prefix = best[:start - 1].tolist() + [0] * (length - start + 1)
+        best = greedy(Protein(protein.types, prefix), rng).directions
+
+    protein.apply_move({
+        index: int(direction) for index, direction in enumerate(best)
+        if direction != old[index]
+    })
+    return protein
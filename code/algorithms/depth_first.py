@@ -1,9 +1,20 @@
-from collections import deque
-from typing import Union
+from typing import List, Optional, Sequence, Tuple, Union
 
-from algorithms.BaseAlgorithm import BaseAlgorithm
+from algorithms.BaseAlgorithm import COMPLETED, BaseAlgorithm
+from classes.chain import Chain
+from classes.conformation import (
+    BOND_ENERGY, NEIGHBOUR_DELTAS, TYPE_CODES, Conformation
+)
 from classes.protein import Protein
 
+# the most bonds an amino can form, in the middle or at the end of the chain
+MAX_BONDS = 2
+MAX_END_BONDS = 3
+
+# the energy of the weakest bond, and of the strongest
+HH_ENERGY = BOND_ENERGY[TYPE_CODES["H"]][TYPE_CODES["H"]]
+CC_ENERGY = BOND_ENERGY[TYPE_CODES["C"]][TYPE_CODES["C"]]
+
 
 class DepthFirstFold(BaseAlgorithm):
     """
@@ -11,12 +22,31 @@ class DepthFirstFold(BaseAlgorithm):
     of possible folds in order to find the most stable solution.
 
     Exploring the entire state space garuantees that it will find the optimal
-    solution, but this also means that it takes a very long time
+    solution, but this also means that it takes a very long time. To speed it
+    up, folds that cannot be completed to beat the best solution found so far
+    are skipped, together with every fold that would follow from them.
+
+    Attributes
+    ----------
+    visited: int
+        the amount of folds explored by the last run
+    pruned: int
+        the amount of folds the last run skipped exploring any further
+    solutions: int
+        the amount of complete folds the last run found
+    shared: Optional[Value]
+        the best score found by any process searching the same protein,
+        see `ParallelDepthFirstFold`; None when searching alone
 
     Methods
     -------
-    run(verbose=False):
+    run(verbose=False, prune=True, time_budget=None, target_score=None,
+        max_evaluations=None):
         starts the algorithm
+    prefixes(depth):
+        returns the directions the search tree splits into at a depth
+    parallel(prefix, prune=True):
+        searches only the folds that start with the given directions
 
     """
     def __init__(self, prot: Union[str, Protein]) -> None:
@@ -35,46 +65,382 @@ class DepthFirstFold(BaseAlgorithm):
         """
         super().__init__(prot)
 
-        # create stack, and add root protein to it
-        self.__stack = deque()
-        self.__stack.append(self.protein)
+        # the bonds the aminos from every index onwards could still form,
+        # and the best solution of the current run
+        self.__slots = []
+        self.__best_score = None
+        self.__best_directions = None
+        self.visited = 0
+        self.pruned = 0
+        self.solutions = 0
+        self.shared = None
 
-    def run(self, verbose=False):
-        """Runs the main algorithm
+    @staticmethod
+    def slots(conformation: Union[Chain, Conformation]) -> List[Tuple[int, int, int, int]]:
+        """Returns how many bonds the aminos from every index onwards could
+        form at most, split by the parity of their index
+
+        Every amino forms at most two bonds, or three at the end of the chain.
+        As the lattice is a checkerboard, aminos at even indices only bond
+        with aminos at odd indices, and the other way around.
+
+        Parameters
+        ----------
+        conformation : Union[Chain, Conformation]
+            the conformation to count the bonds for
+
+        Returns
+        -------
+        List[Tuple[int, int, int, int]]
+            the bonds of the aminos at even and odd indices, and of only the
+            C aminos at even and odd indices; for every index and an extra
+            index after the last amino
         """
-        self.verbose = verbose
-        count = 0
+        types = conformation.types
+        length = len(types)
+        slots = [(0, 0, 0, 0)] * (length + 1)
+        for k in range(length - 1, -1, -1):
+            bonds = MAX_END_BONDS if k in (0, length - 1) else MAX_BONDS
+            count = list(slots[k + 1])
+            if types[k]:
+                count[k % 2] += bonds
+            if types[k] == TYPE_CODES["C"]:
+                count[2 + k % 2] += bonds
+            slots[k] = tuple(count)
 
-        # loop door de stack
-        while self.__stack:
-            curr = self.__stack.pop()
-            curr_amino = curr.next_uninitialized()
+        return slots
 
-            # there are nu uninitiated aminos available
-            # there is a solution
-            if curr_amino is None:
-                count += 1
-                self.log(f"found {count} solutions", start=True)
+    @staticmethod
+    def free(
+            conformation: Union[Chain, Conformation],
+            index: int,
+            x: int,
+            y: int,
+            free: Sequence[int]) -> List[int]:
+        """Returns the amount of empty points next to the placed aminos, after
+        placing the next amino at the given point
 
-                if self.best is None or curr.score <= self.best.score:
-                    self.best = curr
-                continue
+        Parameters
+        ----------
+        conformation : Union[Chain, Conformation]
+            the conformation being placed
+        index : int
+            the index of the amino to place
+        x : int
+            the x coordinate to place the amino at
+        y : int
+            the y coordinate to place the amino at
+        free : Sequence[int]
+            the empty points next to the aminos placed before, split the same
+            way as `DepthFirstFold.slots`
 
+        Returns
+        -------
+        List[int]
+            the empty points next to the placed aminos, including the new one
+        """
+        types, at = conformation.types, conformation.at
+        free = list(free)
+        for step_x, step_y in NEIGHBOUR_DELTAS:
+            other = at(x + step_x, y + step_y)
+            if other < 0:
+                other = index
+                change = 1
             else:
-                # loop through possible solutions
-                for direction in curr.foldoptions(curr_amino):
-                    if curr.empty_coordinate(curr_amino, direction):
-                        # for each possible solution, there is a copy made
-                        # the copy gets folded in the currenct direction
-                        nxt_prot = Protein.copy(curr)
-                        nxt_prot.fold(curr_amino.index, direction)
-
-                        # the copy goes on top of the stack
-                        self.__stack.append(nxt_prot)
-                    else:
-                        # if there are no valid direction we continue
-                        # to the next protein-possibility in the stack
-                        continue
-
-        self.log(f"Best solution: {self.best.score}", end=True)
+                change = -1
+
+            if types[other]:
+                free[other % 2] += change
+            if types[other] == TYPE_CODES["C"]:
+                free[2 + other % 2] += change
+
+        return free
+
+    @staticmethod
+    def bound(free: Sequence[int], slots: Sequence[int]) -> int:
+        """Returns the lowest score the aminos that are not placed yet could
+        still add
+
+        The bonds between placed aminos and the rest are limited by the empty
+        points next to the placed aminos; every other bond is between two
+        aminos that are not placed yet, and takes up a bond of both.
+
+        Parameters
+        ----------
+        free : Sequence[int]
+            the empty points next to the placed aminos, see
+            `DepthFirstFold.free`
+        slots : Sequence[int]
+            the bonds the aminos that are not placed yet could form, see
+            `DepthFirstFold.slots`
+
+        Returns
+        -------
+        int
+            a lower bound for the score the rest of the chain adds
+        """
+        counts = []
+        for kind in (0, 2):
+            free_even, free_odd = free[kind:kind + 2]
+            even, odd = slots[kind:kind + 2]
+            placed_even, placed_odd = min(free_odd, even), min(free_even, odd)
+            counts.append(
+                placed_even + placed_odd +
+                max(0, min(even - placed_even, odd - placed_odd))
+            )
+
+        # every bond scores at least H-H, and C-C bonds score extra
+        bonds, c_bonds = counts
+        return bonds * HH_ENERGY + c_bonds * (CC_ENERGY - HH_ENERGY)
+
+    def prefixes(self, depth: int) -> List[Tuple[int, ...]]:
+        """Returns the directions of the first aminos of every fold, up to
+        a depth
+
+        Parameters
+        ----------
+        depth : int
+            the amount of directions of every prefix, at most the amount of
+            aminos minus one
+
+        Returns
+        -------
+        List[Tuple[int, ...]]
+            the prefixes that do not make aminos overlap, the ones that bond
+            the most first
+        """
+        chain = Chain(self.prot_str)
+        depth = min(depth, len(chain) - 1)
+        prefixes = []
+
+        def extend():
+            if chain.placed > depth:
+                prefixes.append(
+                    (chain.score, tuple(chain.directions[:depth]))
+                )
+                return
+            for direction in chain.options():
+                if chain.extend(direction) is not None:
+                    extend()
+                    chain.retract()
+
+        extend()
+        return [prefix for _, prefix in sorted(prefixes)]
+
+    def parallel(self, prefix: Tuple[int, ...], prune: bool = True) -> dict:
+        """Searches only the folds that start with the given directions,
+        to be run in parallel; can also be called directly
+
+        Parameters
+        ----------
+        prefix : Tuple[int, ...]
+            the directions of the first aminos, see `DepthFirstFold.prefixes`
+        prune : bool, optional
+            whether to skip folds that cannot beat the best solution so far,
+            including the solutions of other processes; by default True
+
+        Returns
+        -------
+        dict
+            the prefix, the score and directions of the best solution found
+            after it, and the counters of this search; as only primitive
+            types can be sent between processes. The score and directions
+            are None when no solution beat the best of another process.
+            The search stops early at the limits set before, see
+            `BaseAlgorithm.set_limits`, which counts only this search.
+        """
+        self.visited = self.pruned = self.solutions = 0
+        self.evaluations, self.stop_reason = 0, None
+        found = self.__search(None, prune, prefix)
+        return {
+            "prefix": tuple(prefix),
+            "score": self.best.score if found else None,
+            "directions": self.best.directions if found else None,
+            "visited": self.visited,
+            "pruned": self.pruned,
+            "solutions": self.solutions,
+            "stop_reason": self.stop_reason or COMPLETED,
+        }
+
+    def __search(
+            self,
+            limit: Optional[int],
+            prune: bool = True,
+            prefix: Tuple[int, ...] = ()) -> bool:
+        """Explores every fold, skipping the ones that cannot score below
+        the limit or the best solution found so far
+
+        A single chain is placed one amino at a time and taken back again
+        when going back up the tree, keeping the score of the aminos placed
+        so far along the way. The fold that adds the most bonds is explored
+        first, as a good solution early on lets more folds be skipped.
+
+        Parameters
+        ----------
+        limit : Optional[int]
+            only look for solutions scoring below this, None for any score
+        prune : bool, optional
+            whether to skip folds that cannot score below the limit or the
+            best solution so far, by default True
+        prefix : Tuple[int, ...], optional
+            only explore the folds starting with these directions,
+            by default every fold
+
+        Returns
+        -------
+        bool
+            whether a solution was found
+        """
+        chain = Chain(self.prot_str)
+        self.__slots = self.slots(chain)
+        self.__best_score = limit
+        self.__best_directions = None
+        self.visited += 1
+
+        # place the prefix, keeping track of the empty points along the way
+        free = self.free(chain, 0, 0, 0, (0, 0, 0, 0))
+        for direction in prefix:
+            free = self.free(chain, chain.placed, *chain.neighbour(direction), free)
+            if chain.extend(direction) is None:
+                return False
+
+        self.__extend(chain, free, prune)
+
+        if self.__best_directions is None:
+            return False
+        self.best = Protein(self.prot_str, self.__best_directions)
+        return True
+
+    def __extend(self, chain: Chain, free: Sequence[int], prune: bool):
+        """Places the rest of the chain in every possible way, recursively
+
+        Parameters
+        ----------
+        chain : Chain
+            the chain placed so far, it is back the way it was on return
+        free : Sequence[int]
+            the empty points next to the placed aminos, see
+            `DepthFirstFold.free`
+        prune : bool
+            whether to skip folds that cannot beat the best solution so far
+        """
+        # stop going down the tree once a limit is reached, but not before
+        # there is a solution to return
+        if self.__found() and self.stopped(self.__best_score):
+            return
+
+        # there are no aminos left to place, so this is a solution
+        if chain.is_complete():
+            self.solutions += 1
+            self.log(f"found {self.solutions} solutions", start=True)
+
+            if self.__best_score is None or chain.score <= self.__best_score:
+                self.__best_directions = chain.directions[:]
+                self.__best_score = chain.score
+                self.__share(chain.score)
+            return
+
+        # another process may have found a better solution in the meantime
+        if self.shared is not None:
+            shared = self.shared.value
+            if self.__best_score is None or shared < self.__best_score:
+                self.__best_score = shared
+
+        # score the next amino on each empty point before placing it
+        folds = []
+        index = chain.placed
+        for direction in chain.options():
+            gain = chain.gain(direction)
+            if gain is not None:
+                point = chain.neighbour(direction)
+                folds.append(
+                    (gain, direction, self.free(chain, index, *point, free))
+                )
+
+        # skip the folds for which even the best bonds of the aminos after
+        # them cannot beat the best solution so far
+        types = chain.types
+        for gain, direction, next_free in sorted(folds):
+            if prune and self.__best_score is not None:
+                # the amino after the next takes up one of the empty points
+                bound_free = list(next_free)
+                if index < len(chain) - 1:
+                    bound_free[index % 2] -= types[index] != 0
+                    bound_free[2 + index % 2] -= \
+                        types[index] == TYPE_CODES["C"]
+
+                bound = self.bound(bound_free, self.__slots[index + 1])
+                if chain.score + gain + bound >= self.__best_score:
+                    self.pruned += 1
+                    continue
+
+            chain.extend(direction, gain)
+            self.visited += 1
+            self.evaluations += 1
+            self.__extend(chain, next_free, prune)
+            chain.retract()
+            if self.stop_reason is not None:
+                return
+
+    def __found(self) -> bool:
+        """Returns whether this search or any other process found a
+        solution yet; no solution scores above 0, which the shared score is
+        until one is found"""
+        if self.__best_directions is not None:
+            return True
+        return self.shared is not None and self.shared.value <= 0
+
+    def __share(self, score: int) -> None:
+        """Shares a new best score with the other processes, if any"""
+        if self.shared is None:
+            return
+        with self.shared.get_lock():
+            if score < self.shared.value:
+                self.shared.value = score
+
+    def run(
+        self,
+        verbose: bool = False,
+        prune: bool = True,
+        time_budget: Optional[float] = None,
+        target_score: Optional[int] = None,
+        max_evaluations: Optional[int] = None
+    ) -> Protein:
+        """Runs the main algorithm
+
+        Parameters
+        ----------
+        verbose : bool, optional
+            whether to log messages to stdout, by default False
+        prune : bool, optional
+            whether to skip folds that cannot beat the best solution,
+            by default True
+        time_budget : float, optional
+            the most seconds to search for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as a solution reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most folds to visit, by default no limit; why the search
+            stopped is kept in `stop_reason`, see `BaseAlgorithm.set_limits`
+
+        Returns
+        -------
+        Protein
+            the best solution, which is only sure to be the best of all
+            when the whole tree was searched
+        """
+        self.verbose = verbose
+        self.visited = self.pruned = self.solutions = 0
+        self.set_limits(time_budget, target_score, max_evaluations)
+        self.__search(None, prune)
+        if self.stop_reason is None:
+            self.stop_reason = COMPLETED
+
+        self.log(
+            f"Best solution: {self.best.score}; " +
+            f"visited {self.visited} folds, pruned {self.pruned}; " +
+            f"stopped: {self.stop_reason}",
+            end=True
+        )
         return self.best
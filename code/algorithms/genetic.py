@@ -0,0 +1,341 @@
+from multiprocessing import get_context
+import numpy as np
+import random
+from typing import Optional, Tuple, Union
+
+from algorithms.BaseAlgorithm import COMPLETED, BaseAlgorithm
+from algorithms.random_protein import random_folds
+from classes import batch
+from classes.conformation import ANGLES
+from classes.protein import Protein
+
+# the directions an amino can be folded in, and the index of every direction
+# in it by direction + 2
+DIRECTIONS = np.array([-2, -1, 1, 2], dtype=np.int8)
+INDICES = np.array([0, 1, 0, 2, 3], dtype=np.int8)
+
+# every direction turned counter-clockwise by 0 to 3 quarter turns, by the
+# amount of turns and direction + 2; 0 stays 0
+BY_ANGLE = np.array([1, 2, -1, -2], dtype=np.int8)
+ROTATIONS = np.array([
+    np.where(np.arange(5) == 2, 0, BY_ANGLE[(ANGLES + turns) % 4])
+    for turns in range(4)
+], dtype=np.int8)
+
+# the fitness of a conformation in which aminos overlap, worse than any score
+INVALID = 1
+
+# the sequence every worker scores conformations of, set once per worker by
+# `_keep`
+_sequence = None
+
+
+def _keep(sequence: str) -> None:
+    """Initializer of the worker processes, stores the sequence to score
+    conformations of"""
+    global _sequence
+    _sequence = sequence
+
+
+def _evaluate(directions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Scores and validates part of a population in a worker process, see
+    `batch.evaluate`"""
+    return batch.evaluate(_sequence, directions)
+
+
+class GeneticAlgorithm(BaseAlgorithm):
+    """Genetic algorithm for folding proteins
+
+    The whole population is a single matrix with a row of directions per
+    conformation, which is scored all at once, see `batch.evaluate`; no
+    Protein is made but for the best solution. Every generation, parents are
+    picked by tournament, cut at a random point and joined into children,
+    after which a few directions are changed at random. Children in which
+    aminos overlap are repaired by turning the rest of the chain around the
+    amino before the first overlap, a few times over; the ones that still
+    overlap get the worst fitness. The best conformations of every
+    generation are carried over to the next unchanged.
+
+    Attributes
+    ----------
+    size: int
+        the amount of conformations in the population
+    elite: int
+        the amount of the best conformations carried over to every next
+        generation unchanged
+    tournament: int
+        the amount of conformations that compete to be picked as a parent
+    crossover: float
+        the chance that a child is made by joining two parents, rather than
+        copying one
+    mutation: float
+        the chance that any direction of a child is changed
+    repairs: int
+        the most times to turn the rest of a child to repair it
+    population: np.ndarray
+        the directions of every conformation of the last generation
+    fitness: np.ndarray
+        the score of every conformation of the last generation, INVALID for
+        those in which aminos overlap
+    generations: int
+        the amount of generations the last run bred
+    """
+    def __init__(
+        self,
+        protein: Union[Protein, str],
+        size: int = 200,
+        elite: int = 2,
+        tournament: int = 3,
+        crossover: float = 0.9,
+        mutation: Optional[float] = None,
+        repairs: int = 5
+    ) -> None:
+        """Constructor method for GeneticAlgorithm
+
+        Parameters
+        ----------
+        protein : Union[Protein, str]
+            the protein this algorithm is to run on
+        size : int, optional
+            the amount of conformations in the population, by default 200
+        elite : int, optional
+            the amount of the best conformations carried over to every next
+            generation unchanged, by default 2
+        tournament : int, optional
+            the amount of conformations that compete to be picked as
+            a parent, by default 3
+        crossover : float, optional
+            the chance that a child is made by joining two parents,
+            by default 0.9
+        mutation : float, optional
+            the chance that any direction of a child is changed, by default
+            one over the amount of directions
+        repairs : int, optional
+            the most times to turn the rest of a child to repair it,
+            by default 5
+        """
+        super().__init__(protein)
+        length = len(self.prot_str)
+        self.size = max(2, size)
+        self.elite = min(max(0, elite), self.size - 1)
+        self.tournament = max(1, tournament)
+        self.crossover = crossover
+        self.mutation = 1 / max(1, length - 1) if mutation is None \
+            else mutation
+        self.repairs = repairs
+        self.population = np.zeros((0, length), dtype=np.int8)
+        self.fitness = np.zeros(0, dtype=np.int64)
+        self.generations = 0
+
+    def select(self, amount: int, rng: np.random.Generator) -> np.ndarray:
+        """Returns the indices of the winners of an amount of tournaments,
+        each between conformations picked at random"""
+        entrants = rng.integers(len(self.fitness), size=(amount, self.tournament))
+        winners = np.argmin(self.fitness[entrants], axis=1)
+        return entrants[np.arange(amount), winners]
+
+    def breed(self, amount: int, rng: np.random.Generator) -> np.ndarray:
+        """Returns an amount of children of the population
+
+        Parameters
+        ----------
+        amount : int
+            the amount of children to breed
+        rng : np.random.Generator
+            the random number generator to use
+
+        Returns
+        -------
+        np.ndarray
+            the directions of every child, which may make aminos overlap
+        """
+        length = self.population.shape[1]
+        children = self.population[self.select(amount, rng)]
+
+        # join the start of every child to the end of another parent
+        if length > 2:
+            others = self.population[self.select(amount, rng)]
+            cuts = rng.integers(1, length - 1, size=amount)
+            cuts[rng.random(amount) >= self.crossover] = length
+            tails = np.arange(length) >= cuts[:, None]
+            children[tails] = others[tails]
+
+        # change directions to any of the three other directions
+        mutate = rng.random((amount, length - 1)) < self.mutation
+        if mutate.any():
+            folded = children[:, :-1]
+            shift = rng.integers(1, 4, size=np.count_nonzero(mutate))
+            folded[mutate] = DIRECTIONS[
+                (INDICES[folded[mutate] + 2] + shift) % 4
+            ]
+
+        return children
+
+    def repair(self, children: np.ndarray, rng: np.random.Generator) -> None:
+        """Turns the rest of every child in which aminos overlap around the
+        amino before the first overlap, in place, a few times over
+
+        All three ways to turn the directions from that amino onwards are
+        tried at once, keeping the one that overlaps last or not at all, ties
+        broken at random; see `batch.overlaps`.
+        """
+        count, length = children.shape
+        rows = np.arange(count)
+        first = batch.overlaps(children)
+        for _ in range(self.repairs):
+            overlapping = first > 0
+            rows, first = rows[overlapping], first[overlapping]
+            if not rows.size:
+                return
+
+            folds = children[rows][:, None, :]
+            tails = np.arange(length) >= first[:, None, None] - 1
+            turns = np.arange(1, 4)[None, :, None]
+            turned = np.where(tails, ROTATIONS[turns, folds + 2], folds)
+            overlaps = batch.overlaps(turned.reshape(-1, length))
+            overlaps = overlaps.reshape(-1, 3)
+            overlaps[overlaps < 0] = length
+            best = np.argmax(overlaps + rng.random(overlaps.shape), axis=1)
+
+            picked = np.arange(rows.size)
+            children[rows] = turned[picked, best]
+            first = overlaps[picked, best]
+            first[first == length] = -1
+
+    def __keep_best(self) -> None:
+        """Keeps the best conformation of the population as the best
+        solution, if it is valid and at least as good, so it also replaces
+        the unfolded protein the algorithm started with"""
+        best = np.argmin(self.fitness)
+        if self.fitness[best] != INVALID and \
+                self.fitness[best] <= self.best.score:
+            self.best = Protein(self.prot_str, self.population[best].tolist())
+
+    def evaluate(
+            self,
+            population: np.ndarray,
+            pool=None,
+            processes: int = 1) -> np.ndarray:
+        """Returns the fitness of every conformation of a population
+
+        Parameters
+        ----------
+        population : np.ndarray
+            the directions of every conformation
+        pool : Pool, optional
+            the worker processes to score parts of the population in, by
+            default the population is scored in this process
+        processes : int, optional
+            the amount of worker processes in the pool, the amount of parts
+            to score the population in, by default 1
+
+        Returns
+        -------
+        np.ndarray
+            the score of every conformation, INVALID for those in which aminos
+            overlap
+        """
+        if pool is None:
+            scores, valid = batch.evaluate(self.prot_str, population)
+        else:
+            parts = np.array_split(population, processes)
+            results = pool.map(_evaluate, parts)
+            scores = np.concatenate([scores for scores, _ in results])
+            valid = np.concatenate([valid for _, valid in results])
+
+        self.evaluations += len(population)
+        return np.where(valid, scores, INVALID)
+
+    def run(
+        self,
+        generations: int = 1000,
+        verbose: bool = False,
+        processes: int = 1,
+        start_method: Optional[str] = None,
+        time_budget: Optional[float] = None,
+        target_score: Optional[int] = None,
+        max_evaluations: Optional[int] = None
+    ) -> Protein:
+        """Starts the algorithm
+
+        Parameters
+        ----------
+        generations : int, optional
+            the amount of generations to breed, by default 1000
+        verbose : bool, optional
+            whether to log messages to stdout, by default False
+        processes : int, optional
+            the amount of worker processes to score the population in, by
+            default 1 scoring it in this process; only worth it for large
+            populations of long proteins
+        start_method : str, optional
+            how to start the workers, see `ParallelHillClimber.run`;
+            by default the platform default
+        time_budget : float, optional
+            the most seconds to run for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as a conformation reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most conformations to score, by default no limit; why the run
+            stopped is kept in `stop_reason`, see `BaseAlgorithm.set_limits`
+
+        Returns
+        -------
+        Protein
+            the best solution of any generation
+        """
+        self.verbose = verbose
+        self.set_limits(time_budget, target_score, max_evaluations)
+        self.generations = 0
+        rng = np.random.default_rng(random.getrandbits(64))
+
+        pool = None
+        if processes > 1:
+            pool = get_context(start_method).Pool(
+                processes, _keep, (self.prot_str,)
+            )
+
+        try:
+            self.population = random_folds(self.prot_str, self.size)
+            self.fitness = self.evaluate(self.population, pool, processes)
+
+            # limits are only honoured once there is a valid conformation to
+            # return, breeding on past the generations until there is one
+            while self.generations < max(1, generations) or \
+                    not self.best.is_valid:
+                self.__keep_best()
+                if self.best.is_valid and self.stopped(self.best.score):
+                    break
+
+                children = self.breed(self.size - self.elite, rng)
+                self.repair(children, rng)
+                elite = np.argsort(self.fitness, kind="stable")[:self.elite]
+                self.population = np.concatenate(
+                    (self.population[elite], children)
+                )
+                self.fitness = np.concatenate(
+                    (self.fitness[elite], self.evaluate(children, pool, processes))
+                )
+                self.generations += 1
+
+                if self.verbose:
+                    self.log(
+                        f"generation: {self.generations}; " +
+                        f"best score: {self.best.score}; " +
+                        f"mean score: {self.fitness.mean():.2f}",
+                        start=True
+                    )
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        self.__keep_best()
+        if self.stop_reason is None:
+            self.stop_reason = COMPLETED
+        self.log(
+            f"Best solution: {self.best}; score: {self.best.score}; " +
+            f"generations: {self.generations}",
+            end=True
+        )
+        return self.best
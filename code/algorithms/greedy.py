@@ -1,62 +1,59 @@
 import random
+from typing import List, Union
 
-from classes.amino import Amino
+from classes.chain import Chain, Option
 from classes.protein import Protein
-from visualization import visualize_protein
 
 
 def greedy(
-        protein: Protein,
-        prev: Amino = None,
-        faulty_direction: int = None):
-    """
+        protein: Union[Protein, str],
+        rng: random.Random = random) -> Protein:
+    """Folds the aminos that are not folded yet one at a time, each in the
+    direction that adds the most bonds
+
+    Ties are broken at random. Directions that lead into a pocket too small
+    for the rest of the protein are never taken, and the chain backtracks
+    out of the pockets that are too large to find in time, see `Chain.grow`.
 
     Parameters
     ----------
-    protein : Protein
-        the protein to fold randomly
-    prev : Amino
-        the previous amino, should be the first amino uninitialized amino on
-        the first call
-    faulty_direction : int, optional
-        a direction to be pruned from the options to choose from when,
-        backtracking by default None
+    protein : Union[Protein, str]
+        the protein to fold, which is folded in place; the directions it
+        already has up to the first 0 are kept
+    rng : random.Random, optional
+        the random number generator to break ties with,
+        by default the random module
+
+    Returns
+    -------
+    Protein
+        the folded protein
+
+    Raises
+    ------
+    ValueError
+        raises a ValueError when the directions the protein already has
+        leave no room for the rest of the aminos
     """
-
-    # retrieve next uninitialized amino
-    curr = protein.next_uninitialized()
-
-    # check if all amino have been placed
-    if curr is None:
-        return
-    options = protein.foldoptions(curr)
-
-    # chosen path is a dead end
-    if faulty_direction:
-        options.remove(faulty_direction)
-
-    options[:] = [option for option in options
-                  if protein.empty_coordinate(curr, option)]
-
-    if not options:
-        faulty_direction = prev.direction
-        prev.direction = 0
-        greedy(
-            protein,
-            protein.aminos[prev.index - 1] if prev.index > 0 else 0,
-            faulty_direction)
-    else:
-        scores = []
-        for option in options:
-            protein.fold(curr.index, option)
-            score = protein.score
-            scores.append(score)
-        print(f"scores: {scores}")
-        minimum = [index for index, score in enumerate(scores)
-                   if score == min(scores)]
-        print(f"minimum: {minimum}")
-        direction = options[random.choice(minimum)]
-        protein.fold(curr.index, direction)
-        print(protein.grid)
-        visualize_protein(protein)
-        greedy(protein, curr)
+    # massage protein to Protein if a string was given
+    if isinstance(protein, str):
+        protein = Protein(protein)
+
+    if not isinstance(protein, Protein):
+        raise TypeError(
+            f"positional parameter 'protein' must be a Protein object, "
+            f" was {protein}."
+        )
+
+    def best(options: List[Option]) -> Option:
+        lowest = min(gain for _, gain in options)
+        return rng.choice([option for option in options if option[1] == lowest])
+
+    old = protein.directions
+    chain = Chain(protein.types, old)
+    chain.grow(best)
+    protein.apply_move({
+        index: direction for index, direction in enumerate(chain.directions)
+        if direction != old[index]
+    })
+    return protein
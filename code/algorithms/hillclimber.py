@@ -1,15 +1,64 @@
+import numpy as np
 import random
-from typing import Sequence
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
-from algorithms.BaseAlgorithm import BaseAlgorithm
+from algorithms.BaseAlgorithm import COMPLETED, BaseAlgorithm
+from algorithms.moves import check_move_set, neighbourhood, random_move
 from algorithms.random_protein import fold_randomly
+from classes import batch
 from classes.amino import Amino
+from classes.conformation import Move
 from classes.protein import Protein
 
+# the ways to pick the next move: a random move, kept if it is no worse;
+# the best move of the whole neighbourhood; or any move that improves
+MODES = ("random", "steepest", "first")
+
 
 class HillClimber(BaseAlgorithm):
     """A Hill Climber algorithm for folding proteins
+
+    Attributes
+    ----------
+    move_set: str
+        the name of the moves used to fold the protein, see `moves.MOVE_SETS`
     """
+    def __init__(
+        self,
+        protein: Union[Protein, str],
+        move_set: str = "pivot"
+    ) -> None:
+        """Constructor method for HillClimber
+
+        Parameters
+        ----------
+        protein : Union[Protein, str]
+            the protein this algorithm is to run on
+        move_set : str, optional
+            the name of the moves to fold the protein with, can later also be
+            set by run; by default "pivot", folding at a single amino
+
+        Raises
+        ------
+        ValueError
+            raises a ValueError when there's no move set by the given name
+        """
+        super().__init__(protein)
+        check_move_set(move_set)
+        self.move_set = move_set
+
+    def set_move_set(self, move_set: Optional[str]) -> None:
+        """Changes the move set, unless None is given
+
+        Raises
+        ------
+        ValueError
+            raises a ValueError when there's no move set by the given name
+        """
+        if move_set is not None:
+            check_move_set(move_set)
+            self.move_set = move_set
+
     def get_starting_point(self, protein: Protein) -> Protein:
         """Returns a randomly folded copy of the given protein
 
@@ -24,11 +73,56 @@ class HillClimber(BaseAlgorithm):
             a new protein instance with the same amino structure as the given
             protein, and folded randomly at every amino acid
         """
-        protein = Protein.copy(protein)
-        while True:
-            fold_randomly(protein, protein.aminos[0])
-            if protein.is_valid:
-                return protein
+        return fold_randomly(Protein.copy(protein))
+
+    def fold_in_place(
+        self,
+        protein: Protein,
+        aminos: Sequence[Amino]
+    ) -> Optional[List[Move]]:
+        """Folds a Protein randomly at the given aminos, without copying it
+
+        Parameters
+        ----------
+        protein : Protein
+            the protein to fold randomly
+        aminos : Sequence[Amino]
+            the aminos at which point the protein should be folded
+
+        Returns
+        -------
+        Optional[List[Move]]
+            the moves that were made, to pass to `HillClimber.revert`;
+            or None if an amino could not be folded, in which case the
+            protein is left as it was
+        """
+        moves = []
+        for amino in aminos:
+            foldoptions = [
+                option for option in
+                protein.foldoptions(amino.index, completely_random=True)
+                if protein.empty_coordinate(amino.index, option)
+            ]
+            if not foldoptions:
+                self.revert(protein, moves)
+                return None
+            direction = random.choice(foldoptions)
+            moves.append(protein.apply_move([(amino.index, direction)]))
+
+        return moves
+
+    def revert(self, protein: Protein, moves: Sequence[Move]) -> None:
+        """Undoes the given moves, in the reverse order they were made
+
+        Parameters
+        ----------
+        protein : Protein
+            the protein the moves were made on
+        moves : Sequence[Move]
+            the moves to undo
+        """
+        for move in reversed(moves):
+            protein.undo(move)
 
     def fold_n_amino_acids(
         self,
@@ -53,15 +147,8 @@ class HillClimber(BaseAlgorithm):
 
         # copy protein, and fold protein at n amount of places
         protein = Protein.copy(protein)
-        for amino in aminos:
-            foldoptions = protein.foldoptions(amino, completely_random=True)
-            foldoptions[:] =\
-                [option for option in foldoptions if
-                    protein.empty_coordinate(amino, option)]
-            if not foldoptions:
-                return None
-            direction = random.choice(foldoptions)
-            protein.fold(amino.index, direction)
+        if self.fold_in_place(protein, aminos) is None:
+            return None
 
         return protein
 
@@ -78,7 +165,9 @@ class HillClimber(BaseAlgorithm):
         Amino
             Returns the instance of the randomly selected amino
         """
-        return random.choices(protein.aminos[:-1], k=amount)
+        # only create amino objects for the chosen indices
+        indices = random.choices(range(len(protein) - 1), k=amount)
+        return [protein[index] for index in indices]
 
     def fold_randomly(self, protein: Protein, mutations: int = 1):
         """Randomly folds a protein at random places
@@ -99,11 +188,125 @@ class HillClimber(BaseAlgorithm):
         rand_aminos = self.get_random_amino(protein, amount=mutations)
         return self.fold_n_amino_acids(protein, rand_aminos)
 
+    def mutate(
+        self,
+        protein: Protein,
+        mutations: int = 1
+    ) -> Optional[List[Move]]:
+        """Moves a protein in place at random places, keeping it valid
+
+        The moves are taken from the move set of this instance; with the
+        "pivot" move set this is the same as folding at random aminos.
+
+        Parameters
+        ----------
+        protein : Protein
+            the protein to move
+        mutations : int, optional
+            the amount of random moves to make, by default 1
+
+        Returns
+        -------
+        Optional[List[Move]]
+            the moves that were made, to pass to `HillClimber.revert`;
+            or None if they did not result in a valid protein, in which case
+            the protein is left as it was. A protein of a single amino has
+            no moves, and is returned as it is with none made
+        """
+        moves = []
+        if len(protein) < 2:
+            return moves
+
+        for _ in range(mutations):
+            changes = random_move(protein.conformation, self.move_set)
+            if changes is None:
+                self.revert(protein, moves)
+                return None
+            moves.append(protein.apply_move(changes))
+
+        if not protein.is_valid:
+            self.revert(protein, moves)
+            return None
+
+        return moves
+
+    def neighbours(
+        self,
+        protein: Protein
+    ) -> Tuple[List[Dict[int, int]], np.ndarray]:
+        """Returns every move of the move set around every amino
+
+        Parameters
+        ----------
+        protein : Protein
+            the protein to move
+
+        Returns
+        -------
+        Tuple[List[Dict[int, int]], np.ndarray]
+            the moves, and the directions of the protein after each of them,
+            one row per move; the rows may still make aminos overlap
+        """
+        conformation = protein.conformation
+        moves = [
+            move for index in range(len(protein))
+            for move in neighbourhood(conformation, index, self.move_set)
+        ]
+
+        folds = np.tile(
+            np.array(protein.directions, dtype=np.int8), (len(moves), 1)
+        )
+        for row, move in zip(folds, moves):
+            for index, direction in move.items():
+                row[index] = direction
+
+        return moves, folds
+
+    def descend(self, protein: Protein, first: bool = False) -> Optional[Move]:
+        """Makes the best move of the whole neighbourhood of a protein, in
+        place, if it improves the score
+
+        Every move is scored and validated in a single pass, see
+        `batch.evaluate`, so the protein is never moved to try one.
+
+        Parameters
+        ----------
+        protein : Protein
+            the protein to move
+        first : bool, optional
+            whether to make any move that improves the score, rather than the
+            best one; by default False
+
+        Returns
+        -------
+        Optional[Move]
+            the move that was made, or None if no move improves the score,
+            in which case the protein is at a local minimum
+        """
+        moves, folds = self.neighbours(protein)
+        if not moves:
+            return None
+
+        scores, valid = batch.evaluate(protein.types, folds)
+        self.evaluations += len(moves)
+        better = np.flatnonzero(valid & (scores < protein.score))
+        if not better.size:
+            return None
+        if not first:
+            better = better[scores[better] == scores[better].min()]
+
+        return protein.apply_move(moves[random.choice(better)])
+
     def run(
         self,
         runs: int = 10,
         iterations: int = 1000,
-        verbose: bool = False
+        verbose: bool = False,
+        move_set: str = None,
+        mode: str = "random",
+        time_budget: Optional[float] = None,
+        target_score: Optional[int] = None,
+        max_evaluations: Optional[int] = None
     ) -> Protein:
         """Actually starts the hillclimber algorithm
 
@@ -118,6 +321,22 @@ class HillClimber(BaseAlgorithm):
         verbose : bool, optional:
             flag that controls whether to execute logging statements or not,
             by default False
+        move_set : str, optional
+            the name of the moves to fold the protein with, see
+            `moves.MOVE_SETS`; by default the move set of this instance
+        mode : str, optional
+            how to pick the next move, one of `MODES`, by default "random";
+            "steepest" and "first" look at the whole neighbourhood, see
+            `HillClimber.descend`, and stop each run at the first local
+            minimum, or after making as many moves as there are iterations
+        time_budget : float, optional
+            the most seconds to run for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as a fold reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most folds to score, by default no limit; why the run stopped
+            is kept in `stop_reason`, see `BaseAlgorithm.set_limits`
 
         Returns
         -------
@@ -125,18 +344,47 @@ class HillClimber(BaseAlgorithm):
             Returns a valid protein instance with the amino structure
             of the given protein, folded in the shape of the best approximated
             solution
+
+        Raises
+        ------
+        ValueError
+            raises a ValueError when there's no mode by the given name
         """
-        # update verbose flag
+        if mode not in MODES:
+            raise ValueError(
+                f"Unknown mode '{mode}', must be one of {', '.join(MODES)}"
+            )
+
+        # update verbose flag, move set and limits
         self.verbose = verbose
+        self.set_move_set(move_set)
+        self.set_limits(time_budget, target_score, max_evaluations)
 
         # safeguard giving repeat 0 or iterations 0
         runs, iterations = max(1, runs), max(1, iterations)
 
         for s in range(0, runs):
             start = self.get_starting_point(self.protein)
+
+            # move until no move in the neighbourhood improves the score
+            curr_iteration = 0
+            while mode != "random" and curr_iteration < iterations:
+                if self.stopped(start.score):
+                    break
+                self.log(
+                    f"run: {s+1}; iteration {curr_iteration}; " +
+                    f"score: {start.score}",
+                    start=True
+                )
+                if self.descend(start, mode == "first") is None:
+                    break
+                curr_iteration += 1
+
             # proceed till no improvement is found n times
             curr_iteration, no_improvement = 0, 0
-            while no_improvement <= iterations:
+            while mode == "random" and no_improvement <= iterations:
+                if self.stopped(start.score):
+                    break
                 self.log(
                     f"run: {s+1}; iteration {curr_iteration}; " +
                     f" iterations with no improvement: {no_improvement}; "
@@ -144,21 +392,20 @@ class HillClimber(BaseAlgorithm):
                     start=True
                 )
 
-                # fold randomly untill a random fold is reached
-                new_state = None
-                while new_state is None:
-                    new_state = self.fold_randomly(start)
-                    if not Protein.validate(new_state):
-                        new_state = None
+                # fold randomly in place untill a valid fold is reached
+                score, moves = start.score, None
+                while moves is None:
+                    moves = self.mutate(start)
+                self.evaluations += 1
 
                 # compare the score, if an improvement is found
-                # save it and reset the counter
-                if start.score >= new_state.score:
-                    start = Protein.copy(new_state)
-
-                    if start.score > new_state.score:
+                # keep it and reset the counter, undo the fold if it's worse
+                if score >= start.score:
+                    if score > start.score:
                         no_improvement = 0
                         continue
+                else:
+                    self.revert(start, moves)
 
                 # if no improvement is found we increase the counter
                 no_improvement += 1
@@ -172,10 +419,16 @@ class HillClimber(BaseAlgorithm):
                     f"Improved {self.best.score} by " +
                     f"{self.best.score - start.score} to {start.score}",
                 )
-            self.best = Protein.copy(start)
+                self.best = Protein.copy(start)
+
+            if self.stopped(self.best.score):
+                break
 
+        if self.stop_reason is None:
+            self.stop_reason = COMPLETED
         self.log(
-            f"Best solution: {self.best}; score: {self.best.score}",
+            f"Best solution: {self.best}; score: {self.best.score}; " +
+            f"stopped: {self.stop_reason}",
             end=True
         )
         return self.best
@@ -0,0 +1,325 @@
+from array import array
+from collections import OrderedDict
+from math import inf, log, sqrt
+from multiprocessing import cpu_count, get_context
+import random
+from typing import List, Optional, Tuple, Union
+
+from algorithms.BaseAlgorithm import COMPLETED, BaseAlgorithm
+from classes.chain import Chain
+from classes.protein import Protein
+
+# the key of every direction, appended to the key of a node to get the key of
+# its child in that direction
+STEP_KEYS = {
+    direction: array("b", [direction]).tobytes() for direction in (-2, -1, 1, 2)
+}
+
+# the search every worker runs, set once per worker by `_keep`
+_search = None
+
+
+def _keep(search: 'MonteCarloTreeSearch') -> None:
+    """Initializer of the worker processes, stores the search to run, so it
+    is only sent to every worker once"""
+    global _search
+    _search = search
+
+
+def _grow(task: Tuple[int, int, int]) -> dict:
+    """Grows a tree of its own in a worker process, see
+    `MonteCarloTreeSearch.parallel`
+
+    Parameters
+    ----------
+    task : Tuple[int, int, int]
+        the number of the tree, the seed of its random numbers and the amount
+        of iterations to do
+    """
+    tree, seed, iterations = task
+    random.seed(seed)
+    best = _search.parallel(iterations)
+    return {
+        "tree": tree,
+        "directions": best.directions,
+        "evaluations": _search.evaluations,
+        "evictions": _search.evictions,
+    }
+
+
+class MonteCarloTreeSearch(BaseAlgorithm):
+    """Monte Carlo tree search for folding proteins
+
+    Every node of the tree is a fold of the first aminos, and its children
+    place the next amino in each of the directions of `Chain.options` that
+    do not make aminos overlap or lead into a pocket that is too small. Every
+    iteration walks down the tree by UCT, picking the child with the best
+    average score plus a bonus for children that were rarely tried, until
+    it finds a child that was never tried. From there a random fold of the
+    rest of the chain is grown, see `random_protein.random_directions`, and
+    its score is added to every node on the way down.
+
+    The statistics of every node are kept in a table by the directions
+    leading to it. The table holds a bounded amount of nodes; once full,
+    the node that was least recently walked through is forgotten.
+
+    Attributes
+    ----------
+    exploration: float
+        the weight of the bonus for rarely tried children, relative to the
+        best score found so far
+    nodes: int
+        the most nodes to keep statistics of
+    table: OrderedDict
+        the amount of times every node was walked through and the summed
+        score of the folds grown from it, by the directions leading to it,
+        from least to most recently walked through; of the last tree grown
+        in this process
+    evictions: int
+        the amount of nodes the last run forgot
+    """
+    def __init__(
+        self,
+        protein: Union[Protein, str],
+        exploration: float = 0.5,
+        nodes: int = 100000
+    ) -> None:
+        """Constructor method for MonteCarloTreeSearch
+
+        Parameters
+        ----------
+        protein : Union[Protein, str]
+            the protein this algorithm is to run on
+        exploration : float, optional
+            the weight of the bonus for rarely tried children, by default 0.5
+        nodes : int, optional
+            the most nodes to keep statistics of, by default 100000
+        """
+        super().__init__(protein)
+        self.exploration = exploration
+        self.nodes = max(1, nodes)
+        self.table = OrderedDict()
+        self.evictions = 0
+
+    def visit(self, key: bytes) -> List[float]:
+        """Returns the statistics of a node, marking it as the most recently
+        walked through; nodes that are not in the table are added, forgetting
+        the least recently walked through node when it is full"""
+        table = self.table
+        node = table.get(key)
+        if node is None:
+            node = table[key] = [0, 0.0]
+            if len(table) > self.nodes:
+                table.popitem(last=False)
+                self.evictions += 1
+        else:
+            table.move_to_end(key)
+        return node
+
+    def select(
+        self,
+        chain: Chain,
+        key: bytes,
+        parent: List[float],
+        scale: float
+    ) -> Optional[Tuple[int, bytes]]:
+        """Picks the direction to place the next amino in by UCT
+
+        Children that were never tried are picked first, at random.
+
+        Parameters
+        ----------
+        chain : Chain
+            the chain of the node to pick a child of
+        key : bytes
+            the directions leading to the node
+        parent : List[float]
+            the statistics of the node
+        scale : float
+            the size of the best score found so far, to scale the average
+            scores of the children by
+
+        Returns
+        -------
+        Optional[Tuple[int, bytes]]
+            the direction of the child and the directions leading to it, or
+            None if the chain has nowhere left to go
+        """
+        traps = chain.traps()
+        children = [
+            (direction, key + STEP_KEYS[direction])
+            for direction in chain.options()
+            if direction not in traps and chain.gain(direction) is not None
+        ]
+        if not children:
+            return None
+
+        untried = [child for child in children if child[1] not in self.table]
+        if untried:
+            return random.choice(untried)
+
+        bonus = self.exploration * sqrt(log(max(parent[0], 1)))
+        best, choice = -inf, None
+        for child in children:
+            visits, total = self.table[child[1]]
+            value = total / (visits * scale) + bonus / sqrt(visits)
+            if value > best:
+                best, choice = value, child
+        return choice
+
+    def iterate(self, chain: Chain) -> Optional[int]:
+        """Walks down the tree once, grows a random fold from the first node
+        that was never tried and adds its score to the nodes on the way
+
+        Parameters
+        ----------
+        chain : Chain
+            the chain of the root, it is back the way it was on return
+
+        Returns
+        -------
+        Optional[int]
+            the score of the grown fold, or None if the walk ran into a dead
+            end; its directions are kept in the chain while it is grown
+        """
+        root = chain.placed
+        key = chain.directions[:root - 1].tobytes()
+        path = [self.visit(key)]
+        scale = max(1, -self.best.score)
+
+        score = 0
+        while not chain.is_complete():
+            choice = self.select(chain, key, path[-1], scale)
+            if choice is None:
+                score = None
+                break
+
+            direction, key = choice
+            tried = key in self.table
+            chain.extend(direction)
+            path.append(self.visit(key))
+            if not tried:
+                break
+
+        # grow the rest of the fold at random, dead ends score nothing
+        if score is not None:
+            try:
+                chain.grow(random.choice)
+                score = chain.score
+                self.evaluations += 1
+            except ValueError:
+                score = None
+        if score is not None and score <= self.best.score:
+            self.best = Protein(self.prot_str, chain.directions.tolist())
+
+        for node in path:
+            node[0] += 1
+            node[1] -= score or 0
+
+        while chain.placed > root:
+            chain.retract()
+        return score
+
+    def parallel(self, iterations: int = 1000) -> Protein:
+        """Grows a tree of its own, see `MonteCarloTreeSearch.run`; the limits
+        set before are kept, but only this tree is counted"""
+        self.evaluations, self.stop_reason = 0, None
+        self.evictions = 0
+        self.table = OrderedDict()
+
+        # limits are only honoured once there is a fold to return, walking
+        # on past the iterations for as long as every walk ran into a dead end
+        chain = Chain(self.prot_str)
+        i = 0
+        while i < max(1, iterations) or not self.best.is_valid:
+            if self.best.is_valid and self.stopped(self.best.score):
+                break
+            self.iterate(chain)
+            if self.verbose:
+                self.log(
+                    f"iteration: {i}; best score: {self.best.score}; " +
+                    f"nodes: {len(self.table)}",
+                    start=True
+                )
+            i += 1
+
+        return self.best
+
+    def run(
+        self,
+        iterations: int = 1000,
+        verbose: bool = False,
+        processes: int = 1,
+        start_method: Optional[str] = None,
+        time_budget: Optional[float] = None,
+        target_score: Optional[int] = None,
+        max_evaluations: Optional[int] = None
+    ) -> Protein:
+        """Starts the algorithm
+
+        Parameters
+        ----------
+        iterations : int, optional
+            the amount of times to walk down the tree, by default 1000; with
+            several processes, every tree walks down its own tree that often
+        verbose : bool, optional
+            whether to log messages to stdout, by default False
+        processes : int, optional
+            the amount of trees to grow, each in a worker process of its own,
+            by default 1 growing a single tree in this process; None for one
+            less than the amount of cpus
+        start_method : str, optional
+            how to start the workers, see `ParallelHillClimber.run`;
+            by default the platform default
+        time_budget : float, optional
+            the most seconds to run for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as a fold reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most folds to grow, by default no limit; every tree stops at
+            it on its own, and the pool is stopped once all trees together
+            grew as many. Why the run stopped is kept in `stop_reason`, see
+            `BaseAlgorithm.set_limits`
+
+        Returns
+        -------
+        Protein
+            the best solution found by any tree
+        """
+        self.set_limits(time_budget, target_score, max_evaluations)
+        processes = processes or max(1, cpu_count() - 1)
+        if processes == 1:
+            self.verbose = verbose
+            self.parallel(iterations)
+        else:
+            # the workers log nothing, as threads cannot be sent to them
+            self.verbose = False
+            tasks = [
+                (tree, random.getrandbits(32), iterations)
+                for tree in range(processes)
+            ]
+            self.evictions = 0
+            context = get_context(start_method)
+            with context.Pool(processes, _keep, (self,)) as pool:
+                for result in pool.imap_unordered(_grow, tasks):
+                    self.evaluations += result["evaluations"]
+                    self.evictions += result["evictions"]
+                    solution = Protein(self.prot_str, result["directions"])
+                    if solution.is_valid and \
+                            solution.score <= self.best.score:
+                        self.best = solution
+
+                    # leaving the pool stops the trees that are still going
+                    if self.best.is_valid and self.stopped(self.best.score):
+                        break
+            self.verbose = verbose
+
+        if self.stop_reason is None:
+            self.stop_reason = COMPLETED
+        self.log(
+            f"Best solution: {self.best}; score: {self.best.score}; " +
+            f"folds: {self.evaluations}; forgotten nodes: {self.evictions}",
+            end=True
+        )
+        return self.best
@@ -0,0 +1,281 @@
+"""Neighbourhoods of a folded protein, for local search algorithms
+
+Every move function takes a conformation and the index of an amino, and
+returns all moves of its kind around that amino. A move is a dict with the
+new direction of every amino it folds, to pass to `Protein.apply_move`.
+
+Except for pivots, every move only moves a few aminos close together, and
+never makes aminos overlap. Pull moves are complete: any valid fold can be
+reached from any other valid fold by pull moves alone.
+
+See Also
+--------
+`Lesh et al. (2003)
+<https://doi.org/10.1145/640075.640092>`_:
+    A complete and effective move set for simplified protein folding
+"""
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+from classes.conformation import DELTAS, Conformation
+
+# the direction of each unit step
+DIRECTIONS = {
+    step: direction - 2 for direction, step in enumerate(DELTAS) if step != (0, 0)
+}
+
+
+def changes(
+        conformation: Conformation,
+        points: Dict[int, Tuple[int, int]]) -> Dict[int, int]:
+    """Returns the folds that move aminos to the given points
+
+    Parameters
+    ----------
+    conformation : Conformation
+        the conformation the aminos are in
+    points : Dict[int, Tuple[int, int]]
+        the new point of every amino that moves, all of them next to each
+        other in the chain
+
+    Returns
+    -------
+    Dict[int, int]
+        the new direction of every amino whose direction changes
+    """
+    def point(index: int) -> Tuple[int, int]:
+        return points.get(index) or (conformation.x[index], conformation.y[index])
+
+    folds = {}
+    start = max(min(points) - 1, 0)
+    stop = min(max(points) + 1, len(conformation) - 1)
+    for i in range(start, stop):
+        (x, y), (next_x, next_y) = point(i), point(i + 1)
+        direction = DIRECTIONS[(next_x - x, next_y - y)]
+        if direction != conformation.directions[i]:
+            folds[i] = direction
+
+    return folds
+
+
+def pivots(conformation: Conformation, index: int) -> List[Dict[int, int]]:
+    """Returns the folds that turn the chain after an amino around it
+
+    Only checks that the next amino does not overlap, the rest of the chain
+    may still overlap after the fold.
+    """
+    if index >= len(conformation) - 1:
+        return []
+
+    return [
+        {index: direction} for direction in
+        conformation.foldoptions(index, completely_random=True)
+        if conformation.is_empty(index, direction)
+    ]
+
+
+def end_moves(conformation: Conformation, index: int) -> List[Dict[int, int]]:
+    """Returns the moves of the first or last amino to any empty point
+    next to its only neighbour in the chain"""
+    length = len(conformation)
+    if length < 2 or index not in (0, length - 1):
+        return []
+
+    other = 1 if index == 0 else length - 2
+    x, y = conformation.x[other], conformation.y[other]
+    return [
+        changes(conformation, {index: (x + step_x, y + step_y)})
+        for step_x, step_y in DIRECTIONS
+        if conformation.at(x + step_x, y + step_y) < 0
+    ]
+
+
+def corner_flips(
+        conformation: Conformation,
+        index: int) -> List[Dict[int, int]]:
+    """Returns the move of an amino in a corner to the opposite corner"""
+    if not 0 < index < len(conformation) - 1:
+        return []
+
+    before, after = conformation.directions[index - 1:index + 1]
+    if not before or not after or before == after or before == -after:
+        return []
+
+    x, y = conformation.neighbour(index - 1, after)
+    if conformation.at(x, y) >= 0:
+        return []
+    return [{index - 1: after, index: before}]
+
+
+def crankshafts(
+        conformation: Conformation,
+        index: int) -> List[Dict[int, int]]:
+    """Returns the move of an amino and the next in a U-shape to the other
+    side of the U"""
+    if not 0 < index < len(conformation) - 2:
+        return []
+
+    before, middle, after = conformation.directions[index - 1:index + 2]
+    if not before or before != -after or middle in (0, before, after):
+        return []
+
+    x, y = conformation.neighbour(index - 1, -before)
+    step_x, step_y = DELTAS[middle + 2]
+    if conformation.at(x, y) >= 0 or \
+            conformation.at(x + step_x, y + step_y) >= 0:
+        return []
+    return [{index - 1: -before, index + 1: before}]
+
+
+def _pulls(
+        conformation: Conformation,
+        index: int,
+        side: int) -> List[Dict[int, int]]:
+    """Returns the pull moves of an amino, pulling the aminos on the given
+    side of it (-1 for the start, 1 for the end of the chain) along"""
+    length = len(conformation)
+    xs, ys, at = conformation.x, conformation.y, conformation.at
+    anchor, pulled = index - side, index + side
+    x, y = xs[index], ys[index]
+    moves = []
+
+    # at the end of the chain, move the amino two points away
+    if not 0 <= anchor < length:
+        if not 0 <= pulled < length:
+            return []
+        corners = []
+        for step_x, step_y in DIRECTIONS:
+            corner = (x + step_x, y + step_y)
+            if at(*corner) >= 0:
+                continue
+            for next_x, next_y in DIRECTIONS:
+                point = (corner[0] + next_x, corner[1] + next_y)
+                if point != (x, y) and at(*point) < 0:
+                    corners.append((point, corner))
+    else:
+        # the point next to the anchor and diagonal to the amino, and the
+        # point that completes the square with the anchor and the amino
+        step_x, step_y = x - xs[anchor], y - ys[anchor]
+        corners = []
+        for side_x, side_y in ((step_y, step_x), (-step_y, -step_x)):
+            point = (xs[anchor] + side_x, ys[anchor] + side_y)
+            if at(*point) >= 0:
+                continue
+            corner = (x + side_x, y + side_y)
+            if not 0 <= pulled < length or \
+                    corner == (xs[pulled], ys[pulled]):
+                moves.append(changes(conformation, {index: point}))
+            elif at(*corner) < 0:
+                corners.append((point, corner))
+
+    for point, corner in corners:
+        # the rest of the chain follows, until it's connected again
+        points = {index: point, pulled: corner}
+        previous, i = corner, pulled + side
+        while 0 <= i < length and \
+                abs(xs[i] - previous[0]) + abs(ys[i] - previous[1]) != 1:
+            previous = points[i] = (xs[i - 2 * side], ys[i - 2 * side])
+            i += side
+        moves.append(changes(conformation, points))
+
+    # pulling the whole chain along can move it without folding anything
+    return [move for move in moves if move]
+
+
+def pull_moves(
+        conformation: Conformation,
+        index: int) -> List[Dict[int, int]]:
+    """Returns the pull moves of an amino, pulling either side along
+
+    The amino moves to an empty point next to one of its neighbours in the
+    chain and diagonal to where it was; the amino on the other side moves to
+    the point that completes the square, and the rest of that side follows
+    in the footsteps of the chain until it's connected again. Includes the
+    corner flips, and at the ends of the chain moves of the end amino to any
+    empty point two steps away.
+    """
+    return _pulls(conformation, index, -1) + _pulls(conformation, index, 1)
+
+
+# the moves of every move set, by name
+MOVE_SETS = {
+    "pivot": (pivots,),
+    "local": (end_moves, corner_flips, crankshafts),
+    "pull": (end_moves, pull_moves),
+}
+
+
+def check_move_set(name: str) -> Tuple[Callable, ...]:
+    """Returns the moves of a move set
+
+    Raises
+    ------
+    ValueError
+        raises a ValueError when there's no move set by the given name
+    """
+    if name not in MOVE_SETS:
+        raise ValueError(
+            f"Unknown move set '{name}', must be one of {', '.join(MOVE_SETS)}"
+        )
+    return MOVE_SETS[name]
+
+
+def neighbourhood(
+        conformation: Conformation,
+        index: int,
+        move_set: str = "pull") -> List[Dict[int, int]]:
+    """Returns every move of a move set around an amino
+
+    Parameters
+    ----------
+    conformation : Conformation
+        the conformation to move
+    index : int
+        the index of the amino to move
+    move_set : str, optional
+        the name of the move set, see `MOVE_SETS`, by default "pull"
+
+    Returns
+    -------
+    List[Dict[int, int]]
+        the new direction of every amino each move folds
+    """
+    return [
+        move for moves in check_move_set(move_set)
+        for move in moves(conformation, index)
+    ]
+
+
+def random_move(
+        conformation: Conformation,
+        move_set: str = "pull",
+        rng: random.Random = random) -> Optional[Dict[int, int]]:
+    """Returns a random move of a move set, around a random amino
+
+    Aminos are tried at random until one can be moved, at most as many times
+    as there are aminos.
+
+    Parameters
+    ----------
+    conformation : Conformation
+        the conformation to move
+    move_set : str, optional
+        the name of the move set, see `MOVE_SETS`, by default "pull"
+    rng : random.Random, optional
+        the random number generator to use, by default the random module
+
+    Returns
+    -------
+    Optional[Dict[int, int]]
+        the new direction of every amino the move folds,
+        or None if no move was found
+    """
+    moves = check_move_set(move_set)
+    length = len(conformation)
+    for _ in range(length):
+        index = rng.randrange(length)
+        options = [move for kind in moves for move in kind(conformation, index)]
+        if options:
+            return rng.choice(options)
+
+    return None
@@ -0,0 +1,163 @@
+from functools import partial
+from multiprocessing import Pool, Value, cpu_count
+from typing import Optional, Union
+
+from algorithms.BaseAlgorithm import COMPLETED
+from algorithms.depth_first import DepthFirstFold
+from classes.protein import Protein
+
+# the best score of any process, set in every worker by `_share`;
+# no solution scores above 0, so 1 means nothing has been found yet
+_shared = None
+NOTHING_FOUND = 1
+
+
+def _share(shared: Value) -> None:
+    """Initializer of the worker processes, stores the shared best score"""
+    global _shared
+    _shared = shared
+
+
+class ParallelDepthFirstFold(DepthFirstFold):
+    """
+    DepthFirstFold that spreads the search over several processes
+
+    The search tree is split at a fixed depth: every valid combination of
+    the first directions is searched by a worker of a process pool. The
+    best score found so far is shared between the workers, so each of them
+    skips the folds that cannot beat the solution of any other worker.
+
+    Attributes
+    ----------
+    completed: List[dict]
+        the result of every prefix the last run searched, in the order they
+        completed, see `DepthFirstFold.parallel`
+    """
+    def __init__(self, prot: Union[str, Protein]) -> None:
+        """Creates a ParallelDepthFirstFold instance,
+        see `DepthFirstFold.__init__`"""
+        super().__init__(prot)
+        self.completed = []
+
+    def log(self, msg: str, start: bool = False, end: bool = False):
+        """A single-threaded version of BaseAlgorithm log, as threads cannot
+        be sent to other processes
+
+        See Also
+        --------
+        `ParallelHillClimber.log`: the same method for the hillclimber
+        """
+        if not self.verbose:
+            return
+
+        if end:
+            print("\033]K")
+            print(msg)
+        else:
+            print(msg, end="\033[K\r", flush=True)
+
+    def parallel(self, prefix, prune=True) -> dict:
+        """Searches the folds that start with a prefix in a worker process,
+        see `DepthFirstFold.parallel`; progress is only logged by `run`"""
+        self.shared = _shared
+        self.verbose = False
+        return super().parallel(prefix, prune)
+
+    def run(
+        self,
+        verbose: bool = False,
+        prune: bool = True,
+        processes: Optional[int] = None,
+        depth: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        target_score: Optional[int] = None,
+        max_evaluations: Optional[int] = None
+    ) -> Protein:
+        """Runs the search on a pool of processes
+
+        Parameters
+        ----------
+        verbose : bool, optional
+            whether to log messages to stdout, by default False
+        prune : bool, optional
+            whether to skip folds that cannot beat the best solution,
+            by default True
+        processes : int, optional
+            the amount of processes to search with,
+            by default one less than the amount of cpus
+        depth : int, optional
+            the amount of directions to split the search tree at, by default
+            deep enough to give every process at least eight prefixes
+        time_budget : float, optional
+            the most seconds to search for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as any process reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most folds to visit, by default no limit; every prefix stops
+            at it on its own, and the pool is stopped once all prefixes
+            together visited as many. Why the search stopped is kept in
+            `stop_reason`, see `BaseAlgorithm.set_limits`
+
+        Returns
+        -------
+        Protein
+            the best solution
+        """
+        self.verbose = verbose
+        self.visited = self.pruned = self.solutions = 0
+        self.completed = []
+        self.set_limits(time_budget, target_score, max_evaluations)
+        processes = processes or max(1, cpu_count() - 1)
+
+        # split the tree deep enough to keep every process busy
+        if depth is None:
+            depth = 1
+            prefixes = self.prefixes(depth)
+            while len(prefixes) < 8 * processes and depth < len(self.prot_str) - 1:
+                depth += 1
+                prefixes = self.prefixes(depth)
+        else:
+            prefixes = self.prefixes(depth)
+
+        self.log(
+            f"Starting parallel DepthFirstFold with {processes} processes " +
+            f"on {len(prefixes)} prefixes of {depth} directions",
+        )
+
+        shared = Value("i", NOTHING_FOUND)
+        search = partial(self.parallel, prune=prune)
+        with Pool(processes, initializer=_share, initargs=(shared,)) as pool:
+            for result in pool.imap_unordered(search, prefixes):
+                self.completed.append(result)
+                self.visited += result["visited"]
+                self.evaluations += result["visited"]
+                self.pruned += result["pruned"]
+                self.solutions += result["solutions"]
+
+                # the best solution received so far, which replaces the
+                # unfolded protein this started with
+                if result["score"] is not None and \
+                        result["score"] <= self.best.score:
+                    self.best = Protein(self.prot_str, result["directions"])
+
+                self.log(
+                    f"{len(self.completed)}/{len(prefixes)} prefixes " +
+                    f"searched; best score: {shared.value}"
+                )
+
+                # leaving the pool stops the prefixes still being searched;
+                # not before a solution was received, as the process that
+                # shared the best score may not have returned it yet
+                if self.best.is_valid and self.stopped(self.best.score):
+                    break
+
+        if self.stop_reason is None:
+            self.stop_reason = COMPLETED
+        self.log(
+            f"Best solution: {self.best.score}; " +
+            f"visited {self.visited} folds, pruned {self.pruned}; " +
+            f"stopped: {self.stop_reason}",
+            end=True
+        )
+        return self.best
@@ -1,12 +1,161 @@
-from multiprocessing import Process, cpu_count, Queue
+from multiprocessing import cpu_count, get_context
+from multiprocessing.context import BaseContext
 from os import getpid
-from typing import Union
+import random
+from typing import Callable, List, Optional, Tuple, Union
 
+from algorithms.BaseAlgorithm import COMPLETED
 from algorithms.hillclimber import HillClimber
 from classes.protein import Protein
 
+# the islands every island takes migrants from, by name; as a function of the
+# number of the island and the amount of islands
+TOPOLOGIES = {
+    "ring": lambda island, count: [(island - 1) % count],
+    "all": lambda island, count: [
+        other for other in range(count) if other != island
+    ],
+}
+
+# the climber every worker runs and the islands it may share folds with,
+# set once per worker by `_keep`
+_climber = None
+_islands = None
+
+
+class Islands:
+    """The best fold of every island, in memory shared between processes
+
+    Every fold is stored as one byte per direction, next to its score; an
+    island that has not published a fold yet has a score of 1.
+
+    Attributes
+    ----------
+    count: int
+        the amount of islands
+    length: int
+        the amount of directions of every fold
+    topology: str
+        the name of the islands every island takes migrants from, see
+        `TOPOLOGIES`
+    """
+    def __init__(
+        self,
+        context: BaseContext,
+        count: int,
+        length: int,
+        topology: str = "ring"
+    ) -> None:
+        """Constructor method
+
+        Parameters
+        ----------
+        context : BaseContext
+            the multiprocessing context of the processes to share with
+        count : int
+            the amount of islands
+        length : int
+            the amount of directions of every fold
+        topology : str, optional
+            the islands every island takes migrants from, by default "ring",
+            taking them from the island before it
+
+        Raises
+        ------
+        ValueError
+            raises a ValueError when there's no topology by the given name
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(
+                f"Unknown topology '{topology}', must be one of " +
+                ", ".join(TOPOLOGIES)
+            )
+        self.count, self.length, self.topology = count, length, topology
+        self.__lock = context.Lock()
+        self.__scores = context.Array("i", [1] * count, lock=False)
+        self.__folds = context.Array("b", count * length, lock=False)
+
+    def publish(self, island: int, protein: Protein) -> None:
+        """Stores the fold of an island, if it beats the one stored before"""
+        start = island * self.length
+        with self.__lock:
+            if protein.score < self.__scores[island]:
+                self.__scores[island] = protein.score
+                self.__folds[start:start + self.length] = protein.directions
+
+    def migrant(self, island: int) -> Optional[Tuple[int, List[int]]]:
+        """Returns the best fold published by the islands an island takes
+        migrants from, as its score and its directions; or None if none of
+        them published one yet"""
+        with self.__lock:
+            other = min(
+                TOPOLOGIES[self.topology](island, self.count),
+                key=self.__scores.__getitem__, default=None
+            )
+            if other is None or self.__scores[other] > 0:
+                return None
+
+            start = other * self.length
+            return (
+                self.__scores[other],
+                self.__folds[start:start + self.length]
+            )
+
+
+def _keep(
+        climber: 'ParallelHillClimber',
+        islands: Optional[Islands] = None) -> None:
+    """Initializer of the worker processes, stores the climber to run, so it
+    is only sent to every worker once"""
+    global _climber, _islands
+    _climber, _islands = climber, islands
+
+
+def _climb(task: Tuple[int, int, int, Optional[int]]) -> dict:
+    """Does a single run in a worker process, see
+    `ParallelHillClimber.parallel`
+
+    Parameters
+    ----------
+    task : Tuple[int, int, int, Optional[int]]
+        the number of the run, the seed of its random numbers, the amount
+        of iterations to do and the amount of iterations between migrations
+    """
+    run, seed, iterations, interval = task
+    random.seed(seed)
+    curr = _climber.parallel(
+        _climber.protein, iterations, _climber.verbose >= 2,
+        _islands, run, interval
+    )
+    return {
+        "run": run,
+        "types": curr.types,
+        "directions": curr.directions,
+        "evaluations": _climber.evaluations,
+    }
+
 
 class ParallelHillClimber(HillClimber):
+    """HillClimber that does its runs on a pool of processes
+
+    The pool is started once per call to `ParallelHillClimber.run`; every
+    worker takes the next run as soon as it is done with the last one, and
+    sends back the solution of each run as soon as it completes.
+
+    Attributes
+    ----------
+    runs_completed: int
+        the amount of runs the last call to run completed
+    """
+    def __init__(
+        self,
+        protein: Union[Protein, str],
+        move_set: str = "pivot"
+    ) -> None:
+        """Creates a ParallelHillClimber instance,
+        see `HillClimber.__init__`"""
+        super().__init__(protein, move_set)
+        self.runs_completed = 0
 
     def log(self, msg: str, end=False):
         """A single-threaded version of BaseAlgorithm log
@@ -37,9 +186,11 @@ class ParallelHillClimber(HillClimber):
     def parallel(
                 self,
                 protein: Protein,
-                save_to: Queue,
                 iterations: int = 1000,
                 verbose: bool = False,
+                islands: Optional[Islands] = None,
+                island: int = 0,
+                interval: Optional[int] = None
             ) -> Protein:
         """
         Function to be run in parallel, executes one run of hillclimber
@@ -49,33 +200,56 @@ class ParallelHillClimber(HillClimber):
         ----------
         protein : Protein
             the protein to run this function on
-        save_to : Queue
-            the queue to save results to
         iterations : int, optional
             the amount of maximum amount iterations to continue,
             when no improvement was found; by default 1000
         verbose : bool, optional
             whether to log messages to stdout, by default False
+        islands : Islands, optional
+            the islands to share the best fold with, by default None, doing
+            this run on its own
+        island : int, optional
+            the number of the island of this run, by default 0
+        interval : int, optional
+            the amount of iterations between publishing the fold of this run
+            and adopting a better migrant, by default never
         """
         # make sure we'll run the algorithm at least once
         iterations = max(1, iterations)
 
+        # the limits set before are kept, but only this run is counted
+        self.evaluations, self.stop_reason = 0, None
+
         # get random starting point
         curr = self.get_starting_point(protein)
 
         for i in range(iterations):
+            if self.stopped(curr.score):
+                break
             if self.verbose >= 3:
                 self.log(
                     f"process {getpid()}; " +
                     f"iteration: {i}; " +
                     f"score: {curr.score}"
                 )
-            new_state = None
-            while not Protein.validate(new_state):
-                new_state = self.fold_randomly(curr)
+            # fold in place, and undo the fold if it made things worse
+            score, moves = curr.score, None
+            while moves is None:
+                moves = self.mutate(curr)
+            self.evaluations += 1
 
-            if curr.score >= new_state.score:
-                curr = Protein.copy(new_state)
+            if score < curr.score:
+                self.revert(curr, moves)
+
+            # trade folds with the other islands
+            if islands is not None and interval and (i + 1) % interval == 0:
+                islands.publish(island, curr)
+                migrant = islands.migrant(island)
+                if migrant is not None and migrant[0] < curr.score:
+                    curr = Protein(curr.types, migrant[1])
+
+        if islands is not None:
+            islands.publish(island, curr)
 
         if verbose:
             self.log(
@@ -83,16 +257,22 @@ class ParallelHillClimber(HillClimber):
                 f"score: {curr.score}",
             )
 
-        # we can only store primitive types in a multiprocessing queue
-        # so we serialize our protein
-        save_to.put({"types": curr.types, "directions": curr.directions})
-        return curr # return call in case paralel gets called directly
+        return curr
 
     def run(
         self,
         runs: int = 10,
         iterations: int = 1000,
-        verbose: Union[bool, int] = 0
+        verbose: Union[bool, int] = 0,
+        move_set: str = None,
+        processes: Optional[int] = None,
+        start_method: Optional[str] = None,
+        callback: Optional[Callable[[Protein, int], None]] = None,
+        interval: Optional[int] = None,
+        topology: str = "ring",
+        time_budget: Optional[float] = None,
+        target_score: Optional[int] = None,
+        max_evaluations: Optional[int] = None
     ) -> Protein:
         """
         Function that starts running the algorithm on
@@ -104,8 +284,7 @@ class ParallelHillClimber(HillClimber):
         runs : int, optional
             the amount of runs to do (in paralel), by default 10
         iterations : int, optional
-            how many iterations to continue while finding no improvement
-            is reset when an improvement is found; by default 1000
+            the amount of iterations every run does; by default 1000
         verbose : Union[bool, int], optional
             Whether to log messages to stdout, by default 0
             this is changed from the single-process version of HillClimber
@@ -119,60 +298,91 @@ class ParallelHillClimber(HillClimber):
                           whenever we've improved our best solution
 
                 3:        log status messages during runs; every iteration
+        move_set : str, optional
+            the name of the moves to fold the protein with, see
+            `moves.MOVE_SETS`; by default the move set of this instance
+        processes : int, optional
+            the amount of worker processes, by default one less than the
+            amount of cpus, but never more than the amount of runs
+        start_method : str, optional
+            how to start the workers, "fork", "spawn" or "forkserver", see
+            `multiprocessing.get_context`; by default the platform default
+        callback : Callable[[Protein, int], None], optional
+            called with the solution and the number of every run, as soon as
+            the run completes, in the order the runs complete
+        interval : int, optional
+            the amount of iterations between migrations, by default None,
+            keeping the runs apart; otherwise every run is an island that
+            publishes its fold every interval and adopts the best fold
+            published by the islands it is connected to, when that is better
+        topology : str, optional
+            which islands take migrants from which, see `TOPOLOGIES`,
+            by default "ring"; only runs at the same time can trade folds
+            both ways, so runs beyond the amount of processes only take
+            migrants from the runs before them
+        time_budget : float, optional
+            the most seconds to run for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as a run reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most folds to score, by default no limit; every run stops at
+            it on its own, and the pool is stopped once all runs together
+            scored as many. Why the runs stopped is kept in `stop_reason`,
+            see `BaseAlgorithm.set_limits`
 
         Returns
         -------
         Protein
             the best solution we have found overall
         """
-        # update verbose flag
+        # update verbose flag and move set, the processes get a copy of both
         self.verbose = verbose
-        # initialize values for managing processes and their results
-        process_count = min(cpu_count()-1, max(runs, 1))
-        runs_completed = 0
-        processes = []
-        results = Queue()
-        process_args = (self.protein, results, iterations, self.verbose >= 2)
-
-        # create processes
-        for i in range(0, process_count):
-            p = Process(target=self.parallel, args=process_args)
-            processes.append(p)
+        self.set_move_set(move_set)
+        self.set_limits(time_budget, target_score, max_evaluations)
+        runs = max(runs, 1)
+        processes = min(processes or max(1, cpu_count() - 1), runs)
+        self.runs_completed = 0
+
+        # every run gets its own seed, or forked workers would all do the
+        # same run
+        tasks = [
+            (run, random.getrandbits(32), iterations, interval)
+            for run in range(runs)
+        ]
 
         self.log(
-            f"Starting paralel HillClimber with {process_count} processes"
+            f"Starting paralel HillClimber with {processes} processes"
         )
 
-        # start processes, then wait wait for them to complete
-        # then, if there are still runs to be done, we start a new process
-        while runs_completed < runs:
-            for p in processes:
-                if not p.is_alive():
-                    p.start()
-
-            for i, p in enumerate(processes):
-                p.join(60)  # wait for max. 60 seconds for process to finish
-                runs_completed += 1
-
-                # retrieve latest result, and massage the result into a protein
-                if not results.empty():
-                    result = results.get(timeout=60)
-                    result = Protein(result["types"], result["directions"])
-                    self.log(
-                        f"Run {runs_completed-1} completed with " +
-                        f"score {result.score}"
-                    )
-
-                    # check if it's better than the best
-                    if self.best.score > result.score:
-                        self.best = result
-
-                # if we still need to do some runs we replace the process with
-                # a new one (you can't restart Processes :( )
-                if runs_completed < runs:
-                    processes[i] = Process(
-                        target=self.parallel,
-                        args=process_args
-                    )
+        context = get_context(start_method)
+        islands = None
+        if interval:
+            islands = Islands(context, runs, len(self.prot_str), topology)
+        with context.Pool(processes, _keep, (self, islands)) as pool:
+            for result in pool.imap_unordered(_climb, tasks):
+                self.runs_completed += 1
+                self.evaluations += result["evaluations"]
+
+                # massage the result into a protein
+                solution = Protein(result["types"], result["directions"])
+                self.log(
+                    f"Run {result['run']} completed with " +
+                    f"score {solution.score}; " +
+                    f"{self.runs_completed}/{runs} runs completed"
+                )
+                if callback is not None:
+                    callback(solution, result["run"])
+
+                # check if it's at least as good as the best, so a valid
+                # fold replaces the unfolded protein this started with
+                if self.best.score >= solution.score:
+                    self.best = solution
+
+                # leaving the pool stops the runs that are still going
+                if self.stopped(self.best.score):
+                    break
 
+        if self.stop_reason is None:
+            self.stop_reason = COMPLETED
         return self.best
@@ -0,0 +1,298 @@
+from math import ceil, exp, inf, log, log1p
+import random
+from typing import List, Optional, Tuple, Union
+
+from algorithms.BaseAlgorithm import COMPLETED, BaseAlgorithm
+from classes.chain import Chain
+from classes.protein import Protein
+
+# the logarithm of the importance of a point for every amount of empty points
+# next to it, see `PERM.options`
+LOG_ROOM = [log(room + 0.5) for room in range(4)]
+
+# a chain that is yet to grow: the amount of aminos to take it back to, the
+# direction and gain of the amino to place next and the logarithm of the
+# weight it has once that amino is placed
+Branch = Tuple[int, int, int, float]
+
+
+def log_add(a: float, b: float) -> float:
+    """Returns log(exp(a) + exp(b)), without leaving the logarithms"""
+    if a < b:
+        a, b = b, a
+    if b == -inf:
+        return a
+    return a + log1p(exp(b - a))
+
+
+class PERM(BaseAlgorithm):
+    """Pruned-enriched Rosenbluth method for folding proteins
+
+    Chains are grown one amino at a time, each amino on one of the empty
+    points next to the last, picked by how many bonds it forms and how much
+    room it leaves (nPERMis). Every chain carries a weight, the Boltzmann
+    factor of its score corrected for the odds of growing it that way.
+    Chains that weigh much more than the average chain of the same length
+    are cloned into several chains that each grow into another point, and
+    chains that weigh much less are dropped half of the time, the other half
+    carrying on at twice the weight. The thresholds follow the weights seen
+    so far, see `PERM.thresholds`.
+
+    All chains grown from the same first amino make up a tour; they are
+    grown depth first on a single `Chain`, keeping the chains that are yet
+    to grow on a stack.
+
+    Attributes
+    ----------
+    temperature: float
+        the temperature of the Boltzmann factors of the last run
+    tours: int
+        the amount of tours the last run started
+    solutions: int
+        the amount of complete chains the last run grew
+    clones: int
+        the amount of extra chains the last run cloned
+    prunes: int
+        the amount of chains the last run dropped
+    """
+    def __init__(
+        self,
+        protein: Union[Protein, str],
+        temperature: float = 0.3,
+        enrich: float = 1.0
+    ) -> None:
+        """Constructor method for PERM
+
+        Parameters
+        ----------
+        protein : Union[Protein, str]
+            the protein this algorithm is to run on
+        temperature : float, optional
+            the temperature of the Boltzmann factors, in the same units as
+            the score; lower finds lower scores but clones more, and
+            proteins with C aminos, whose bonds are five times as strong,
+            need it higher; can later also be set by run; by default 0.3
+        enrich : float, optional
+            the factor of the threshold to clone chains above,
+            see `PERM.thresholds`; by default 1.0
+        """
+        super().__init__(protein)
+        self.temperature = temperature
+        self.enrich = enrich
+        self.tours = self.solutions = self.clones = self.prunes = 0
+
+        # the logarithm of the summed weight and the amount of chains that
+        # reached every length
+        self.__weights = [-inf] * (len(self.prot_str) + 1)
+        self.__counts = [0] * (len(self.prot_str) + 1)
+
+    def thresholds(self, length: int) -> Tuple[float, float]:
+        """Returns the logarithms of the weights above which chains of a
+        length are cloned, and below which they may be dropped
+
+        Chains are cloned above `enrich` times the average weight of a chain
+        of the length per tour, times the square of the amount of chains of
+        the length per tour, so ever fewer chains are cloned as more grow;
+        they may be dropped below a fifth of that. There are no thresholds in
+        the first tour, nor for lengths no chain reached yet.
+
+        Returns
+        -------
+        Tuple[float, float]
+            the logarithms of the upper and the lower threshold
+        """
+        count = self.__counts[length]
+        if self.tours < 2 or not count:
+            return inf, -inf
+
+        tours = log(self.tours)
+        upper = log(self.enrich) + self.__weights[length] - tours + \
+            2 * (log(count) - tours)
+        return upper, upper + log(0.2)
+
+    def options(self, chain: Chain) -> List[Tuple[int, int, float, float]]:
+        """Returns the directions to grow a chain in, with how much each
+        adds to the score and the logarithms of its Boltzmann factor and of
+        its importance
+
+        The importance of a point is its Boltzmann factor, times the amount
+        of empty points next to it plus one half; directions into a pocket
+        too small for the rest of the chain are left out, see `Chain.traps`.
+        """
+        traps = chain.traps()
+        options = []
+        for direction in chain.options():
+            gain = chain.gain(direction)
+            if gain is None or direction in traps:
+                continue
+
+            boltzmann = -gain / self.temperature
+            options.append((
+                direction, gain, boltzmann,
+                boltzmann + LOG_ROOM[chain.room(direction)]
+            ))
+
+        return options
+
+    def branch(
+        self,
+        chain: Chain,
+        weight: float
+    ) -> List[Branch]:
+        """Picks the directions to grow a chain in, cloning or dropping it by
+        the weight it would have after growing, see `PERM.thresholds`
+
+        Parameters
+        ----------
+        chain : Chain
+            the chain to grow
+        weight : float
+            the logarithm of the weight of the chain
+
+        Returns
+        -------
+        List[Branch]
+            a chain to grow for every direction picked, none when the chain
+            is dropped or has nowhere left to go
+        """
+        options = self.options(chain)
+        if not options:
+            return []
+
+        total = -inf
+        for _, _, boltzmann, _ in options:
+            total = log_add(total, boltzmann)
+
+        upper, lower = self.thresholds(chain.placed + 1)
+        predicted = weight + total
+        copies = 1
+        if predicted > upper:
+            copies = min(
+                len(options), ceil(exp(min(predicted - upper, log(4))))
+            )
+            self.clones += copies - 1
+        elif predicted < lower:
+            if random.random() < 0.5:
+                self.prunes += 1
+                return []
+            weight += log(2)
+
+        # pick as many distinct directions as there are copies by their
+        # importance, each correcting its weight for the odds of picking it
+        top = max(option[3] for option in options)
+        odds = [exp(option[3] - top) for option in options]
+        total = sum(odds)
+        every = copies == len(options)
+        branches = []
+        for _ in range(copies):
+            pick = random.random() * sum(odds)
+            for i, chance in enumerate(odds):
+                pick -= chance
+                if pick < 0:
+                    break
+            direction, gain, boltzmann, _ = options.pop(i)
+            picked = 1.0 if every else min(1.0, copies * odds.pop(i) / total)
+            branches.append(
+                (chain.placed, direction, gain, weight + boltzmann - log(picked))
+            )
+            if every:
+                odds.pop(i)
+        return branches
+
+    def run(
+        self,
+        tours: int = 100,
+        temperature: Optional[float] = None,
+        verbose: bool = False,
+        time_budget: Optional[float] = None,
+        target_score: Optional[int] = None,
+        max_evaluations: Optional[int] = None
+    ) -> Protein:
+        """Starts the algorithm
+
+        Parameters
+        ----------
+        tours : int, optional
+            the amount of tours to grow, by default 100
+        temperature : float, optional
+            the temperature of the Boltzmann factors, by default the one of
+            this instance
+        verbose : bool, optional
+            whether to log messages to stdout, by default False
+        time_budget : float, optional
+            the most seconds to run for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as a chain reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most aminos to place, by default no limit; why the run
+            stopped is kept in `stop_reason`, see `BaseAlgorithm.set_limits`
+
+        Returns
+        -------
+        Protein
+            the best solution found
+        """
+        self.verbose = verbose
+        self.set_limits(time_budget, target_score, max_evaluations)
+        if temperature is not None:
+            self.temperature = temperature
+        self.tours = self.solutions = self.clones = self.prunes = 0
+
+        chain = Chain(self.prot_str)
+        length = len(chain)
+        self.__weights = [-inf] * (length + 1)
+        self.__counts = [0] * (length + 1)
+        best_score, best_directions = inf, None
+
+        def stopped() -> bool:
+            # limits are only honoured once there is a chain to return
+            return best_directions is not None and self.stopped(best_score)
+
+        # every tour may be pruned before completing a chain, so tours are
+        # grown until at least one chain is complete
+        while self.tours < max(1, tours) or best_directions is None:
+            if stopped():
+                break
+            self.tours += 1
+
+            # grow the tour depth first, taking the chain back to where the
+            # next chain on the stack branched off
+            stack = [(1, 0, 0, 0.0)]
+            while stack and not stopped():
+                placed, direction, gain, weight = stack.pop()
+                while chain.placed > placed:
+                    chain.retract()
+                if direction:
+                    chain.extend(direction, gain)
+                    self.evaluations += 1
+
+                self.__weights[chain.placed] = log_add(
+                    self.__weights[chain.placed], weight
+                )
+                self.__counts[chain.placed] += 1
+
+                if chain.is_complete():
+                    self.solutions += 1
+                    if chain.score < best_score:
+                        best_score = chain.score
+                        best_directions = chain.directions[:]
+                        self.log(
+                            f"tour: {self.tours}; best score: {best_score}",
+                            start=True
+                        )
+                    continue
+
+                stack.extend(self.branch(chain, weight))
+
+        if best_directions is not None and best_score <= self.best.score:
+            self.best = Protein(self.prot_str, list(best_directions))
+        if self.stop_reason is None:
+            self.stop_reason = COMPLETED
+        self.log(
+            f"Best solution: {self.best}; score: {self.best.score}; " +
+            f"tours: {self.tours}; chains: {self.solutions}; " +
+            f"clones: {self.clones}; pruned: {self.prunes}",
+            end=True
+        )
+        return self.best
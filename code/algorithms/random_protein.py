@@ -1,89 +1,191 @@
+from collections import deque
+from itertools import count
+from multiprocessing import Pool
+import numpy as np
 import random
-import sys
-from typing import List, Union
+from typing import Iterator, List, Optional, Tuple, Union
 
-from classes.amino import Amino
+from classes.chain import Chain
 from classes.protein import Protein
 
 
+def random_directions(sequence: str, rng: random.Random = random) -> List[int]:
+    """Returns the directions of a random fold in which no aminos overlap
+
+    The chain is grown one amino at a time in a random empty direction,
+    avoiding pockets that are too small to hold the rest of the chain and
+    backtracking out of the ones that are not found in time, see
+    `Chain.grow`. Nothing is recursive, so there is no limit to the length
+    of the chain.
+
+    Parameters
+    ----------
+    sequence : str
+        the types of the aminos, one character per amino
+    rng : random.Random, optional
+        the random number generator to use, by default the random module
+
+    Returns
+    -------
+    List[int]
+        a direction for every amino, the last of which is 0
+    """
+    chain = Chain(sequence)
+    chain.grow(rng.choice)
+    return chain.directions.tolist()
+
+
+def random_folds(
+        sequence: str,
+        amount: int,
+        rng: random.Random = random) -> np.ndarray:
+    """Returns the directions of many random folds at once
+
+    Parameters
+    ----------
+    sequence : str
+        the types of the aminos, one character per amino
+    amount : int
+        the amount of folds to make
+    rng : random.Random, optional
+        the random number generator to use, by default the random module
+
+    Returns
+    -------
+    np.ndarray
+        one row of directions per fold, see `random_directions`; can be
+        scored and validated all at once with the `batch` module
+    """
+    folds = np.zeros((amount, len(sequence)), dtype=np.int8)
+    for row in folds:
+        row[:] = random_directions(sequence, rng)
+
+    return folds
+
+
+def _fold_batch(task: Tuple[str, int, int]) -> np.ndarray:
+    """Makes a batch of random folds in a worker process, see `random_folds`
+
+    Parameters
+    ----------
+    task : Tuple[str, int, int]
+        the sequence, the amount of folds and the seed of the batch
+    """
+    sequence, amount, seed = task
+    return random_folds(sequence, amount, random.Random(seed))
+
+
+def iter_random_folds(
+        sequence: str,
+        seed: Optional[int] = None,
+        batch: int = 1000,
+        amount: Optional[int] = None,
+        proteins: bool = False,
+        processes: Optional[int] = None
+) -> Iterator[Union[np.ndarray, Protein]]:
+    """Yields random folds one at a time, without ever storing more than a
+    few batches of them
+
+    The folds are made a batch at a time, see `random_folds`, every batch
+    with its own seed drawn from the given one; the same seed yields the
+    same folds, no matter how many processes make them.
+
+    Parameters
+    ----------
+    sequence : str
+        the types of the aminos, one character per amino
+    seed : int, optional
+        the seed of the random number generator, by default a random one
+    batch : int, optional
+        the amount of folds to make at once, by default 1000
+    amount : int, optional
+        the amount of folds to yield, by default no end
+    proteins : bool, optional
+        whether to yield a new Protein for every fold, by default False,
+        yielding the directions of the fold as a row of its batch
+    processes : int, optional
+        the amount of worker processes to make the batches with, which each
+        make one batch ahead at most; by default they are made by the
+        process that iterates
+
+    Yields
+    ------
+    Union[np.ndarray, Protein]
+        the directions of a random fold, see `random_directions`, or a
+        protein folded that way
+
+    Raises
+    ------
+    ValueError
+        raises a ValueError when the batch size is smaller than 1
+    """
+    if batch < 1:
+        raise ValueError(f"batch must be at least 1; was {batch}")
+
+    seeds = random.Random(seed)
+    sizes = count() if amount is None else range(0, amount, batch)
+    tasks = (
+        (sequence, batch if amount is None else min(batch, amount - start),
+         seeds.getrandbits(64))
+        for start in sizes
+    )
+
+    def folds() -> Iterator[np.ndarray]:
+        if not processes:
+            yield from map(_fold_batch, tasks)
+            return
+
+        # keep a batch ahead per process, rather than every batch at once
+        with Pool(processes) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.apply_async(_fold_batch, (task,)))
+                if len(pending) > processes:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+
+    for rows in folds():
+        for row in rows:
+            yield Protein(sequence, row.tolist()) if proteins else row
+
+
 def fold_randomly(
         protein: Union[Protein, str],
-        prev: Amino =  None,
-        faulty_directions: List[int] = []):
-    """Folds a protein in a random direction at every amino
+        rng: random.Random = random) -> Protein:
+    """Folds a protein in a random direction at every amino, such that no
+    aminos overlap
 
     Parameters
     ----------
-    protein : Protein
-        the protein to fold randomly
-    prev : Amino
-        the previous amino, should be the first amino uninitialized amino on
-        the first call
-    faulty_directions : List[int], optional
-        a direction to be pruned from the options to choose from when,
-        backtracking, by default []
-
-    See Also:
-        `GFG <https://www.geeksforgeeks.org/python-handling-recursion-limit/>`
-        for credit for the code for increasing the recursion count
+    protein : Union[Protein, str]
+        the protein to fold randomly, which is folded in place
+    rng : random.Random, optional
+        the random number generator to use, by default the random module
+
+    Returns
+    -------
+    Protein
+        the folded protein
+
+    See Also
+    --------
+    `random_directions`: for how the directions are chosen
     """
+    # massage protein to Protein if a string was given
+    if isinstance(protein, str):
+        protein = Protein(protein)
 
-    if not isinstance(protein, Protein) or not isinstance(protein, Protein):
+    if not isinstance(protein, Protein):
         raise TypeError(
             f"positional parameter 'protein' must be a Protein object, "
             f" was {protein}."
         )
-    if prev is not None and not isinstance(prev, Amino):
-        raise TypeError(
-            f"positional parameter 'prev' must be a Amino object, " +
-            f" was {protein}."
-        )
-
-    # massage protein to Protein if a string was given
-    if isinstance(protein, str):
-        protein = Protein(protein)
 
-    if prev is None:
-        prev = protein.aminos[0]
-
-    # get default recursion limit for later
-    default_recur_count = sys.getrecursionlimit()
-    # retrieve next uninitialized amino
-    curr = protein.next_uninitialized()
-
-    # check if all amino have been placed,
-    # if so set recursion limit back to default and return the protein
-    if curr is None:
-        sys.setrecursionlimit(default_recur_count)
-        return protein
-
-    # temporarily increase recursion limit
-    sys.setrecursionlimit(10**6)
-
-    options = protein.foldoptions(
-        curr,
-        completely_random=curr.index == 0 and faulty_directions)
-
-    # Remove all options that lead to a non-empty coordinate
-    options[:] =\
-        [option for option in options if
-            protein.empty_coordinate(curr, option)]
-
-    # Remove all options that lead to a dead end later on
-    if faulty_directions:
-        options = [o for o in options if o not in faulty_directions]
-
-    # if no options are left take one step back, otherwise execute the fold,
-    # and go on to the next amino acid
-    if not options:
-        faulty_directions.append(prev.direction)
-        prev.direction = 0
-        fold_randomly(
-            protein,
-            protein.aminos[prev.index - 1] if prev.index > 0 else
-            protein.aminos[0],
-            faulty_directions)
-    else:
-        direction = random.choice(options)
-        protein.fold(curr.index, direction)
-        fold_randomly(protein, curr)
+    old = protein.directions
+    protein.apply_move({
+        index: direction for index, direction in
+        enumerate(random_directions(protein.types, rng))
+        if direction != old[index]
+    })
+    return protein
@@ -0,0 +1,203 @@
+from math import exp
+import random
+from typing import List, Optional, Union
+
+from algorithms.BaseAlgorithm import COMPLETED
+from algorithms.hillclimber import HillClimber
+from classes.protein import Protein
+
+
+def temperatures(count: int, low: float, high: float) -> List[float]:
+    """Returns a ladder of temperatures that grow by the same factor each
+    step, from low to high
+
+    Parameters
+    ----------
+    count : int
+        the amount of temperatures
+    low : float
+        the lowest temperature
+    high : float
+        the highest temperature, only used when there is more than one
+
+    Returns
+    -------
+    List[float]
+        the temperatures from low to high
+    """
+    if count < 2:
+        return [low] * count
+    factor = (high / low) ** (1 / (count - 1))
+    return [low * factor ** step for step in range(count)]
+
+
+class ReplicaExchange(HillClimber):
+    """Replica exchange (parallel tempering) for folding proteins
+
+    Several replicas of the protein are annealed at the same time, each at
+    its own fixed temperature of a ladder. Every few moves, replicas at
+    neighbouring temperatures swap places by the Metropolis criterion, so
+    folds found while hot get to cool down, and cold folds that are stuck get
+    heated up. All replicas are moved in this process, one move each in turn,
+    with the moves of the move set, see `HillClimber.mutate`.
+
+    Attributes
+    ----------
+    temperatures: List[float]
+        the temperature of every replica of the last run, from low to high
+    swaps_tried: List[int]
+        the amount of swaps tried between every pair of neighbouring
+        temperatures in the last run
+    swaps_accepted: List[int]
+        the amount of those swaps that were made
+    """
+    def __init__(
+        self,
+        protein: Union[Protein, str],
+        move_set: str = "pull"
+    ) -> None:
+        """Constructor method for ReplicaExchange,
+        see `HillClimber.__init__`"""
+        super().__init__(protein, move_set)
+        self.temperatures = []
+        self.swaps_tried = []
+        self.swaps_accepted = []
+
+    def swap_rates(self) -> List[float]:
+        """Returns the fraction of the swaps tried between every pair of
+        neighbouring temperatures that were made, in the last run"""
+        return [
+            accepted / tried if tried else 0.0
+            for accepted, tried in zip(self.swaps_accepted, self.swaps_tried)
+        ]
+
+    def step(self, protein: Protein, temperature: float) -> None:
+        """Makes a random move in place, keeping it by the Metropolis
+        criterion at a temperature
+
+        Parameters
+        ----------
+        protein : Protein
+            the replica to move
+        temperature : float
+            the temperature of the replica
+        """
+        score, moves = protein.score, None
+        while moves is None:
+            moves = self.mutate(protein)
+        self.evaluations += 1
+
+        delta = protein.score - score
+        if delta > 0 and random.random() >= exp(-delta / temperature):
+            self.revert(protein, moves)
+
+    def exchange(self, replicas: List[Protein], odd: bool) -> None:
+        """Swaps replicas between neighbouring temperatures in place
+
+        Every other pair of neighbours is tried, starting at the first or
+        the second temperature; a swap is made with chance
+        exp((E_i - E_j)(1 / T_i - 1 / T_j)), keeping the balance of both.
+
+        Parameters
+        ----------
+        replicas : List[Protein]
+            the replica at every temperature, from low to high
+        odd : bool
+            whether to start at the second temperature
+        """
+        for i in range(int(odd), len(replicas) - 1, 2):
+            self.swaps_tried[i] += 1
+            low, high = self.temperatures[i], self.temperatures[i + 1]
+            chance = (replicas[i].score - replicas[i + 1].score) * \
+                (1 / low - 1 / high)
+            if chance >= 0 or random.random() < exp(chance):
+                replicas[i], replicas[i + 1] = replicas[i + 1], replicas[i]
+                self.swaps_accepted[i] += 1
+
+    def run(
+        self,
+        iterations: int = 10000,
+        replicas: int = 8,
+        low: float = 0.15,
+        high: float = 2.0,
+        interval: int = 10,
+        verbose: bool = False,
+        move_set: str = None,
+        time_budget: Optional[float] = None,
+        target_score: Optional[int] = None,
+        max_evaluations: Optional[int] = None
+    ) -> Protein:
+        """Starts the algorithm
+
+        Parameters
+        ----------
+        iterations : int, optional
+            the amount of moves to make per replica, by default 10000
+        replicas : int, optional
+            the amount of replicas, by default 8
+        low : float, optional
+            the temperature of the coldest replica, by default 0.15
+        high : float, optional
+            the temperature of the hottest replica, by default 2.0; the
+            others are in between, see `temperatures`
+        interval : int, optional
+            the amount of moves per replica between swaps, by default 10
+        verbose : bool, optional
+            whether to log messages to stdout, by default False
+        move_set : str, optional
+            the name of the moves to fold the protein with, see
+            `moves.MOVE_SETS`; by default the move set of this instance
+        time_budget : float, optional
+            the most seconds to run for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as a fold reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most folds to score, by default no limit; why the run stopped
+            is kept in `stop_reason`, see `BaseAlgorithm.set_limits`
+
+        Returns
+        -------
+        Protein
+            the best solution found by any replica
+        """
+        self.verbose = verbose
+        self.set_move_set(move_set)
+        self.set_limits(time_budget, target_score, max_evaluations)
+
+        replicas, interval = max(1, replicas), max(1, interval)
+        self.temperatures = temperatures(replicas, low, high)
+        self.swaps_tried = [0] * (replicas - 1)
+        self.swaps_accepted = [0] * (replicas - 1)
+        chains = [
+            self.get_starting_point(self.protein) for _ in range(replicas)
+        ]
+        best = min(chains, key=lambda chain: chain.score)
+        self.best = Protein.copy(best)
+
+        for i in range(max(1, iterations)):
+            if self.stopped(self.best.score):
+                break
+
+            for chain, temperature in zip(chains, self.temperatures):
+                self.step(chain, temperature)
+                if chain.score < self.best.score:
+                    self.best = Protein.copy(chain)
+
+            if (i + 1) % interval == 0:
+                self.exchange(chains, (i + 1) // interval % 2 == 1)
+                self.log(
+                    f"iteration: {i}; best score: {self.best.score}; " +
+                    "scores: " + ", ".join(str(c.score) for c in chains),
+                    start=True
+                )
+
+        if self.stop_reason is None:
+            self.stop_reason = COMPLETED
+        self.log(
+            f"Best solution: {self.best}; score: {self.best.score}; " +
+            "swap rates: " +
+            ", ".join(f"{rate:.2f}" for rate in self.swap_rates()),
+            end=True
+        )
+        return self.best
@@ -0,0 +1,152 @@
+"""Cooling schedules for simulated annealing
+
+A schedule gives the temperature at every iteration of a run. It starts
+over from its start temperature when it is reheated, and the adaptive
+schedule also learns from whether worse folds were accepted.
+"""
+from math import log
+from typing import Type
+
+
+class Schedule:
+    """A cooling schedule, to be subclassed
+
+    Attributes
+    ----------
+    start: float
+        the temperature at the first iteration and after reheating
+    iterations: int
+        the amount of iterations of the run
+    span: int
+        the amount of iterations to cool down over, the rest of the run
+        after reheating
+    """
+    def __init__(self, start: float, iterations: int) -> None:
+        """Constructor method
+
+        Parameters
+        ----------
+        start : float
+            the temperature at the first iteration, larger than 0
+        iterations : int
+            the amount of iterations of the run
+
+        Raises
+        ------
+        ValueError
+            raises a ValueError when the start temperature is not above 0
+        """
+        if start <= 0:
+            raise ValueError(f"start must be above 0; was {start}")
+        self.start = start
+        self.iterations = self.span = max(1, iterations)
+        self.__reheated = 0
+
+    def temperature(self, i: int) -> float:
+        """Returns the temperature at an iteration of the run"""
+        return self.cool(i - self.__reheated)
+
+    def cool(self, i: int) -> float:
+        """Returns the temperature an amount of iterations after starting
+        or reheating, to be implemented by every schedule"""
+        raise NotImplementedError
+
+    def update(self, accepted: bool) -> None:
+        """Learns whether a worse fold was accepted, by default nothing"""
+
+    def reheat(self, i: int) -> None:
+        """Starts cooling down from the start temperature again, at an
+        iteration of the run, over the iterations that are left"""
+        self.__reheated = i
+        self.span = max(1, self.iterations - i)
+
+
+class Linear(Schedule):
+    """Cools down by the same amount every iteration, to nearly 0 at the
+    last"""
+    def cool(self, i: int) -> float:
+        return self.start * max(1 - i / self.span, 1e-3)
+
+
+class Geometric(Schedule):
+    """Cools down by the same factor every iteration, to a thousandth of the
+    start temperature at the last"""
+    def cool(self, i: int) -> float:
+        return self.start * 1e-3 ** (i / self.span)
+
+
+class Logarithmic(Schedule):
+    """Cools down ever more slowly, the schedule under which annealing is
+    known to find the best fold given enough iterations"""
+    def cool(self, i: int) -> float:
+        return self.start / (1 + log(1 + i))
+
+
+class Adaptive(Schedule):
+    """Heats up or cools down to accept about as many worse folds as a
+    target, a share that falls to 0 at the last iteration
+
+    Attributes
+    ----------
+    target: float
+        the share of worse folds to accept at the first iteration
+    rate: float
+        the running average share of worse folds accepted
+    """
+    def __init__(
+        self,
+        start: float,
+        iterations: int,
+        target: float = 0.5
+    ) -> None:
+        """Constructor method, see `Schedule.__init__`
+
+        Parameters
+        ----------
+        target : float, optional
+            the share of worse folds to accept at the first iteration,
+            by default 0.5
+        """
+        super().__init__(start, iterations)
+        self.target = target
+        self.rate = target
+        self.__current = start
+        self.__i = 0
+
+    def cool(self, i: int) -> float:
+        self.__i = i
+        return self.__current
+
+    def update(self, accepted: bool) -> None:
+        self.rate = 0.99 * self.rate + 0.01 * accepted
+        target = self.target * max(1 - self.__i / self.span, 0)
+        self.__current *= 0.99 if self.rate > target else 1 / 0.99
+
+    def reheat(self, i: int) -> None:
+        super().reheat(i)
+        self.__current = self.start
+        self.rate = self.target
+
+
+# every schedule by name
+SCHEDULES = {
+    "linear": Linear,
+    "geometric": Geometric,
+    "logarithmic": Logarithmic,
+    "adaptive": Adaptive,
+}
+
+
+def check_schedule(name: str) -> Type[Schedule]:
+    """Returns the schedule by a name
+
+    Raises
+    ------
+    ValueError
+        raises a ValueError when there's no schedule by the given name
+    """
+    if name not in SCHEDULES:
+        raise ValueError(
+            f"Unknown schedule '{name}', must be one of {', '.join(SCHEDULES)}"
+        )
+    return SCHEDULES[name]
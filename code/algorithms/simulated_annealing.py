@@ -1,26 +1,68 @@
+from math import exp
 from random import random
+from typing import Optional, Union
 
+from algorithms.BaseAlgorithm import COMPLETED
 from algorithms.hillclimber import HillClimber
+from algorithms.schedules import check_schedule
 from classes.protein import Protein
 
 
 class SimulatedAnnealing(HillClimber):
-    def __init__(self, protein: Protein, temperature: int = 2000) -> None:
+    """Simulated annealing for folding proteins
+
+    Worse folds are accepted with a chance that shrinks as the temperature
+    falls, following a cooling schedule, see `schedules.SCHEDULES`.
+
+    Attributes
+    ----------
+    iterations: int
+        the amount of iterations of the last run
+    schedule: Schedule
+        the cooling schedule of the last run
+    accepted: int
+        the amount of moves the last run kept
+    rejected: int
+        the amount of worse moves the last run undid
+    reheats: int
+        the amount of times the last run started cooling down again
+    """
+    def __init__(
+        self,
+        protein: Union[Protein, str],
+        temperature: float = 2.0,
+        move_set: str = "pivot",
+        schedule: str = "linear"
+    ) -> None:
         """Constructor method for Simulated Annealing
 
         Parameters
         ----------
-        protein : Protein
+        protein : Union[Protein, str]
             the protein this algorithm is to run on
-        temperature : int, optional
-            the starting temperature for this algorithm,
-            can later also be set by run; by default 2000
+        temperature : float, optional
+            the starting temperature for this algorithm, in the same units
+            as the score; can later also be set by run; by default 2.0
+        move_set : str, optional
+            the name of the moves to fold the protein with,
+            can later also be set by run; by default "pivot"
+        schedule : str, optional
+            the name of the cooling schedule, see `schedules.SCHEDULES`,
+            can later also be set by run; by default "linear"
+
+        Raises
+        ------
+        ValueError
+            raises a ValueError when there's no schedule by the given name
         """
-        super().__init__(protein)
+        super().__init__(protein, move_set)
         self.__start_temp = temperature
+        self.__schedule = check_schedule(schedule)
         self.iterations = 1000
+        self.schedule = self.__schedule(self.__start_temp, self.iterations)
+        self.accepted = self.rejected = self.reheats = 0
 
-    def get_temperature(self, i: int = 1) -> int:
+    def get_temperature(self, i: int = 1) -> float:
         """Returns the current temperature
 
         Parameters
@@ -31,43 +73,43 @@ class SimulatedAnnealing(HillClimber):
 
         Returns
         -------
-        int
-            the calculated temeperature at the given amout of iterations
+        float
+            the temperature of the schedule at the given amount of iterations
         """
-        return self.__start_temp - (self.__start_temp/self.iterations) * i
+        return self.schedule.temperature(i)
 
-    def accept(self, new: Protein, old: Protein, iterations: int = 1) -> bool:
+    @staticmethod
+    def accept(delta: int, temperature: float) -> float:
         """
-        Calculates whether the new (worse) protein configuration
-        should be accepted depending on the difference in score and the current
-        temperature
+        Calculates the chance to accept a new protein configuration by the
+        Metropolis criterion, from how much it changed the score
 
         Parameters
         ----------
-        new : Protein
-            the new protein configuration
-        old : Protein
-            the old protein configuration
-        iterations : int, optional
-            the amount of iterations we have already done, by default 1
+        delta : int
+            the score of the new configuration minus that of the old one
+        temperature : float
+            the current temperature
 
         Returns
         -------
         float
-            The chance to accept the new solution, even though it's worse
+            The chance to accept the new solution, 1 when it's no worse
         """
-    def accept(self, new, old, iterations=1):
-        # !!
-        return 2**(
-            new.score - old.score /
-            float(self.get_temperature(iterations)+1)
-        )
+        if delta <= 0:
+            return 1.0
+        return exp(-delta / temperature)
 
-    # gebruiken om het algoritme te starten
     def run(self,
             iterations: int = 1000,
-            start_temp: int = None,
-            verbose: bool = False
+            start_temp: float = None,
+            verbose: bool = False,
+            move_set: str = None,
+            time_budget: Optional[float] = None,
+            target_score: Optional[int] = None,
+            max_evaluations: Optional[int] = None,
+            schedule: str = None,
+            reheat: Optional[int] = None
             ) -> Protein:
         """
         Starts the algorithm
@@ -76,52 +118,107 @@ class SimulatedAnnealing(HillClimber):
         ----------
         iterations : int, optional
             the amount of iterations to run; by default 1000
-        start_temp : int, optional
-            the starting temperature
+        start_temp : float, optional
+            the starting temperature, by default the one of this instance
         verbose : bool, optional
             whether to log messages to stdout, by default False
+        move_set : str, optional
+            the name of the moves to fold the protein with, see
+            `moves.MOVE_SETS`; by default the move set of this instance
+        time_budget : float, optional
+            the most seconds to run for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as a fold reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most folds to score, by default no limit; why the run stopped
+            is kept in `stop_reason`, see `BaseAlgorithm.set_limits`
+        schedule : str, optional
+            the name of the cooling schedule, see `schedules.SCHEDULES`;
+            by default the schedule of this instance
+        reheat : int, optional
+            the amount of iterations without a new best fold after which to
+            start cooling down from the starting temperature again,
+            by default never
 
         Returns
         -------
         Protein :
             Returns the best solution we have found
+
+        Raises
+        ------
+        ValueError
+            raises a ValueError when there's no schedule by the given name,
+            or the starting temperature is not above 0
         """
-        # set verbose
+        # set verbose, move set and limits
         self.verbose = verbose
+        self.set_move_set(move_set)
+        self.set_limits(time_budget, target_score, max_evaluations)
 
         # make sure we'll run the algorithm at least once
         self.iterations = max(1, iterations)
 
-        # same for temperature is set
-        if isinstance(start_temp, int):
-            self.__start_temp = max(100, start_temp)
+        # set the schedule and temperature, if given
+        if schedule is not None:
+            self.__schedule = check_schedule(schedule)
+        if start_temp is not None:
+            self.__start_temp = start_temp
+        self.schedule = self.__schedule(self.__start_temp, self.iterations)
+        self.accepted = self.rejected = self.reheats = 0
 
-        # get random starting point
+        # get random starting point, the best fold so far is kept apart as
+        # worse folds may be accepted
         curr = self.get_starting_point(self.protein)
+        best = Protein.copy(curr)
+        last_best = 0
 
         for i in range(self.iterations):
-            new_state = None
-            while not Protein.validate(new_state):
-                new_state = self.fold_randomly(curr)
-
-            self.log(
-                f"iteration: {i}; " +
-                f"score: {new_state.score - curr.score} "
-                f"accept chance: {self.accept(curr, new_state, i)}",
-            )
-
-            if curr.score >= new_state.score:
-                curr = Protein.copy(new_state)
-                continue
-
-            accept_chance = self.accept(new_state, curr, i+1)
-            #  self.log(f"accept?: {accept_chance}")
-            if random() < accept_chance:
-                curr = Protein.copy(new_state)
-
-            self.log(
-                f"Best solution: {curr}; " +
-                f"score: {curr.score}",
-            )
-
-        return Protein.copy(curr)
+            if self.stopped(best.score):
+                break
+
+            # heat up again when no better fold was found for too long
+            if reheat and i - last_best >= reheat:
+                self.schedule.reheat(i)
+                self.reheats += 1
+                last_best = i
+
+            # fold in place, the fold is undone when it's not accepted
+            score, moves = curr.score, None
+            while moves is None:
+                moves = self.mutate(curr)
+            self.evaluations += 1
+
+            delta = curr.score - score
+            temperature = self.schedule.temperature(i)
+            if delta > 0:
+                accepted = random() < self.accept(delta, temperature)
+                self.schedule.update(accepted)
+                if not accepted:
+                    self.revert(curr, moves)
+                    self.rejected += 1
+                    continue
+            self.accepted += 1
+
+            if curr.score < best.score:
+                best = Protein.copy(curr)
+                last_best = i
+
+            if self.verbose:
+                self.log(
+                    f"iteration: {i}; temperature: {temperature:.3f}; " +
+                    f"score: {curr.score}; best score: {best.score}; " +
+                    f"accepted: {self.accepted}; rejected: {self.rejected}",
+                    start=True
+                )
+
+        if self.stop_reason is None:
+            self.stop_reason = COMPLETED
+        self.log(
+            f"Best solution: {best}; score: {best.score}; " +
+            f"accepted: {self.accepted}; rejected: {self.rejected}",
+            end=True
+        )
+        self.best = best
+        return Protein.copy(best)
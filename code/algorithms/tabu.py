@@ -0,0 +1,200 @@
+from collections import deque
+import numpy as np
+import random
+from typing import Hashable, Optional, Union
+
+from algorithms.BaseAlgorithm import COMPLETED
+from algorithms.hillclimber import HillClimber
+from classes import batch
+from classes.protein import Protein
+
+
+class TabuList:
+    """The most recently added keys, forgetting the oldest once it's full
+
+    Looking a key up and adding one both take constant time, and it never
+    holds more keys than its size.
+
+    Attributes
+    ----------
+    size: int
+        the most keys to hold at once
+    """
+    def __init__(self, size: int) -> None:
+        """Constructor method
+
+        Parameters
+        ----------
+        size : int
+            the most keys to hold at once, 0 to never hold any
+        """
+        self.size = max(0, size)
+        self.__order = deque()
+        self.__counts = {}
+
+    def add(self, key: Hashable) -> None:
+        """Adds a key, forgetting the oldest key once there are too many"""
+        if not self.size:
+            return
+
+        self.__order.append(key)
+        self.__counts[key] = self.__counts.get(key, 0) + 1
+        if len(self.__order) > self.size:
+            oldest = self.__order.popleft()
+            self.__counts[oldest] -= 1
+            if not self.__counts[oldest]:
+                del self.__counts[oldest]
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Returns whether a key was added and not forgotten yet"""
+        return key in self.__counts
+
+    def __len__(self) -> int:
+        """Returns the amount of keys held, counting repeated keys again"""
+        return len(self.__order)
+
+
+class TabuSearch(HillClimber):
+    """Tabu search for folding proteins
+
+    Every iteration makes the best move of the whole neighbourhood, see
+    `HillClimber.neighbours`, even when it makes the score worse, so the
+    search walks out of local minima. To not walk straight back in, the
+    folds visited last are tabu: moves to them are skipped, unless they
+    would beat the best fold found so far. Folds are remembered by their
+    turns, see `batch.turns`, so rotations and mirror images of a fold are
+    tabu as well.
+
+    Attributes
+    ----------
+    tabu: TabuList
+        the keys of the folds the last run visited last
+    """
+    def __init__(
+        self,
+        protein: Union[Protein, str],
+        move_set: str = "pull"
+    ) -> None:
+        """Constructor method for TabuSearch, see `HillClimber.__init__`"""
+        super().__init__(protein, move_set)
+        self.tabu = TabuList(0)
+
+    def search(self, protein: Protein, best: Protein) -> Optional[Protein]:
+        """Makes the best move that is not tabu, in place
+
+        Parameters
+        ----------
+        protein : Protein
+            the protein to move
+        best : Protein
+            the best fold found so far, moves to folds that beat it are never
+            tabu
+
+        Returns
+        -------
+        Optional[Protein]
+            the new best fold, which is the moved protein if it beat the best
+            and otherwise the best itself; None if every move is tabu or
+            makes aminos overlap, in which case the protein is left as it was
+        """
+        moves, folds = self.neighbours(protein)
+        if not moves:
+            return None
+
+        scores, valid = batch.evaluate(protein.types, folds)
+        self.evaluations += len(moves)
+        keys = [row.tobytes() for row in batch.turns(folds)]
+        allowed = np.array([
+            is_valid and (key not in self.tabu or score < best.score)
+            for key, score, is_valid in zip(keys, scores, valid)
+        ], dtype=bool)
+        if not allowed.any():
+            return None
+
+        # the best allowed moves, ties broken at random
+        lowest = scores[allowed].min()
+        choice = random.choice(np.flatnonzero(allowed & (scores == lowest)))
+        protein.apply_move(moves[choice])
+        self.tabu.add(keys[choice])
+
+        return Protein.copy(protein) if protein.score < best.score else best
+
+    def run(
+        self,
+        runs: int = 1,
+        iterations: int = 1000,
+        tenure: int = 100,
+        verbose: bool = False,
+        move_set: str = None,
+        time_budget: Optional[float] = None,
+        target_score: Optional[int] = None,
+        max_evaluations: Optional[int] = None
+    ) -> Protein:
+        """Starts the algorithm
+
+        Parameters
+        ----------
+        runs : int, optional
+            the amount of times to start from a new random fold, by default 1
+        iterations : int, optional
+            the amount of moves every run makes, by default 1000
+        tenure : int, optional
+            the amount of folds visited last that are tabu, by default 100
+        verbose : bool, optional
+            whether to log messages to stdout, by default False
+        move_set : str, optional
+            the name of the moves to fold the protein with, see
+            `moves.MOVE_SETS`; by default the move set of this instance
+        time_budget : float, optional
+            the most seconds to run for, by default no limit
+        target_score : int, optional
+            the score to stop at as soon as a fold reaches it,
+            by default no target
+        max_evaluations : int, optional
+            the most folds to score, by default no limit; why the run stopped
+            is kept in `stop_reason`, see `BaseAlgorithm.set_limits`
+
+        Returns
+        -------
+        Protein
+            the best solution found by any run
+        """
+        self.verbose = verbose
+        self.set_move_set(move_set)
+        self.set_limits(time_budget, target_score, max_evaluations)
+
+        for s in range(max(1, runs)):
+            curr = self.get_starting_point(self.protein)
+            best = Protein.copy(curr)
+            self.tabu = TabuList(tenure)
+            self.tabu.add(batch.turns([curr.directions])[0].tobytes())
+
+            for i in range(max(1, iterations)):
+                if self.stopped(min(best.score, self.best.score)):
+                    break
+
+                found = self.search(curr, best)
+                if found is None:
+                    break
+                best = found
+
+                self.log(
+                    f"run: {s+1}; iteration {i}; score: {curr.score}; " +
+                    f"best score: {best.score}",
+                    start=True
+                )
+
+            # at least as good, so a valid fold replaces the unfolded input
+            if best.score <= self.best.score:
+                self.best = best
+            if self.stopped(self.best.score):
+                break
+
+        if self.stop_reason is None:
+            self.stop_reason = COMPLETED
+        self.log(
+            f"Best solution: {self.best}; score: {self.best.score}; " +
+            f"stopped: {self.stop_reason}",
+            end=True
+        )
+        return self.best
@@ -0,0 +1,122 @@
+"""Memory and throughput benchmark for the Protein class
+
+Run from the code directory, optionally passing the chain lengths to measure:
+
+    python benchmark.py 50 500 5000
+"""
+from math import isqrt
+import numpy as np
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List
+
+from classes import batch
+from classes.protein import Protein
+
+# the sequence is cut from a repetition of this pattern to the required length
+PATTERN = "HPHPPHHPHPPHPHHPPHPH"
+
+# the amount of conformations scored by a single batch evaluation
+BATCH_SIZE = 10000
+
+
+def serpentine(length: int) -> List[int]:
+    """Returns the directions of a valid snake-like fold of a given length
+
+    The chain runs back and forth in rows that are roughly as wide as the
+    square root of the length, which gives a compact fold with plenty of
+    bonds to score.
+
+    Parameters
+    ----------
+    length : int
+        the amount of aminos to fold
+
+    Returns
+    -------
+    List[int]
+        the directions of each amino, the last one being 0
+    """
+    width = max(2, isqrt(length))
+    directions, step = [], 1
+    for i in range(length - 1):
+        if i % width == width - 1:
+            directions.append(2)
+            step *= -1
+        else:
+            directions.append(step)
+
+    return directions + [0]
+
+
+def throughput(func: Callable[[], any]) -> float:
+    """Returns how many times a function can be called per second"""
+    number, seconds = timeit.Timer(func).autorange()
+    return number / seconds
+
+
+def memory(func: Callable[[], any]) -> int:
+    """Returns the amount of bytes still allocated by the result of func"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()  # noqa: F841, keeps the result alive while measuring
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before
+
+
+def benchmark(length: int) -> Dict[str, float]:
+    """Measures the memory usage and throughput of a protein of a given length
+
+    An iteration mimics a single hill climber proposal: copying the protein,
+    folding it at the middle, and then validating and scoring the result.
+
+    Parameters
+    ----------
+    length : int
+        the length of the protein to measure
+
+    Returns
+    -------
+    Dict[str, float]
+        the measurements, by name
+    """
+    types = (PATTERN * (length // len(PATTERN) + 1))[:length]
+    directions = serpentine(length)
+    protein = Protein(types, directions)
+    index = length // 2
+    direction = directions[index - 1]
+
+    # random walks; almost none are valid, but they take as long to score
+    walks = np.random.default_rng(0).choice([-2, -1, 1, 2], (BATCH_SIZE, length))
+    walks[:, -1] = 0
+
+    def iteration():
+        new = Protein.copy(protein)
+        new.fold(index, direction)
+        return new.is_valid and new.score
+
+    return {
+        "memory (kB)": memory(lambda: Protein(types, directions)) / 1024,
+        "init/s": throughput(lambda: Protein(types, directions)),
+        "copy/s": throughput(lambda: Protein.copy(protein)),
+        "score/s": throughput(lambda: protein.score),
+        "validate/s": throughput(lambda: protein.is_valid),
+        "iteration/s": throughput(iteration),
+        "batch/s": throughput(lambda: batch.evaluate(types, walks)) * BATCH_SIZE,
+    }
+
+
+def main(lengths: List[int]) -> None:
+    """Prints the benchmark results for every given length as a table"""
+    rows = {length: benchmark(length) for length in lengths}
+    columns = list(next(iter(rows.values())))
+
+    print(f"{'length':>8}" + "".join(f"{c:>14}" for c in columns))
+    for length, row in rows.items():
+        print(f"{length:>8}" + "".join(f"{row[c]:>14.1f}" for c in columns))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [50, 500, 5000])
@@ -0,0 +1,272 @@
+"""Scores and validates many conformations of the same protein at once
+
+Conformations are given as a 2d integer array with one row of directions per
+conformation, in the same format as `Protein.directions`; the direction of the
+last amino is ignored. None of the functions create Protein instances.
+"""
+import numpy as np
+from typing import Tuple
+
+from classes.conformation import ANGLES, ENERGY, STEPS, TYPE_TABLE
+
+# the maximum amount of values in the temporary arrays of a single chunk
+CHUNK_SIZE = 1 << 21
+
+
+def check_directions(directions: np.ndarray, length: int = None) -> np.ndarray:
+    """Returns the directions as a 2d array, after checking them
+
+    Parameters
+    ----------
+    directions : np.ndarray
+        one row of directions per conformation
+    length : int, optional
+        the amount of directions each row should hold, by default any
+
+    Returns
+    -------
+    np.ndarray
+        the directions as a 2d integer array
+
+    Raises
+    ------
+    ValueError
+        raises a ValueError when the array is not 2d, the rows have the wrong
+        length or any direction is not between -2 and 2
+    """
+    directions = np.asarray(directions)
+    if directions.ndim != 2:
+        raise ValueError("directions must be a 2d array")
+    if length is not None and directions.shape[1] != length:
+        raise ValueError(
+            f"rows must hold {length} directions; "
+            f"held {directions.shape[1]}"
+        )
+    if directions.size and np.abs(directions).max() > 2:
+        raise ValueError("directions must be integers between -2 and 2")
+
+    return directions
+
+
+def coordinates(directions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the coordinates of every amino of every conformation
+
+    Parameters
+    ----------
+    directions : np.ndarray
+        one row of directions per conformation
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        the x and y coordinates, one row per conformation,
+        with the first amino at (0, 0)
+    """
+    directions = check_directions(directions)
+    steps = STEPS[directions[:, :-1] + 2]
+
+    xs = np.zeros(directions.shape, dtype=np.intc)
+    ys = np.zeros(directions.shape, dtype=np.intc)
+    np.cumsum(steps[..., 0], axis=1, out=xs[:, 1:])
+    np.cumsum(steps[..., 1], axis=1, out=ys[:, 1:])
+    return xs, ys
+
+
+def bond_pairs(sequence: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns every pair of aminos that could ever form a bond
+
+    Only H and C aminos bond, and as the lattice is a checkerboard, only
+    aminos an odd number of places apart, at least 3, can be neighbours.
+
+    Parameters
+    ----------
+    sequence : str
+        the types of the aminos
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        the indices of the first and second amino of each pair, and the
+        energy of the bond they would form
+    """
+    types = np.frombuffer(
+        sequence.upper().encode("ascii", "replace").translate(TYPE_TABLE),
+        dtype=np.int8
+    )
+    bonding = np.flatnonzero(types)
+    first, second = np.triu_indices(len(bonding), 1)
+    first, second = bonding[first], bonding[second]
+
+    gap = second - first
+    possible = (gap >= 3) & (gap % 2 == 1)
+    first, second = first[possible], second[possible]
+    return first, second, ENERGY[types[first], types[second]]
+
+
+def _unique(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Returns per row whether no two coordinates are the same"""
+    length = xs.shape[1]
+    keys = xs.astype(np.int64) * (2 * length + 1) + ys
+    keys.sort(axis=1)
+    return np.all(np.diff(keys, axis=1) != 0, axis=1)
+
+
+def _score(
+        xs: np.ndarray,
+        ys: np.ndarray,
+        pairs: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    """Returns per row the sum of the energy of the pairs that touch"""
+    first, second, energy = pairs
+    distance = np.abs(xs[:, first] - xs[:, second])
+    distance += np.abs(ys[:, first] - ys[:, second])
+    return (distance == 1) @ energy
+
+
+def evaluate(
+        sequence: str,
+        directions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Scores and validates many conformations of a protein at once
+
+    Parameters
+    ----------
+    sequence : str
+        the types of the aminos of the protein
+    directions : np.ndarray
+        one row of directions per conformation, one direction per amino
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        the score and whether it is valid, of every conformation; the score
+        of a conformation in which aminos overlap has no meaning
+
+    Raises
+    ------
+    ValueError
+        raises a ValueError when the rows do not hold a direction per amino
+    """
+    directions = check_directions(directions, len(sequence))
+    count, length = directions.shape
+    pairs = bond_pairs(sequence)
+
+    scores = np.zeros(count, dtype=np.int64)
+    valid = np.zeros(count, dtype=bool)
+    rows = max(1, CHUNK_SIZE // max(length, len(pairs[0]), 1))
+
+    for start in range(0, count, rows):
+        chunk = directions[start:start + rows]
+        xs, ys = coordinates(chunk)
+        scores[start:start + rows] = _score(xs, ys, pairs)
+        valid[start:start + rows] = \
+            np.all(chunk[:, :-1] != 0, axis=1) & _unique(xs, ys)
+
+    return scores, valid
+
+
+def score(sequence: str, directions: np.ndarray) -> np.ndarray:
+    """Returns the score of many conformations of a protein, see `evaluate`
+    """
+    return evaluate(sequence, directions)[0]
+
+
+def validate(directions: np.ndarray) -> np.ndarray:
+    """Returns whether each of many conformations is completely folded
+    without overlap
+
+    Parameters
+    ----------
+    directions : np.ndarray
+        one row of directions per conformation
+
+    Returns
+    -------
+    np.ndarray
+        a boolean per conformation, True if it is valid
+    """
+    directions = check_directions(directions)
+    valid = np.zeros(len(directions), dtype=bool)
+    rows = max(1, CHUNK_SIZE // max(directions.shape[1], 1))
+
+    for start in range(0, len(directions), rows):
+        chunk = directions[start:start + rows]
+        valid[start:start + rows] = \
+            np.all(chunk[:, :-1] != 0, axis=1) & _unique(*coordinates(chunk))
+
+    return valid
+
+
+def overlaps(directions: np.ndarray) -> np.ndarray:
+    """Returns the first amino of every conformation that lands on a point
+    taken by an amino before it
+
+    Parameters
+    ----------
+    directions : np.ndarray
+        one row of directions per conformation
+
+    Returns
+    -------
+    np.ndarray
+        the index of that amino per conformation, or -1 when no aminos
+        overlap; unlike `validate`, directions that are 0 are allowed
+    """
+    directions = check_directions(directions)
+    count, length = directions.shape
+    first = np.full(count, -1, dtype=np.intp)
+    if length < 2:
+        return first
+
+    # the point of every amino as a single number, summed up step by step,
+    # with the index of the amino in the lowest bits, so sorting the numbers
+    # puts the aminos on the same point next to each other, earliest first
+    bits = (length - 1).bit_length()
+    width = 2 * length + 1
+    dtype = np.int32 if width * width << bits < 2 ** 31 else np.int64
+    steps = (STEPS[:, 0] * width + STEPS[:, 1]).astype(dtype) << bits
+    keys = np.zeros(directions.shape, dtype=dtype)
+    np.cumsum(steps[directions[:, :-1] + 2], axis=1, out=keys[:, 1:])
+    keys += np.arange(length, dtype=dtype)
+    keys.sort(axis=1)
+
+    points = keys >> bits
+    later = np.where(
+        points[:, 1:] == points[:, :-1], keys[:, 1:] & ((1 << bits) - 1),
+        length
+    )
+    first = later.min(axis=1)
+    first[first == length] = -1
+    return first
+
+
+def turns(directions: np.ndarray) -> np.ndarray:
+    """Returns the turns between the directions of many conformations, the
+    same for every rotation and mirror image of a conformation
+
+    Like `Conformation.key`, the turns are 0 (straight), 1 (left), 2 (back)
+    or 3 (right), mirrored to make the first turn to either side a left turn;
+    every conformation must be completely folded.
+
+    Parameters
+    ----------
+    directions : np.ndarray
+        one row of directions per conformation
+
+    Returns
+    -------
+    np.ndarray
+        one row of turns per conformation, one less than there are
+        directions between aminos; the bytes of a row can be used as a key
+    """
+    directions = check_directions(directions)
+    angles = ANGLES[directions[:, :-1] + 2].astype(np.int8)
+    result = ((angles[:, 1:] - angles[:, :-1]) % 4).astype(np.uint8)
+
+    # mirror the rows of which the first turn to either side goes right
+    sides = result % 2 == 1
+    if result.shape[1]:
+        first = np.argmax(sides, axis=1)
+        rows = np.arange(len(result))
+        mirror = sides.any(axis=1) & (result[rows, first] == 3)
+        result[mirror] = (4 - result[mirror]) % 4
+
+    return result
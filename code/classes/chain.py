@@ -0,0 +1,460 @@
+from array import array
+from typing import Callable, List, Optional, Tuple
+
+from classes.conformation import BOND_ENERGY, DELTAS, TYPE_TABLE
+from classes.occupancy import STRIDE
+
+# the packed step to every neighbour of a point, see `occupancy.pack`
+NEIGHBOUR_KEYS = (-1, -STRIDE, STRIDE, 1)
+
+# the packed steps to the neighbours of a point going round counter-clockwise
+# from the right, each with the corner point between it and the next
+AROUND = (
+    (STRIDE, STRIDE + 1), (1, 1 - STRIDE),
+    (-STRIDE, -STRIDE - 1), (-1, STRIDE - 1),
+)
+
+# the most empty points to count when looking for room for the rest of the
+# chain, larger pockets are left to backtracking
+FLOOD_LIMIT = 256
+
+# an option to place the next amino at, as its direction and its gain
+Option = Tuple[int, int]
+
+
+class Chain:
+    """A protein that is placed one amino at a time, for backtracking
+
+    Rather than folding a whole conformation, only the aminos placed so far
+    are stored, together with the score of the bonds between them. Placing
+    the next amino and taking the last one back both take constant time,
+    so a search can walk the entire tree of folds with a single chain and
+    without copying anything.
+
+    Attributes
+    ----------
+    sequence: str
+        the types of the aminos, one character per amino
+    types: array
+        the type of each amino as a code, see `conformation.TYPE_CODES`
+    directions: array
+        the direction of each amino placed so far, followed by zeros
+    placed: int
+        the amount of aminos placed so far, the first is always placed
+    score: int
+        the energy of the bonds between the placed aminos
+    """
+    __slots__ = (
+        "sequence", "types", "directions", "placed", "score",
+        "__x", "__y", "__keys", "__points", "__gains"
+    )
+
+    def __init__(self, sequence: str, directions: Tuple[int, ...] = ()):
+        """Constructor method
+
+        Parameters
+        ----------
+        sequence : str
+            the types of the aminos, one character per amino
+        directions : Tuple[int, ...], optional
+            the directions of the first aminos to place, up to the first
+            direction that is 0; by default ()
+
+        Raises
+        ------
+        ValueError
+            raises a ValueError when the given directions make aminos overlap
+        """
+        self.sequence = sequence.upper()
+        self.types = array(
+            "b",
+            self.sequence.encode("ascii", "replace").translate(TYPE_TABLE)
+        )
+        self.directions = array("b", [0]) * len(self.types)
+        self.placed = min(len(self.types), 1)
+        self.score = 0
+
+        # the first amino starts at (0, 0)
+        self.__x = array("i", [0]) * self.placed
+        self.__y = array("i", [0]) * self.placed
+        self.__keys = [0] * self.placed
+        self.__points = dict.fromkeys(self.__keys, 0)
+        self.__gains = []
+
+        for direction in directions:
+            if not direction or self.placed == len(self.types):
+                break
+            if self.extend(direction) is None:
+                raise ValueError("Given directions make aminos overlap")
+
+    def neighbour(self, direction: int) -> Tuple[int, int]:
+        """Returns the point one step away from the last placed amino"""
+        step_x, step_y = DELTAS[direction + 2]
+        return self.__x[-1] + step_x, self.__y[-1] + step_y
+
+    def at(self, x: int, y: int) -> int:
+        """Returns the index of the placed amino at the given coordinates,
+        or -1 when the point is empty"""
+        return self.__points.get(x * STRIDE + y, -1)
+
+    def options(self) -> List[int]:
+        """Returns the directions to place the next amino in
+
+        Like `Conformation.foldoptions`, the first two directions are fixed
+        as far as possible, as every other fold is a rotation or mirror image
+        of one of them.
+        """
+        index = self.placed - 1
+        if index == 0:
+            return [1]
+        elif index == 1:
+            return [1, 2]
+
+        folds = [1, 2, -2, -1]
+        folds.remove(-self.directions[index - 1])
+        return folds
+
+    def gain(self, direction: int) -> Optional[int]:
+        """Returns how much the score would change by placing the next amino
+        in a direction, without placing it
+
+        Returns
+        -------
+        Optional[int]
+            the energy of the bonds the next amino would form with the placed
+            aminos, or None if the point is already taken
+        """
+        step_x, step_y = DELTAS[direction + 2]
+        key = self.__keys[-1] + step_x * STRIDE + step_y
+        points = self.__points
+        if key in points:
+            return None
+
+        index = self.placed
+        kind = self.types[index]
+        if not kind:
+            return 0
+
+        types, energy = self.types, BOND_ENERGY[kind]
+        gain = 0
+        for step in NEIGHBOUR_KEYS:
+            j = points.get(key + step, index)
+            if j < index - 1:
+                gain += energy[types[j]]
+
+        return gain
+
+    def room(self, direction: int) -> int:
+        """Returns the amount of empty points next to the point one step away
+        from the last placed amino in a direction, not counting that amino"""
+        step_x, step_y = DELTAS[direction + 2]
+        key = self.__keys[-1] + step_x * STRIDE + step_y
+        points = self.__points
+        return sum(key + step not in points for step in NEIGHBOUR_KEYS)
+
+    def traps(self, limit: int = FLOOD_LIMIT) -> List[int]:
+        """Returns the directions to place the next amino in that would leave
+        too little room for the rest of the chain
+
+        The last placed amino may have split the empty points around it into
+        parts that are not connected. Its empty neighbours are joined right
+        away when the corner point between them is empty; the parts that are
+        left are flood filled all at the same time, until they turn out to
+        be connected after all, are filled up, or are large enough. That way
+        only as many points are counted as the smaller parts hold.
+
+        Parameters
+        ----------
+        limit : int, optional
+            the most empty points to count per part, by default FLOOD_LIMIT;
+            0 to never look for traps
+
+        Returns
+        -------
+        List[int]
+            the directions that lead into a pocket too small to hold every
+            amino after the next one; pockets larger than the limit are never
+            found
+        """
+        return self.__split(limit)[0]
+
+    def __split(self, limit: int) -> Tuple[List[int], bool]:
+        """Finds the pockets the last placed amino may have closed off,
+        see `Chain.traps`
+
+        Parameters
+        ----------
+        limit : int
+            the most empty points to count per part
+
+        Returns
+        -------
+        Tuple[List[int], bool]
+            the directions that lead into a pocket too small to hold every
+            amino after the next one, and whether more than one part was only
+            counted up to the limit, so any of them may still be too small
+        """
+        remaining = len(self.types) - self.placed - 1
+        needed = min(remaining, limit)
+        if needed <= 0 or self.placed < 2:
+            return [], False
+
+        points, key = self.__points, self.__keys[-1]
+        empty = [key + step not in points for step, _ in AROUND]
+
+        # the part every empty neighbour is in, joined to the one before it
+        # through an empty corner; the ring wraps around to the first
+        owner = {}
+        parts = 0
+        for i, (step, _) in enumerate(AROUND):
+            if not empty[i]:
+                continue
+            if i and empty[i - 1] and key + AROUND[i - 1][1] not in points:
+                owner[key + step] = owner[key + AROUND[i - 1][0]]
+            else:
+                owner[key + step] = parts
+                parts += 1
+        if empty[0] and empty[-1] and key + AROUND[-1][1] not in points:
+            last = owner[key + AROUND[-1][0]]
+            owner = {
+                point: owner[key + AROUND[0][0]] if part == last else part
+                for point, part in owner.items()
+            }
+        if len(set(owner.values())) < 2:
+            return [], False
+
+        # flood fill the parts one point at a time each; parts that meet are
+        # merged into the one that found the other
+        merged = {}
+        frontiers = {}
+        for point, part in owner.items():
+            frontiers.setdefault(part, []).append(point)
+        sizes = {part: len(frontier) for part, frontier in frontiers.items()}
+        growing = list(frontiers)
+        while growing:
+            for part in list(growing):
+                if part in merged:
+                    continue
+                frontier = frontiers[part]
+                if not frontier or sizes[part] > needed:
+                    growing.remove(part)
+                    continue
+
+                point = frontier.pop()
+                for step in NEIGHBOUR_KEYS:
+                    other = point + step
+                    if other in points or other == key:
+                        continue
+                    found = owner.get(other)
+                    if found is None:
+                        owner[other] = part
+                        frontier.append(other)
+                        sizes[part] += 1
+                        continue
+
+                    while found in merged:
+                        found = merged[found]
+                    if found != part:
+                        merged[found] = part
+                        frontier.extend(frontiers.pop(found))
+                        sizes[part] += sizes.pop(found)
+                        if found in growing:
+                            growing.remove(found)
+                        if part not in growing:
+                            growing.append(part)
+
+            growing = [part for part in growing if part not in merged]
+            if len(frontiers) < 2:
+                return [], False
+
+        traps = []
+        for direction in self.options():
+            step_x, step_y = DELTAS[direction + 2]
+            part = owner.get(key + step_x * STRIDE + step_y)
+            if part is None:
+                continue
+            while part in merged:
+                part = merged[part]
+            if sizes[part] <= needed:
+                traps.append(direction)
+
+        unsure = sum(size > needed for size in sizes.values()) > 1
+        return traps, unsure and needed < remaining
+
+    def grow(
+            self,
+            choose: Callable[[List[Option]], Option],
+            limit: int = FLOOD_LIMIT) -> int:
+        """Places every amino that is not placed yet, in place
+
+        Every amino is placed at one of the empty points next to the last,
+        skipping the ones that lead into pockets that are too small for the
+        rest of the chain, see `Chain.traps`. Pockets larger than the limit
+        can still trap the chain; when there is no point left to go to, the
+        chain is taken back to the last split in which more than one part
+        was too large to count, and grown into another of them. Without such
+        a split, running into the same dead end again takes back twice as
+        many aminos each time, until the chain gets out of the corner it
+        folded itself into; dead ends on the way back out are handled the
+        same way, but never take back more than the dead end they are part
+        of. Aminos placed before growing are never taken back.
+
+        Parameters
+        ----------
+        choose : Callable[[List[Option]], Option]
+            picks the option to place the next amino at, from a list of the
+            directions that are left and how much they add to the score
+        limit : int, optional
+            the most empty points to count when looking for room for the
+            rest of the chain, see `Chain.traps`; by default FLOOD_LIMIT
+
+        Returns
+        -------
+        int
+            the amount of dead ends the chain ran into
+
+        Raises
+        ------
+        ValueError
+            raises a ValueError when there is no room at all for the aminos
+            after the ones placed before growing
+        """
+        first = self.placed
+
+        # the splits that could not be settled, as the amount of aminos
+        # placed at the split and the directions tried there already
+        forks = {}
+
+        # the dead ends the chain has not grown past yet, the last one
+        # innermost; as the amount of aminos placed at the dead end and the
+        # amount to take back from there
+        dead_ends = []
+        count = 0
+        while not self.is_complete():
+            traps, unsure = self.__split(limit)
+            tried = forks.get(self.placed, ())
+            options = []
+            for direction in self.options():
+                gain = self.gain(direction)
+                if gain is not None and direction not in traps and \
+                        direction not in tried:
+                    options.append((direction, gain))
+
+            if options:
+                if unsure and len(options) > 1:
+                    forks.setdefault(self.placed, set())
+                self.extend(*choose(options))
+                continue
+            if self.placed == first:
+                raise ValueError("No room to place the rest of the chain")
+
+            count += 1
+            forks.pop(self.placed, None)
+            if forks:
+                placed = max(forks)
+                while self.placed > placed + 1:
+                    self.retract()
+                forks[placed].add(self.retract())
+                continue
+
+            placed = self.placed
+            while dead_ends and dead_ends[-1][0] < placed:
+                dead_ends.pop()
+            if dead_ends and dead_ends[-1][0] == placed:
+                dead_ends[-1][1] *= 2
+            else:
+                dead_ends.append([placed, 1])
+
+            # a dead end on the way out of another may not take back more
+            # than that one, which takes back twice as many aminos instead
+            while len(dead_ends) > 1 and \
+                    dead_ends[-1][0] - dead_ends[-1][1] < \
+                    dead_ends[-2][0] - dead_ends[-2][1]:
+                dead_ends.pop()
+                dead_ends[-1][1] *= 2
+
+            placed, back = dead_ends[-1]
+            for _ in range(self.placed - max(first, placed - back)):
+                self.retract()
+
+        return count
+
+    def extend(
+            self,
+            direction: int,
+            gain: Optional[int] = None) -> Optional[int]:
+        """Places the next amino one step away from the last, in place
+
+        Parameters
+        ----------
+        direction : int
+            the direction to fold the last placed amino in
+        gain : int, optional
+            the result of `Chain.gain` for the same direction, when it is
+            already known; by default it is calculated
+
+        Returns
+        -------
+        Optional[int]
+            the energy of the bonds the new amino formed,
+            or None if the point was taken and nothing was placed
+
+        Raises
+        ------
+        IndexError
+            raises an IndexError when every amino has been placed already
+        """
+        if self.placed >= len(self.types):
+            raise IndexError("Every amino has been placed already")
+        if gain is None:
+            gain = self.gain(direction)
+            if gain is None:
+                return None
+
+        index = self.placed
+        x, y = self.neighbour(direction)
+        key = x * STRIDE + y
+        self.directions[index - 1] = direction
+        self.__x.append(x)
+        self.__y.append(y)
+        self.__keys.append(key)
+        self.__points[key] = index
+        self.__gains.append(gain)
+        self.placed += 1
+        self.score += gain
+        return gain
+
+    def retract(self) -> int:
+        """Takes the last placed amino back, undoing `Chain.extend`
+
+        Returns
+        -------
+        int
+            the direction the amino had been placed in
+
+        Raises
+        ------
+        IndexError
+            raises an IndexError when only the first amino is placed
+        """
+        if self.placed < 2:
+            raise IndexError("Cannot take back the first amino")
+
+        self.placed -= 1
+        index = self.placed
+        del self.__points[self.__keys.pop()]
+        self.__x.pop()
+        self.__y.pop()
+        self.score -= self.__gains.pop()
+
+        direction = self.directions[index - 1]
+        self.directions[index - 1] = 0
+        return direction
+
+    def is_complete(self) -> bool:
+        """Returns whether every amino has been placed"""
+        return self.placed == len(self.types)
+
+    def __len__(self) -> int:
+        """Returns the amount of aminos in the chain, placed or not"""
+        return len(self.types)
@@ -0,0 +1,794 @@
+from array import array
+import numpy as np
+from typing import Mapping, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+from classes.occupancy import HashOccupancy, Occupancy
+
+# maps amino types to the codes stored in Conformation.types,
+# any type that is not listed never forms bonds and is stored as 0
+TYPE_CODES = {"P": 0, "H": 1, "C": 2}
+TYPE_TABLE = bytes(TYPE_CODES.get(chr(i), 0) for i in range(256))
+
+# the energy of a bond between two amino types, indexed by their codes
+ENERGY = np.array([
+    [0, 0, 0],
+    [0, -1, -1],
+    [0, -1, -5],
+], dtype=np.int64)
+
+# the energy table as nested lists, for looking up single values
+BOND_ENERGY = ENERGY.tolist()
+
+# the unit step of every direction, indexed by direction + 2
+DELTAS = ((0, -1), (-1, 0), (0, 0), (1, 0), (0, 1))
+STEPS = np.array(DELTAS, dtype=np.intc)
+
+# the steps to all four neighbours of a point
+NEIGHBOUR_DELTAS = DELTAS[:2] + DELTAS[3:]
+NEIGHBOURS = np.array(NEIGHBOUR_DELTAS, dtype=np.intc)
+
+# the quarter turns of every direction counter-clockwise from the right,
+# indexed by direction + 2; turns between them are 0 (straight), 1 (left),
+# 2 (back) or 3 (right)
+ANGLES = np.array([3, 2, 0, 0, 1], dtype=np.uint8)
+
+# looking only right and up from every amino finds every bond exactly once
+FORWARD = STEPS[[3, 4]]
+
+# stretches of at most this many aminos are checked one by one,
+# as numpy is slower than plain python for only a few aminos
+SCALAR_LIMIT = 64
+
+# the new direction of every amino a move folds, by index
+Changes = Union[Mapping[int, int], Sequence[Tuple[int, int]]]
+
+
+class Move(NamedTuple):
+    """Everything needed to undo a move, see `Conformation.apply_move`
+
+    Attributes
+    ----------
+    directions: Tuple[Tuple[int, int], ...]
+        the index and previous direction of every amino the move folded
+    start: int
+        the index of the first amino the move placed elsewhere
+    x: array
+        the previous x coordinates of the aminos from start onwards
+    y: array
+        the previous y coordinates of the aminos from start onwards
+    score: Optional[int]
+        the cached score before the move
+    """
+    directions: Tuple[Tuple[int, int], ...]
+    start: int
+    x: array
+    y: array
+    score: Optional[int]
+
+
+class Conformation:
+    """Compact, array-backed state of a folded protein
+
+    Instead of keeping an Amino object per amino acid, the types, directions
+    and absolute coordinates of all aminos are stored in flat typed buffers.
+    An occupancy index stores which amino occupies which point, by default
+    in a dict, so memory grows linearly with the length of the chain.
+
+    Attributes
+    ----------
+    sequence: str
+        the types of the aminos, one character per amino
+    types: array
+        the type of each amino as a code, see `TYPE_CODES`
+    directions: array
+        the direction each amino is folded in, between -2 and 2
+    x: array
+        the absolute x coordinate of each amino
+    y: array
+        the absolute y coordinate of each amino
+    occupancy: Occupancy
+        the index of the first amino at every occupied point
+
+    The score is cached until the conformation changes, so any change must go
+    through the methods of this class rather than through the buffers.
+    """
+    __slots__ = (
+        "sequence", "types", "directions", "x", "y", "occupancy", "_score"
+    )
+
+    def __init__(
+            self,
+            sequence: str,
+            directions: Sequence[int] = (),
+            occupancy: Type[Occupancy] = HashOccupancy):
+        """Constructor method
+
+        Parameters
+        ----------
+        sequence : str
+            the types of the aminos, one character per amino
+        directions : Sequence[int], optional
+            the direction of each amino; missing directions default to 0
+            and surplus directions are ignored, by default ()
+        occupancy : Type[Occupancy], optional
+            the kind of occupancy index to use, by default HashOccupancy
+
+        Raises
+        ------
+        ValueError
+            raises a ValueError when any of the directions is not an integer
+            between -2 and 2
+        """
+        self.sequence = sequence.upper()
+        length = len(self.sequence)
+
+        self.types = array(
+            "b",
+            self.sequence.encode("ascii", "replace").translate(TYPE_TABLE)
+        )
+
+        directions = np.asarray(list(directions)[:length], dtype=np.int64)
+        if np.any(np.abs(directions) > 2):
+            raise ValueError(
+                "Given direction is not valid. \
+                 Must be an interger between -2 and 2"
+            )
+        self.directions = array("b", directions.astype(np.int8).tobytes())
+        self.directions.extend([0] * (length - len(directions)))
+
+        self.x = array("i", [0]) * length
+        self.y = array("i", [0]) * length
+        self.occupancy = occupancy(length)
+        self.occupancy.claim(self.x[:1], self.y[:1], range(min(length, 1)))
+        self._score = None
+        self.place()
+
+    @staticmethod
+    def check_direction(direction: int) -> int:
+        """Returns the given direction if it is valid
+
+        Raises
+        ------
+        ValueError
+            raises a ValueError when the direction is not an integer
+            between -2 and 2
+        """
+        if direction not in range(-2, 3):
+            raise ValueError(
+                "Given direction is not valid. \
+                 Must be an interger between -2 and 2"
+            )
+        return int(direction)
+
+    def views(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns numpy views on the types, directions, x and y buffers
+
+        The views share memory with the buffers, so writing to them changes
+        this conformation. Do not keep them around: the buffers cannot grow
+        while a view on them exists.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            the types, directions, x and y of every amino
+        """
+        return (
+            np.frombuffer(self.types, dtype=np.int8),
+            np.frombuffer(self.directions, dtype=np.int8),
+            np.frombuffer(self.x, dtype=np.intc),
+            np.frombuffer(self.y, dtype=np.intc),
+        )
+
+    def place(self, index: int = 0) -> None:
+        """Recomputes the coordinates of all aminos after a given index
+
+        Every amino is placed one step away from the previous amino, in the
+        direction of that previous amino. Aminos up to and including the
+        given index keep their coordinates.
+
+        Parameters
+        ----------
+        index : int, optional
+            the index of the last amino that keeps its place, by default 0
+        """
+        length = len(self)
+        self._score = None
+        if index + 1 >= length:
+            return
+
+        _, directions, xs, ys = self.views()
+        tail = np.arange(index + 1, length)
+
+        # clear the points held by the aminos that are about to move
+        self.occupancy.release(xs[tail], ys[tail], tail)
+
+        # follow the directions from the amino at the given index
+        steps = np.cumsum(STEPS[directions[index:-1] + 2], axis=0)
+        xs[tail] = xs[index] + steps[:, 0]
+        ys[tail] = ys[index] + steps[:, 1]
+
+        # claim the empty points, the first amino on a point holds it
+        self.occupancy.claim(xs[tail], ys[tail], tail)
+
+    def at(self, x: int, y: int) -> int:
+        """Returns the index of the amino at the given coordinates
+
+        Returns
+        -------
+        int
+            the index of the (first) amino at the coordinates,
+            or -1 when the point is empty
+        """
+        return self.occupancy.get(x, y)
+
+    def neighbour(self, index: int, direction: int) -> Tuple[int, int]:
+        """Returns the coordinates one step away from an amino in a direction
+
+        Parameters
+        ----------
+        index : int
+            the index of the amino to step away from
+        direction : int
+            the direction to step in, between -2 and 2
+
+        Returns
+        -------
+        Tuple[int, int]
+            the absolute x and y coordinates of the point
+        """
+        dx, dy = DELTAS[direction + 2]
+        return self.x[index] + dx, self.y[index] + dy
+
+    def is_empty(self, index: int, direction: int) -> bool:
+        """Returns whether the point next to an amino in a direction is empty
+        """
+        return self.at(*self.neighbour(index, direction)) < 0
+
+    def foldoptions(
+            self,
+            index: int,
+            completely_random: bool = False) -> list:
+        """Returns the valid fold directions of an amino
+
+        See Also
+        --------
+        `Protein.foldoptions`: for an explanation of the options
+        """
+        if not completely_random and index == 0:
+            return [1]
+        elif not completely_random and index == 1:
+            return [1, 2]
+
+        folds = [1, 2, -2, -1]
+        if index > 0 and self.directions[index - 1]:
+            folds.remove(self.directions[index - 1] * -1)
+
+        return folds
+
+    def __bonds(
+            self,
+            origins: np.ndarray,
+            steps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Looks for bonds from the given aminos in the given steps
+
+        Parameters
+        ----------
+        origins : np.ndarray
+            the indices of the aminos to look from
+        steps : np.ndarray
+            the (dx, dy) steps to look in
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            the indices of the origin and target amino of each bond found
+        """
+        types, _, xs, ys = self.views()
+        origins = origins[types[origins] != 0]
+
+        x = (xs[origins] + steps[:, :1]).ravel()
+        y = (ys[origins] + steps[:, 1:]).ravel()
+        origins = np.tile(origins, len(steps))
+
+        targets = self.occupancy.lookup(x, y)
+        found = (targets >= 0) & (types[targets] != 0) & \
+            (np.abs(targets - origins) > 1)
+        return origins[found], targets[found]
+
+    def contacts(self, indices: Sequence[int] = None) -> np.ndarray:
+        """Returns the bonds between aminos in the current configuration
+
+        Two aminos form a bond when they are both H or C aminos, lie next to
+        each other in the lattice, and are not direct neighbours in the chain.
+
+        Parameters
+        ----------
+        indices : Sequence[int], optional
+            only return the bonds these aminos take part in,
+            by default all bonds are returned
+
+        Returns
+        -------
+        np.ndarray
+            an (m, 2) array holding each bond once, as a pair of amino
+            indices with the lowest index first
+        """
+        if indices is None:
+            origins, targets = self.__bonds(np.arange(len(self)), FORWARD)
+        else:
+            origins, targets = self.__bonds(
+                np.unique(np.asarray(indices, dtype=np.intp)),
+                NEIGHBOURS
+            )
+
+        pairs = np.stack(
+            (np.minimum(origins, targets), np.maximum(origins, targets)),
+            axis=1
+        )
+        return pairs if indices is None else np.unique(pairs, axis=0)
+
+    def score(self) -> int:
+        """Returns the sum of the energy of all bonds, the lower the better
+
+        The score is only calculated again after the conformation changed.
+        """
+        if self._score is None:
+            types = np.frombuffer(self.types, dtype=np.int8)
+            origins, targets = self.__bonds(np.arange(len(self)), FORWARD)
+            self._score = int(ENERGY[types[origins], types[targets]].sum())
+        return self._score
+
+    def __cross_energy(
+            self,
+            start: int,
+            stop: int,
+            dx: int = 0,
+            dy: int = 0) -> Optional[int]:
+        """Returns the energy of the bonds between a stretch of aminos and
+        the rest of the chain, as if the stretch was moved by (dx, dy)
+
+        Assumes that no two aminos overlap in the current conformation.
+
+        Parameters
+        ----------
+        start : int
+            the index of the first amino of the stretch
+        stop : int
+            the index after the last amino of the stretch
+        dx : int, optional
+            the distance to move the stretch along the x-axis, by default 0
+        dy : int, optional
+            the distance to move the stretch along the y-axis, by default 0
+
+        Returns
+        -------
+        Optional[int]
+            the energy of the bonds, or None if a moved amino would overlap
+            with an amino outside of the stretch
+        """
+        if stop - start <= SCALAR_LIMIT:
+            return self.__cross_energy_scalar(start, stop, dx, dy)
+
+        types, _, xs, ys = self.views()
+        origins = np.arange(start, stop)
+        x, y = xs[start:stop] + dx, ys[start:stop] + dy
+
+        if dx or dy:
+            held = self.occupancy.lookup(x, y)
+            if np.any((held >= 0) & ((held < start) | (held >= stop))):
+                return None
+
+        bonding = types[start:stop] != 0
+        origins, x, y = origins[bonding], x[bonding], y[bonding]
+        x = (x + NEIGHBOURS[:, :1]).ravel()
+        y = (y + NEIGHBOURS[:, 1:]).ravel()
+        origins = np.tile(origins, 4)
+
+        targets = self.occupancy.lookup(x, y)
+        found = (targets >= 0) & ((targets < start) | (targets >= stop)) & \
+            (types[targets] != 0) & (np.abs(targets - origins) > 1)
+        return int(ENERGY[types[origins[found]], types[targets[found]]].sum())
+
+    def __cross_energy_scalar(
+            self,
+            start: int,
+            stop: int,
+            dx: int = 0,
+            dy: int = 0) -> Optional[int]:
+        """Same as `Conformation.__cross_energy`, one amino at a time"""
+        types, at = self.types, self.occupancy.get
+        energy = 0
+        for i in range(start, stop):
+            x, y = self.x[i] + dx, self.y[i] + dy
+            if dx or dy:
+                j = at(x, y)
+                if j >= 0 and not start <= j < stop:
+                    return None
+
+            if not types[i]:
+                continue
+            for step_x, step_y in NEIGHBOUR_DELTAS:
+                j = at(x + step_x, y + step_y)
+                if j < 0 or start <= j < stop or abs(j - i) < 2:
+                    continue
+                energy += BOND_ENERGY[types[i]][types[j]]
+
+        return energy
+
+    def delta_score(self, index: int, direction: int) -> Optional[int]:
+        """Returns how much the score would change by folding at an amino,
+        without folding the conformation
+
+        Folding at an amino moves all aminos after it by the same step, so
+        only the bonds between the aminos before and after the fold change.
+        As the score does not change when all aminos move, it moves the
+        smallest of the two parts instead, and only checks the bonds of the
+        aminos in that part. Assumes no two aminos overlap.
+
+        Parameters
+        ----------
+        index : int
+            the index of the amino to fold
+        direction : int
+            the direction to fold the amino in
+
+        Returns
+        -------
+        Optional[int]
+            the difference between the new and the current score,
+            or None when the fold would make aminos overlap
+
+        Raises
+        ------
+        IndexError
+            raises an IndexError when the index is not a valid amino index
+        ValueError
+            raises a ValueError when the direction is not valid
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"Given index '{index}' is invalid")
+
+        old_x, old_y = DELTAS[self.directions[index] + 2]
+        new_x, new_y = DELTAS[self.check_direction(direction) + 2]
+        dx, dy = new_x - old_x, new_y - old_y
+        if not dx and not dy:
+            return 0
+
+        # move the aminos after the fold, or the ones before it backwards
+        start, stop = index + 1, len(self)
+        if stop - start > start:
+            start, stop, dx, dy = 0, start, -dx, -dy
+
+        after = self.__cross_energy(start, stop, dx, dy)
+        if after is None:
+            return None
+        return after - self.__cross_energy(start, stop)
+
+    def energy_before(
+            self,
+            index: int,
+            x: Optional[int] = None,
+            y: Optional[int] = None) -> int:
+        """Returns the energy of the bonds of an amino with the aminos before
+        it in the chain
+
+        Summing this over a chain that is being placed one amino at a time
+        gives the score of the part that has been placed so far.
+
+        Parameters
+        ----------
+        index : int
+            the index of the amino
+        x : int, optional
+            the x coordinate to look from, by default that of the amino
+        y : int, optional
+            the y coordinate to look from, by default that of the amino
+
+        Returns
+        -------
+        int
+            the energy of the bonds with any of the aminos before index - 1
+        """
+        types, at = self.types, self.occupancy.get
+        if not types[index]:
+            return 0
+
+        if x is None or y is None:
+            x, y = self.x[index], self.y[index]
+        energy = 0
+        for step_x, step_y in NEIGHBOUR_DELTAS:
+            j = at(x + step_x, y + step_y)
+            if 0 <= j < index - 1:
+                energy += BOND_ENERGY[types[index]][types[j]]
+
+        return energy
+
+    def __local_energy(self, start: int, stop: int) -> int:
+        """Returns the energy of all bonds a stretch of aminos takes part in,
+        including the bonds within the stretch"""
+        types, at = self.types, self.occupancy.get
+        energy = 0
+        for i in range(start, stop):
+            if not types[i]:
+                continue
+            x, y = self.x[i], self.y[i]
+            for step_x, step_y in NEIGHBOUR_DELTAS:
+                j = at(x + step_x, y + step_y)
+                # bonds within the stretch are found from both ends
+                if j < 0 or abs(j - i) < 2 or start <= j < i:
+                    continue
+                energy += BOND_ENERGY[types[i]][types[j]]
+
+        return energy
+
+    def apply_move(self, changes: Changes) -> Move:
+        """Folds the conformation at one or more aminos at once, in place
+
+        Only the aminos that end up somewhere else are moved: when the folds
+        do not move the end of the folded stretch, as in a corner flip, the
+        rest of the chain stays where it is. Otherwise, the smallest of the
+        start and the rest of the chain is moved, so the first amino does
+        not necessarily stay at (0, 0). The cached score is updated from
+        the bonds of the moved aminos, as long as no aminos overlap.
+
+        Parameters
+        ----------
+        changes : Changes
+            the new direction of each amino to fold, by index
+
+        Returns
+        -------
+        Move
+            the token to pass to `Conformation.undo` to revert this move;
+            moves must be undone in the reverse order they were applied
+
+        Raises
+        ------
+        IndexError
+            raises an IndexError when an index is not a valid amino index
+        ValueError
+            raises a ValueError when a direction is not valid
+        """
+        length = len(self)
+        changes = {
+            index: self.check_direction(direction)
+            for index, direction in dict(changes).items()
+        }
+        for index in changes:
+            if not 0 <= index < length:
+                raise IndexError(f"Given index '{index}' is invalid")
+        if not changes:
+            return Move((), length, array("i"), array("i"), self._score)
+
+        first, last = min(changes), max(changes)
+        directions = self.directions
+        shift_x = shift_y = 0
+        for index, direction in changes.items():
+            new_x, new_y = DELTAS[direction + 2]
+            old_x, old_y = DELTAS[directions[index] + 2]
+            shift_x, shift_y = shift_x + new_x - old_x, shift_y + new_y - old_y
+
+        # when the end of the stretch stays put so does the rest of the chain,
+        # otherwise either the start or the rest of the chain has to move;
+        # both only if no other amino shares a point with the moved aminos
+        unique = len(self.occupancy) == length
+        if unique and not shift_x and not shift_y:
+            start, stop = first + 1, last + 1
+        elif unique and last + 1 < length - first - 1:
+            start, stop = 0, last + 1
+        else:
+            start, stop = first + 1, length
+        stop = max(start, min(stop, length))
+
+        score, local = self._score, None
+        if score is not None and unique:
+            if len(changes) == 1:
+                delta = self.delta_score(first, changes[first])
+                score = None if delta is None else score + delta
+            elif stop - start <= SCALAR_LIMIT:
+                local = self.__local_energy(start, stop)
+            else:
+                score = None
+        else:
+            score = None
+
+        move = Move(
+            tuple((index, directions[index]) for index in changes),
+            start,
+            self.x[start:stop],
+            self.y[start:stop],
+            self._score
+        )
+        for index, direction in changes.items():
+            directions[index] = direction
+
+        indices = range(start, stop)
+        self.occupancy.release(move.x, move.y, indices)
+        if start and stop - start <= SCALAR_LIMIT:
+            x, y = self.x[first], self.y[first]
+            for i in indices:
+                step_x, step_y = DELTAS[directions[i - 1] + 2]
+                x, y = x + step_x, y + step_y
+                self.x[i], self.y[i] = x, y
+        elif stop - start <= SCALAR_LIMIT:
+            # the start of the chain moved, walk back from where it's fixed
+            x, y = self.x[stop], self.y[stop]
+            for i in reversed(indices):
+                step_x, step_y = DELTAS[directions[i] + 2]
+                x, y = x - step_x, y - step_y
+                self.x[i], self.y[i] = x, y
+        elif start:
+            _, folds, xs, ys = self.views()
+            steps = np.cumsum(STEPS[folds[first:stop - 1] + 2], axis=0)
+            xs[start:stop] = xs[first] + steps[:, 0]
+            ys[start:stop] = ys[first] + steps[:, 1]
+            del folds, xs, ys
+        else:
+            _, folds, xs, ys = self.views()
+            steps = np.cumsum(STEPS[folds[stop - 1::-1] + 2], axis=0)
+            xs[:stop] = (xs[stop] - steps[:, 0])[::-1]
+            ys[:stop] = (ys[stop] - steps[:, 1])[::-1]
+            del folds, xs, ys
+        self.occupancy.claim(self.x[start:stop], self.y[start:stop], indices)
+
+        # aminos after the stretch may hold points the stretch moved onto
+        if stop < length and len(self.occupancy) != length:
+            self.__reindex()
+
+        if local is not None:
+            unique = len(self.occupancy) == length
+            score = score - local + self.__local_energy(start, stop) \
+                if unique else None
+        self._score = score
+        return move
+
+    def undo(self, move: Move) -> None:
+        """Reverts a move made by `Conformation.apply_move`
+
+        Moves must be undone in the reverse order they were applied, as the
+        move only remembers the part of the conformation it changed.
+
+        Parameters
+        ----------
+        move : Move
+            the token returned by `Conformation.apply_move`
+        """
+        start, stop = move.start, move.start + len(move.x)
+        indices = range(start, stop)
+        length = len(self)
+        reindex = stop < length and len(self.occupancy) != length
+        self.occupancy.release(self.x[start:stop], self.y[start:stop], indices)
+
+        for index, direction in reversed(move.directions):
+            self.directions[index] = direction
+        self.x[start:stop] = move.x
+        self.y[start:stop] = move.y
+
+        if reindex:
+            self.__reindex()
+        else:
+            self.occupancy.claim(move.x, move.y, indices)
+        self._score = move.score
+
+    def __reindex(self) -> None:
+        """Rebuilds the occupancy index from the coordinates of every amino
+
+        Moving a stretch that is not the tail of the chain can leave a point
+        held by an amino other than the first on it, or not held at all,
+        once aminos overlap; every amino is claimed again in order instead.
+        """
+        length = len(self)
+        self.occupancy = self.occupancy.__class__(length)
+        self.occupancy.claim(self.x, self.y, range(length))
+
+    def is_valid(self) -> bool:
+        """Returns whether every amino is folded and no two aminos overlap"""
+        _, directions, xs, ys = self.views()
+        if not np.all(directions[:-1] != 0):
+            return False
+
+        # only when no two aminos overlap, every amino holds its own point
+        return len(self.occupancy) == len(self)
+
+    def key(self) -> bytes:
+        """Returns a key that is the same for every rotation and mirror image
+        of this conformation
+
+        Instead of the directions themselves, the key holds the turns between
+        them, which do not change when the conformation rotates. Mirroring
+        swaps left and right turns, so the turns are mirrored to make the
+        first turn to either side a left turn. The turns are packed four to
+        a byte, after the sequence and the amount of folded aminos; only the
+        aminos up to the first one without a direction are part of the key.
+
+        Returns
+        -------
+        bytes
+            the canonical key of this conformation, the same in every process
+        """
+        _, directions, _, _ = self.views()
+        folded = directions[:-1]
+        missing = np.flatnonzero(folded == 0)
+        if missing.size:
+            folded = folded[:missing[0]]
+
+        angles = ANGLES[folded + 2]
+        turns = (angles[1:] - angles[:-1]) % 4
+        sides = np.flatnonzero(turns % 2)
+        if sides.size and turns[sides[0]] == 3:
+            turns = -turns % 4
+
+        packed = np.zeros(-(-len(turns) // 4) * 4, dtype=np.uint8)
+        packed[:len(turns)] = turns
+        packed = packed.reshape(-1, 4) @ np.array([64, 16, 4, 1], dtype=np.uint8)
+        return f"{self.sequence}:{len(folded)}:".encode() + packed.tobytes()
+
+    def next_uninitialized(self) -> Optional[int]:
+        """Returns the index of the first amino (except the last) without
+        a direction, or None if all of them have one"""
+        try:
+            index = self.directions.index(0)
+        except ValueError:
+            return None
+        return index if index < len(self) - 1 else None
+
+    def set_direction(self, index: int, direction: int) -> None:
+        """Folds the conformation in a given direction at a given amino
+
+        Raises
+        ------
+        IndexError
+            raises an IndexError when the index is not a valid amino index
+        ValueError
+            raises a ValueError when the direction is not valid
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"Given index '{index}' is invalid")
+
+        self.directions[index] = self.check_direction(direction)
+        self.place(index)
+
+    def append(self, type: str, direction: int = 0) -> int:
+        """Adds an amino to the end of the chain
+
+        Parameters
+        ----------
+        type : str
+            the type of the new amino
+        direction : int, optional
+            the direction of the new amino, by default 0
+
+        Returns
+        -------
+        int
+            the index of the new amino
+        """
+        type = type.upper()
+        self.sequence += type
+        self.types.append(TYPE_CODES.get(type, 0))
+        self.directions.append(self.check_direction(direction))
+        self.x.append(0)
+        self.y.append(0)
+
+        # give the index the chance to grow along with the chain
+        length = len(self)
+        self.occupancy = self.occupancy.__class__(length)
+        self.occupancy.claim(self.x[:1], self.y[:1], [0])
+        self.place()
+        return length - 1
+
+    def copy(self) -> 'Conformation':
+        """Returns a new conformation with a copy of the same buffers"""
+        new = Conformation.__new__(Conformation)
+        new.sequence = self.sequence
+        new.types = self.types[:]
+        new.directions = self.directions[:]
+        new.x = self.x[:]
+        new.y = self.y[:]
+        new.occupancy = self.occupancy.copy()
+        new._score = self._score
+        return new
+
+    def __len__(self) -> int:
+        """Returns the amount of aminos in this conformation"""
+        return len(self.types)
@@ -0,0 +1,277 @@
+from itertools import repeat
+import numpy as np
+from typing import Sequence
+
+# coordinates are packed into a single integer as x * STRIDE + y,
+# which is unique for as long as |y| < STRIDE / 2
+STRIDE = 1 << 32
+
+
+def pack(x: int, y: int) -> int:
+    """Packs a pair of coordinates into a single integer
+
+    Parameters
+    ----------
+    x : int
+        the x coordinate
+    y : int
+        the y coordinate
+
+    Returns
+    -------
+    int
+        an integer that is unique for this pair of coordinates
+    """
+    return x * STRIDE + y
+
+
+def pack_all(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Packs arrays of coordinates, see `pack`"""
+    return np.asarray(xs, dtype=np.int64) * STRIDE + ys
+
+
+class Occupancy:
+    """Index of which amino occupies which point of the lattice
+
+    When several aminos occupy the same point, the one that claimed it first
+    holds it; as aminos are placed in order that is the lowest index.
+    Subclasses decide how the points are stored.
+
+    Methods
+    -------
+    get(x, y):
+        returns the index of the amino at a point, or -1
+    lookup(xs, ys):
+        returns the indices of the aminos at many points at once
+    claim(xs, ys, indices):
+        lets aminos hold the points that are still empty
+    release(xs, ys, indices):
+        empties the points that are held by the given aminos
+    """
+    __slots__ = ()
+
+    def __init__(self, length: int = 0) -> None:
+        """Constructor method
+
+        Parameters
+        ----------
+        length : int, optional
+            the amount of aminos that will be placed, by default 0
+        """
+        raise NotImplementedError
+
+    def get(self, x: int, y: int) -> int:
+        """Returns the index of the amino at a point, or -1 if it's empty"""
+        raise NotImplementedError
+
+    def lookup(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Returns the index of the amino at every point, -1 where it's empty
+        """
+        raise NotImplementedError
+
+    def claim(
+            self,
+            xs: Sequence[int],
+            ys: Sequence[int],
+            indices: Sequence[int]) -> None:
+        """Lets every amino hold its point, unless the point is already held
+
+        Parameters
+        ----------
+        xs : Sequence[int]
+            the x coordinate of each amino
+        ys : Sequence[int]
+            the y coordinate of each amino
+        indices : Sequence[int]
+            the index of each amino, in ascending order
+        """
+        raise NotImplementedError
+
+    def release(
+            self,
+            xs: Sequence[int],
+            ys: Sequence[int],
+            indices: Sequence[int]) -> None:
+        """Empties the points that are held by the given aminos
+
+        Parameters
+        ----------
+        xs : Sequence[int]
+            the x coordinate of each amino
+        ys : Sequence[int]
+            the y coordinate of each amino
+        indices : Sequence[int]
+            the index of each amino
+        """
+        raise NotImplementedError
+
+    def copy(self) -> 'Occupancy':
+        """Returns an independent copy of this index"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        """Returns the amount of points that are held"""
+        raise NotImplementedError
+
+
+class HashOccupancy(Occupancy):
+    """Occupancy stored in a dict, keyed by packed coordinates
+
+    Memory grows linearly with the amount of aminos, wherever they are.
+    """
+    __slots__ = ("points",)
+
+    def __init__(self, length: int = 0) -> None:
+        """Constructor method, see `Occupancy`"""
+        self.points = {}
+
+    def get(self, x: int, y: int) -> int:
+        """Returns the index of the amino at a point, or -1 if it's empty"""
+        return self.points.get(x * STRIDE + y, -1)
+
+    def lookup(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Returns the index of the amino at every point, -1 where it's empty
+        """
+        keys = pack_all(xs, ys).tolist()
+        return np.fromiter(
+            map(self.points.get, keys, repeat(-1)),
+            dtype=np.intp,
+            count=len(keys)
+        )
+
+    def claim(
+            self,
+            xs: Sequence[int],
+            ys: Sequence[int],
+            indices: Sequence[int]) -> None:
+        """Lets every amino hold its point, see `Occupancy.claim`"""
+        setdefault = self.points.setdefault
+        for key, index in zip(pack_all(xs, ys).tolist(), list(indices)):
+            setdefault(key, index)
+
+    def release(
+            self,
+            xs: Sequence[int],
+            ys: Sequence[int],
+            indices: Sequence[int]) -> None:
+        """Empties the given aminos' points, see `Occupancy.release`"""
+        points = self.points
+        for key, index in zip(pack_all(xs, ys).tolist(), list(indices)):
+            if points.get(key) == index:
+                del points[key]
+
+    def copy(self) -> 'HashOccupancy':
+        """Returns an independent copy of this index"""
+        new = HashOccupancy.__new__(HashOccupancy)
+        new.points = self.points.copy()
+        return new
+
+    def __len__(self) -> int:
+        """Returns the amount of points that are held"""
+        return len(self.points)
+
+
+class DenseOccupancy(Occupancy):
+    """Occupancy stored in a square int array around the first amino
+
+    The array is just big enough for a chain of the given length to reach any
+    point, plus a margin; lookups are a single array index, but memory grows
+    quadratically with the length, so it's meant for short chains. When the
+    chain drifts out of bounds the array is moved to be centered again.
+    """
+    __slots__ = ("cells", "offset_x", "offset_y")
+
+    def __init__(self, length: int = 0) -> None:
+        """Constructor method, see `Occupancy`"""
+        size = 2 * length + 5
+        self.cells = np.full((size, size), -1, dtype=np.intp)
+        self.offset_x = self.offset_y = length + 2
+
+    def get(self, x: int, y: int) -> int:
+        """Returns the index of the amino at a point, or -1 if it's empty"""
+        row, col = y + self.offset_y, x + self.offset_x
+        size = len(self.cells)
+        if 0 <= row < size and 0 <= col < size:
+            return self.cells.item(row, col)
+        return -1
+
+    def lookup(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Returns the index of the amino at every point, -1 where it's empty
+        """
+        rows = np.asarray(ys, dtype=np.intp) + self.offset_y
+        cols = np.asarray(xs, dtype=np.intp) + self.offset_x
+        size = len(self.cells)
+        inside = (rows >= 0) & (rows < size) & (cols >= 0) & (cols < size)
+        if inside.all():
+            return self.cells[rows, cols]
+
+        found = np.full(len(rows), -1, dtype=np.intp)
+        found[inside] = self.cells[rows[inside], cols[inside]]
+        return found
+
+    def __recenter(self, xs: np.ndarray, ys: np.ndarray) -> None:
+        """Moves the array so that all held points and the given points fit
+        """
+        rows, cols = np.nonzero(self.cells >= 0)
+        held = self.cells[rows, cols]
+        rows, cols = rows - self.offset_y, cols - self.offset_x
+
+        all_x, all_y = np.concatenate((cols, xs)), np.concatenate((rows, ys))
+        span = int(max(np.ptp(all_x), np.ptp(all_y)))
+        size = max(len(self.cells), span + 5)
+
+        self.cells = np.full((size, size), -1, dtype=np.intp)
+        self.offset_x = size // 2 - (int(all_x.min()) + int(all_x.max())) // 2
+        self.offset_y = size // 2 - (int(all_y.min()) + int(all_y.max())) // 2
+        self.cells[rows + self.offset_y, cols + self.offset_x] = held
+
+    def claim(
+            self,
+            xs: Sequence[int],
+            ys: Sequence[int],
+            indices: Sequence[int]) -> None:
+        """Lets every amino hold its point, see `Occupancy.claim`"""
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        indices = np.asarray(indices, dtype=np.intp)
+        if not len(indices):
+            return
+
+        size = len(self.cells)
+        rows, cols = ys + self.offset_y, xs + self.offset_x
+        if rows.min() < 0 or cols.min() < 0 or \
+                rows.max() >= size or cols.max() >= size:
+            self.__recenter(xs, ys)
+            size = len(self.cells)
+            rows, cols = ys + self.offset_y, xs + self.offset_x
+
+        # the first amino on a point wins, and so do the current holders
+        points, first = np.unique(rows * size + cols, return_index=True)
+        empty = self.cells.flat[points] < 0
+        self.cells.flat[points[empty]] = indices[first[empty]]
+
+    def release(
+            self,
+            xs: Sequence[int],
+            ys: Sequence[int],
+            indices: Sequence[int]) -> None:
+        """Empties the given aminos' points, see `Occupancy.release`"""
+        rows = np.asarray(ys, dtype=np.intp) + self.offset_y
+        cols = np.asarray(xs, dtype=np.intp) + self.offset_x
+        size = len(self.cells)
+        inside = (rows >= 0) & (rows < size) & (cols >= 0) & (cols < size)
+        rows, cols = rows[inside], cols[inside]
+
+        held = self.cells[rows, cols] == np.asarray(indices)[inside]
+        self.cells[rows[held], cols[held]] = -1
+
+    def copy(self) -> 'DenseOccupancy':
+        """Returns an independent copy of this index"""
+        new = DenseOccupancy.__new__(DenseOccupancy)
+        new.cells = self.cells.copy()
+        new.offset_x, new.offset_y = self.offset_x, self.offset_y
+        return new
+
+    def __len__(self) -> int:
+        """Returns the amount of points that are held"""
+        return int(np.count_nonzero(self.cells >= 0))
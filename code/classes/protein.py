@@ -1,19 +1,23 @@
-from collections.abc import Sequence
-from functools import reduce
 from hashlib import sha1
 import numpy as np
 from typing import List, Optional, Sequence, Set, Tuple, Union
 
 from classes.amino import Amino, AminoBond
+from classes.conformation import Changes, Conformation, Move
 
 
 class Protein:
     """Represents a protein existing of a sequence of Amino acids.
 
+    The aminos are not stored as Amino objects, but in a compact
+    `Conformation`; Amino objects are only created when they are requested.
+
     Attributes:
     -----------
-    aminos: list[Amino]
-        the list of amino acids that make up this protein
+    aminos: tuple[Amino]
+        copies of the amino acids that make up this protein
+    conformation: Conformation
+        the array-backed state of this protein
     """
     def __init__(self, string: str, directions: Sequence[int] = []):
         """Constructor method
@@ -26,24 +30,46 @@ class Protein:
             representation of the directions this protein is folded,
             by default None
         """
-        self.__aminos = []
-        self.__grid = np.empty((len(string), len(string)), dtype=np.object_)
-
-        # create amino instances for each char in string
-        for i, char in enumerate(string):
-
-            # create amino
-            amino = Amino(
-                type=char,
-                direction=directions[i]
-                if isinstance(directions, Sequence) and
-                i < len(directions) else 0,
-                index=len(self.__aminos),
-                x=len(self.__aminos)
-            )
-            self.__aminos.append(amino)
+        self.__conformation = Conformation(
+            string,
+            directions if directions is not None else ()
+        )
+
+    @property
+    def conformation(self) -> Conformation:
+        """The array-backed state of this protein
+
+        Unlike `Protein.aminos` this is not a copy; algorithms may read it
+        directly, but should only change it through the methods of Protein
+
+        Returns
+        -------
+        Conformation
+            the types, directions and coordinates of the aminos
+        """
+        return self.__conformation
+
+    def __amino(self, index: int) -> Amino:
+        """Creates an Amino instance holding the data of an amino
 
-        self.__populate_grid()
+        Parameters
+        ----------
+        index : int
+            the index of the amino
+
+        Returns
+        -------
+        Amino
+            a new Amino instance, changing it does not change this protein
+        """
+        conf = self.__conformation
+        return Amino(
+            conf.sequence[index],
+            direction=conf.directions[index],
+            index=index,
+            x=conf.x[index],
+            y=conf.y[index]
+        )
 
     @property
     def aminos(self) -> Tuple[Amino]:
@@ -54,66 +80,24 @@ class Protein:
         Tuple[Amino]
             A tuple containing copies of the current Amino acids of this instance
         """
-        return tuple(map(lambda a: Amino.copy(a), self.__aminos))
-
-    def __populate_grid(self, index=0, in_place=False):
-        """Populates a 2d grid representation of the protein
+        return tuple(map(self.__amino, range(len(self))))
 
-        The representation assumes the first amino is at [0, 0] and
-        follows each aminos direction to place each item relative to the
-        previous amino
+    def __getitem__(self, index: int) -> Amino:
+        """Returns a copy of a single amino, without copying all the others
 
         Parameters
         ----------
-        index : int, optional
-            the index of the point in a 1-dimensional array at which to start
-            traversing directions, only makes sense to use when editing the
-            grid in place. 0 by default.
-
-        in_place : bool, optional
-            whether to edit the current grid in-place,
-            or whether to replace the grid with a new one.
-            Default is False
+        index : int
+            the index of the amino
 
-        Raises
-        ------
-        IndexError
-            Raises an IndexError when the given index is an invalid point in
-            the 1 dimensional array
+        Returns
+        -------
+        Amino
+            a copy of the amino at the given index
         """
-        # safeguard index overflow
-        if index > len(self.__aminos):
-            raise IndexError(
-                "Given index '{}' is invalid; \
-                must be a number between 0 and {}"
-                .format(index, len(self.__aminos))
-            )
-
-        # use current array if in_place is set to true
-        # otherwise create an empty 2d array
-        grid = self.__grid if in_place and self.__grid is not None else \
-            np.empty((self.__len__(), self.__len__()), dtype=np.object_)
-
-        # if we're populating a completely empty array
-        # then we're adding the aminos up to index at their given position,
-        # otherwise, we leave any items BEFORE the index untouched
-        if not in_place:
-            for amino in self.__aminos[:index+1]:
-                if grid[amino.y, amino.x] is None:
-                    grid[amino.y, amino.x] = amino
-
-        prev = self.__aminos[index]
-        for amino in self.__aminos[index+1:]:
-            # retrieve previous move_dir and coordinates
-            # clear current position in grid
-            if in_place:
-                grid[amino.y, amino.x] = None
-
-            amino.x, amino.y = Amino.get_coordinates_at(prev, prev.direction)
-            if grid[amino.y, amino.x] is None:
-                grid[amino.y, amino.x] = amino
-            prev = amino
-        self.__grid = grid
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"Given index '{index}' is invalid")
+        return self.__amino(index % len(self))
 
     @property
     def grid(self) -> np.ndarray:
@@ -127,18 +111,18 @@ class Protein:
             protein within bounds
 
         """
-        # retrieve smallest x and y coords
-        min_x, min_y = reduce(
-            lambda a, b: (min(a[0], b[0]), min(a[1], b[1])),
-            list(map(lambda a: (a.x, a.y), self.__aminos))
-        )
+        grid = np.empty((len(self), len(self)), dtype=np.object_)
+        if not len(self):
+            return grid
 
-        # correct grid representation
-        return np.roll(
-            self.__grid,
-            (min(min_y, 0) * -1, min(min_x, 0) * -1),
-            (0, 1)
-        )
+        # correct grid representation by the smallest x and y coords
+        conf = self.__conformation
+        min_x, min_y = min(conf.x), min(conf.y)
+        for amino in self.aminos:
+            if grid[amino.y - min_y, amino.x - min_x] is None:
+                grid[amino.y - min_y, amino.x - min_x] = amino
+
+        return grid
 
     @property
     def types(self) -> str:
@@ -152,7 +136,7 @@ class Protein:
             A string where each character represents the type of an amino;
             should be the same as the string this Protein was initialized with
         """
-        return "".join(map(lambda a: a.type, self.__aminos))
+        return self.__conformation.sequence
 
     @property
     def directions(self) -> Tuple[int, ...]:
@@ -165,7 +149,7 @@ class Protein:
         Tuple[int, ...]
             a tuple containing the directions of each amino.
         """
-        return tuple(map(lambda a: a.direction, self.__aminos))
+        return tuple(self.__conformation.directions)
 
     def append(self, amino: Amino) -> List[Amino]:
         """Adds a new Amino Acid to this Protein instance
@@ -184,15 +168,12 @@ class Protein:
         if not isinstance(amino, Amino):
             raise TypeError("amino parameter must be an Amino.")
 
-        amino.index = len(self.__aminos)
-        self.__aminos.append(amino)
-        self.calculate_bonds(self.__aminos[amino.index:])
-        self.__populate_grid(amino.index)
+        amino.index = self.__conformation.append(amino.type, amino.direction)
         return self.aminos
 
     def foldoptions(
             self,
-            amino: Amino,
+            amino: Union[Amino, int],
             completely_random: bool = False) -> List[int]:
         """Returns the valid fold directions for an amino
 
@@ -201,8 +182,9 @@ class Protein:
 
         Parameters
         ----------
-        amino : Amino
-            the amino to retrieve fold possibilities from
+        amino : Union[Amino, int]
+            the amino to retrieve fold possibilities from;
+            can be either an amino object or the index of an amino
         completely_random: bool, optional
             whether to return a completely random choice
             if this is set to True it does not optimize the choices for
@@ -214,21 +196,12 @@ class Protein:
             a list containing the possible fold directions
 
         """
-        if not isinstance(amino, Amino):
+        if isinstance(amino, Amino):
+            amino = amino.index
+        elif not isinstance(amino, (int, np.integer)):
             raise TypeError("amino parameter must be an Amino.")
 
-        if not completely_random and amino.index == 0:
-            return [1]
-        elif not completely_random and amino.index == 1:
-            return [1, 2]
-
-        prev = self.__aminos[amino.index-1] if amino.index > 0 else None
-        folds = [1, 2, -2, -1]
-
-        if prev:
-            folds.remove(prev.direction * -1)
-
-        return folds
+        return self.__conformation.foldoptions(amino, completely_random)
 
     def fold(self, index: int, direction: int) -> Optional[List[Amino]]:
         """Folds this protein in a given direction at a given point
@@ -247,15 +220,12 @@ class Protein:
             or None if the given point was invalid
         """
         if isinstance(index, Amino):
-            index = Amino.index
-        elif not isinstance(index, int):
-            return TypeError(f"index parameter must be an int; was {index}")
+            index = index.index
+        elif not isinstance(index, (int, np.integer)):
+            raise TypeError(f"index parameter must be an int; was {index}")
 
         try:
-            self.__aminos[index].direction = direction
-            self.__populate_grid(index)
-            aminos = self.__aminos[index:]
-
+            self.__conformation.set_direction(index, direction)
             return self.aminos
         except IndexError:
             # we don't catch the Value error as that's valuable info
@@ -284,11 +254,9 @@ class Protein:
         if direction not in range(-2, 3):
             raise ValueError("Invalid direction")
 
-        if type(amino) is int:
-            amino = self.__aminos[amino]
-        x, y = amino.get_coordinates_at(amino, direction)
-        return self.__grid[y, x] is None
-
+        if isinstance(amino, Amino):
+            amino = amino.index
+        return self.__conformation.is_empty(amino, direction)
 
     def calculate_bonds(self, aminos: Sequence[Amino] = None) -> Set[AminoBond]:
         """
@@ -298,86 +266,114 @@ class Protein:
         Parameters
         ----------
         aminos : Sequence
-            the aminos to check
+            the aminos to check, by default all aminos
 
         Returns
         -------
         Set[AminoBonds]
-            A set of amino bonds representing the bonds between aminos
+            A set of amino bonds representing the bonds between aminos,
+            holding each bond once
         """
-
-        if aminos is None:
-            aminos = self.aminos
-
         # CC-By-SA 4: (C) Gareth Latty, https://stackoverflow.com/a/10666320
         if aminos and not all(map(lambda a: isinstance(a, Amino), aminos)):
-            ValueError(
+            raise ValueError(
                 "aminos parameter must be a sequence of Amino items; " +
                 f"was {aminos}"
             )
 
+        pairs = self.__conformation.contacts(
+            None if aminos is None else [amino.index for amino in aminos]
+        )
+
+        # only create amino objects for the aminos that take part in a bond
+        bonded = {}
         bonds = set()
+        for i, j in pairs.tolist():
+            origin = bonded.setdefault(i, self.__amino(i))
+            target = bonded.setdefault(j, self.__amino(j))
+            origin.bonded.add(target)
+            target.bonded.add(origin)
+            bonds.add(AminoBond(origin, target))
 
-        # loop through given list of aminos
-        for amino in aminos:
-            # don't process P aminos, aminos that already have a bond
-            # or the last amino
-            # (if it has a bond, that will have already been processed)
-            # and the 0 direction messes things up
-            if (amino.type != "H" and amino.type != "C") \
-                    or amino.direction == 0:
-                continue
-
-            # get the directions to check
-            # and remove directions of the neighbours
-            directions = self.foldoptions(amino)
-            if amino.direction in directions:
-                directions.remove(amino.direction)
-            prev = self.__aminos[amino.index-1] if amino.index > 0 else None
-            if prev and (prev.direction * -1) in directions:
-                directions.remove(prev.direction * -1)
-
-            # loop through the remaining valid directions
-            for direction in directions:
-                # retrieve absolute coordinates at directions
-                x, y = Amino.get_coordinates_at(amino, direction)
-                # then, if the there's an amino at the coordinates
-                # that isn't a P amino...
-                if not self.empty_coordinate(amino, direction):
-                    # set the bonded property of each respective
-                    # amino to their opposite, and add it the the set
-                    target = self.__grid[y, x]
-                    if target.type == "H" or target.type == "C":
-                        amino.bonded.add(target)
-                        self.__grid[y, x].bonded.add(amino)
-                        bond = AminoBond(amino, target)
-                        if bond not in bonds:
-                            bonds.add(AminoBond(amino, target))
         return bonds
 
     @property
     def score(self) -> int:
         """Returns the score of this protein
 
+        Every H-H and H-C bond adds -1 to the score, every C-C bond adds -5;
+        the score is cached until the protein is folded again
+
         Returns
         -------
         int
             the score of this protein, the smaller the better
         """
-        score = 0
+        return self.__conformation.score()
+
+    def delta_score(self, index: int, direction: int) -> Optional[int]:
+        """Returns how much the score would change when folding this protein
+        in a given direction at a given point, without folding it
+
+        Only the bonds of the aminos that would move are checked, so this is
+        much cheaper than folding a copy and comparing scores. This protein
+        should be valid, see `Protein.is_valid`.
+
+        Parameters
+        ----------
+        index : int
+            the point at which to fold this protein
+        direction : int
+            the direction to fold the protein in
+
+        Returns
+        -------
+        Optional[int]
+            the new score minus the current score, or None if the fold
+            would make aminos overlap
+        """
+        if isinstance(index, Amino):
+            index = index.index
+        return self.__conformation.delta_score(index, direction)
+
+    def apply_move(self, changes: Changes) -> Move:
+        """Folds this protein at one or more points at once, in place
+
+        Unlike `Protein.fold` this only moves the aminos that end up
+        somewhere else and updates the score from their bonds, so trying a
+        move and undoing it is much cheaper than folding a copy.
+
+        Parameters
+        ----------
+        changes : Changes
+            the new direction of each amino to fold, either as a mapping or
+            as a sequence of (index, direction) pairs
+
+        Returns
+        -------
+        Move
+            a token that reverts the move when passed to `Protein.undo`
+
+        Raises
+        ------
+        IndexError
+            raises an IndexError when an index is not a valid amino index
+        ValueError
+            raises a ValueError when a direction is not valid
+        """
+        return self.__conformation.apply_move(changes)
 
-        # retrieve and loop through bonds
-        for bond in self.calculate_bonds(self.__aminos):
-            if bond.origin.type == bond.target.type and \
-                    bond.origin.type == "H":
-                score -= 1
-            elif bond.origin.type == bond.target.type and \
-                    bond.origin.type == "C":
-                score -= 5
-            elif bond.origin.type != "P" and bond.target.type != "P":
-                score -= 1
+    def undo(self, move: Move) -> None:
+        """Reverts a move made by `Protein.apply_move`
 
-        return score
+        Moves must be undone in the reverse order they were applied.
+
+        Parameters
+        ----------
+        move : Move
+            the token returned by `Protein.apply_move`
+        """
+        self.__conformation.undo(move)
 
     def next_uninitialized(self) -> Optional[Amino]:
         """Returns the next uninitialized amino in the protein
@@ -388,10 +384,8 @@ class Protein:
             returns the closest amino with a direction of 0,
             or None if none are left (except the last)
         """
-        return next(
-            (amino for amino in self.__aminos[:-1] if amino.direction == 0),
-            None
-        )
+        index = self.__conformation.next_uninitialized()
+        return None if index is None else self.__amino(index)
 
     @staticmethod
     def copy(prot: 'Protein') -> 'Protein':
@@ -408,7 +402,9 @@ class Protein:
             a new Protein instance, initialised with the same data as the
             given protein
         """
-        return Protein(prot.types, prot.directions)
+        new = Protein.__new__(Protein)
+        new.__conformation = prot.conformation.copy()
+        return new
 
     @staticmethod
     def validate(protein: 'Protein') -> bool:
@@ -428,16 +424,7 @@ class Protein:
         if protein is None:
             return False
 
-        aminos = protein.aminos
-        all_initialized = any(
-            amino.direction != 0 for amino in aminos[:-1]
-        )
-
-        coords = list(map(lambda a: (a.x, a.y, a.z), aminos))
-        # see https://stackoverflow.com/a/5278151/8571352
-        all_unique_coords = len(coords) == len(set(coords))
-
-        return all_initialized and all_unique_coords
+        return protein.conformation.is_valid()
 
     @property
     def is_valid(self) -> bool:
@@ -454,6 +441,9 @@ class Protein:
     def __eq__(self, obj: any) -> bool:
         """Returns a boolean representing whether two objects are the same
 
+        The coordinates of the aminos follow from their directions, so two
+        proteins with the same types and directions are the same.
+
         Returns
         -------
         bool
@@ -463,16 +453,18 @@ class Protein:
         if obj is None or not isinstance(obj, Protein):
             return False
 
-        # shallow amino checking
-        if obj.types and obj.types != self.types or \
-                obj.directions and obj.directions != self.directions:
-            return False
+        return obj.types == self.types and obj.directions == self.directions
 
-        # deep amino checking
-        if obj.aminos and obj.aminos != self.__aminos:
-            return False
+    @property
+    def key(self) -> bytes:
+        """The canonical key of this protein, the same for every rotation and
+        mirror image of the same fold, and in every process
 
-        return True
+        See Also
+        --------
+        `Conformation.key`: for how the key is made
+        """
+        return self.__conformation.key()
 
     def __hash__(self) -> int:
         """Returns the hash of a protein instance
@@ -481,9 +473,11 @@ class Protein:
         -------
         int
             the hash of the protein as an int, can be used to identify proteins
-            by the same value quickly for dictionary keys or sets
+            by the same value quickly for dictionary keys or sets;
+            hashes only ints, so it's the same across processes. Rotated and
+            mirrored copies of a fold have the same hash
         """
-        return hash(tuple(self.__aminos))
+        return hash(int.from_bytes(self.key, "little"))
 
     @classmethod
     def to_sha1(cls, protein: 'Protein') -> str:
@@ -499,18 +493,19 @@ class Protein:
         str
             Returns a sha1 hash of this protein, as a string,
             is the same for comparisson when a protein's amino types
-            and folding directions are the same
+            are the same and their folds are rotations or mirror images
+            of each other, see `Protein.key`
 
         Raises
         ------
         TypeError
-            _description_
+            raises a TypeError when the given argument is not a Protein
         """
         if not isinstance(protein, cls):
             raise TypeError("Given argument must be Protein instance")
 
-        # convert hash() value to bytes and turn it to a sha1 hash
-        return sha1(str(hash(protein)).encode()).hexdigest()
+        # turn the canonical key into a sha1 hash
+        return sha1(protein.key).hexdigest()
 
     def __len__(self) -> int:
         """Returns the length of this protein
@@ -520,7 +515,7 @@ class Protein:
         int
             the total amount of amino acids in this protein
         """
-        return len(self.__aminos)
+        return len(self.__conformation)
 
     def __repr__(self) -> str:
         """Represents this Protein instance as a string
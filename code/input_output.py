@@ -26,7 +26,8 @@ def input(file):
 def output(protein: Protein, subdir: str = "/", prefix: str = "output"):
     """
     Writes a protein to a comma-seperated values file at the filename of
-    the format `{prefix}_{sha1(protein)}.csv`
+    the format `{prefix}_{sha1(protein)}.csv`; rotations and mirror images of
+    the same fold are only written once
 
     Parameters
     ----------
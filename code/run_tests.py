@@ -2,8 +2,24 @@
 
 
 from test.test_amino import AminoTest  # noqa: F401,261
+from test.test_ant_colony import AntColonyTest  # noqa: F401,261
+from test.test_batch import BatchTest  # noqa: F401,261
+from test.test_beam import BeamTest  # noqa: F401,261
+from test.test_chain import ChainTest  # noqa: F401,261
+from test.test_conformation import ConformationTest  # noqa: F401,261
+from test.test_depth_first import DepthFirstTest  # noqa: F401,261
+from test.test_genetic import GeneticAlgorithmTest  # noqa: F401,261
+from test.test_greedy import GreedyTest  # noqa: F401,261
+from test.test_hillclimber import HillClimberTest  # noqa: F401,261
+from test.test_mcts import MonteCarloTreeSearchTest  # noqa: F401,261
+from test.test_moves import MovesTest  # noqa: F401,261
+from test.test_occupancy import OccupancyTest  # noqa: F401,261
+from test.test_perm import PERMTest  # noqa: F401,261
 from test.test_protein import ProteinTest  # noqa: F401,261
 from test.test_random import RandomTest  # noqa: F401,261
+from test.test_replica_exchange import ReplicaExchangeTest  # noqa: F401,261
+from test.test_simulated_annealing import SimulatedAnnealingTest  # noqa: F401,261
+from test.test_tabu import TabuTest  # noqa: F401,261
 import unittest
 
 if __name__ == "__main__":
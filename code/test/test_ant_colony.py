@@ -0,0 +1,99 @@
+import numpy as np
+import random
+import unittest
+
+from algorithms import BaseAlgorithm
+from algorithms.ant_colony import AntColony, build_ants, turn_columns
+from algorithms.depth_first import DepthFirstFold
+from classes import batch
+
+
+class AntColonyTest(unittest.TestCase):
+    """Unit tests for the AntColony class
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_turn_columns(self):
+        """Method that tests the columns of going straight, left and right"""
+        directions = np.array([
+            [1, 1, 2, -1, 2, 1, 0],
+            [2, 2, -1, -2, -1, 2, 0],
+        ])
+        self.assertEqual(turn_columns(directions).tolist(), [[0, 1, 1, 2, 2]] * 2)
+
+    def test_build_ants(self):
+        """Method that tests building conformations by the pheromone"""
+        types = "HPHPPHHPHPPHPHHPPHPH"
+        pheromone = np.full((len(types) - 2, 3), 0.01)
+        pheromone[:, 0] = 1
+        folds = build_ants(types, pheromone, 20, beta=0, rng=random.Random(0))
+        _, valid = batch.evaluate(types, folds)
+        self.assertTrue(valid.all())
+
+        # nearly every turn goes the way the pheromone leads
+        straight = np.count_nonzero(turn_columns(folds) == 0)
+        self.assertGreater(straight, 0.9 * folds[:, 1:-1].size)
+
+    def test_ant_colony(self):
+        """Method that tests laying pheromone over iterations"""
+        random.seed(0)
+        types = "HHPHHHPHPHHHPH"
+        algorithm = AntColony(types, ants=20)
+        best = algorithm.run(iterations=50)
+        self.assertTrue(best.is_valid)
+        self.assertEqual(best.score, DepthFirstFold(types).run().score)
+        self.assertEqual(algorithm.iterations, 50)
+        self.assertEqual(algorithm.evaluations, 50 * 20)
+        self.assertEqual(algorithm.stop_reason, BaseAlgorithm.COMPLETED)
+
+        # no turn is ruled out
+        strongest = algorithm.pheromone.max(axis=1, keepdims=True)
+        self.assertTrue((algorithm.pheromone > 0.049 * strongest).all())
+
+        algorithm.run(iterations=50, max_evaluations=30)
+        self.assertEqual(algorithm.stop_reason, BaseAlgorithm.MAX_EVALUATIONS)
+        self.assertEqual(algorithm.evaluations, 40)
+
+    def test_ant_colony_limits(self):
+        """Method that tests a colony is built before any limit is honoured"""
+        random.seed(0)
+        limits = (
+            {"time_budget": 0}, {"max_evaluations": 1}, {"target_score": 0}
+        )
+        for limit in limits:
+            for processes in (1, 2):
+                algorithm = AntColony("HHPHHPH", ants=5)
+                best = algorithm.run(iterations=50, processes=processes, **limit)
+                self.assertNotEqual(
+                    algorithm.stop_reason, BaseAlgorithm.COMPLETED
+                )
+                self.assertTrue(best.is_valid)
+                self.assertEqual(algorithm.iterations, 1)
+
+    def test_ant_colony_unbonded(self):
+        """Method that tests a valid fold is found when no fold scores below
+        0"""
+        random.seed(0)
+        best = AntColony("HPHPHPHPH").run(iterations=3)
+        self.assertTrue(best.is_valid)
+        self.assertEqual(best.score, 0)
+
+    def test_ant_colony_parallel(self):
+        """Method that tests building colonies in worker processes"""
+        random.seed(0)
+        algorithm = AntColony("HHPHHHPHPHHHPH", ants=5)
+        best = algorithm.run(iterations=3, processes=2)
+        self.assertTrue(best.is_valid)
+        self.assertEqual(algorithm.evaluations, 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
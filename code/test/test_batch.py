@@ -0,0 +1,104 @@
+import numpy as np
+import unittest
+
+from classes import batch
+from classes.protein import Protein
+
+TYPES = "HHPHPPPPH"
+DIRECTION = (1, 2, -1, -1, 2, 2, 1, -2, 0)
+X = (0, 1, 1, 0, -1, -1, -1, 0, 0)
+Y = (0, 0, 1, 1, 1, 2, 3, 3, 2)
+SCORE = -2
+
+
+class BatchTest(unittest.TestCase):
+    """Unit tests for scoring and validating conformations in batches
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def setUp(self):
+        """Sets up a batch of a valid, an overlapping and an unfolded
+        conformation"""
+        self.directions = np.array([
+            DIRECTION,
+            (1, 2, -1, -2, 1, 1, 1, 1, 0),
+            (1, 2, -1, 0, 0, 0, 0, 0, 0),
+        ])
+
+    def test_batch_coordinates(self):
+        """Method that tests the coordinates of every amino"""
+        xs, ys = batch.coordinates(self.directions)
+        self.assertEqual(xs.shape, self.directions.shape)
+        self.assertEqual(tuple(xs[0]), X)
+        self.assertEqual(tuple(ys[0]), Y)
+
+    def test_batch_evaluate(self):
+        """Method that tests scoring and validating against Protein"""
+        scores, valid = batch.evaluate(TYPES, self.directions)
+        self.assertEqual(valid.tolist(), [True, False, False])
+        self.assertEqual(scores[0], SCORE)
+        self.assertEqual(batch.validate(self.directions).tolist(), valid.tolist())
+
+        # random walks, a few of which are valid, score the same as proteins
+        rng = np.random.default_rng(0)
+        directions = rng.choice([-2, -1, 1, 2], size=(500, len(TYPES) + 1))
+        directions[:, -1] = 0
+        sequence = TYPES + "C"
+        scores, valid = batch.evaluate(sequence, directions)
+        for row, score, is_valid in zip(directions.tolist(), scores, valid):
+            protein = Protein(sequence, row)
+            self.assertEqual(protein.is_valid, is_valid)
+            if is_valid:
+                self.assertEqual(protein.score, score)
+
+    def test_batch_turns(self):
+        """Method that tests the turns, the same for rotations and mirror
+        images"""
+        directions = np.array([
+            [1, 2, -1, 2, 0],
+            [2, -1, -2, -1, 0],
+            [1, -2, -1, -2, 0],
+            [1, 2, 2, 1, 0],
+        ])
+        turns = batch.turns(directions)
+        self.assertEqual(turns.shape, (4, 3))
+        self.assertEqual(turns[0].tolist(), [1, 1, 3])
+        self.assertEqual(turns[1].tobytes(), turns[0].tobytes())
+        self.assertEqual(turns[2].tobytes(), turns[0].tobytes())
+        self.assertEqual(turns[3].tolist(), [1, 0, 3])
+
+        # the shortest proteins have no turns
+        self.assertEqual(batch.turns([[0]]).shape, (1, 0))
+        self.assertEqual(batch.turns([[1, 0], [2, 0]]).shape, (2, 0))
+
+    def test_batch_overlaps(self):
+        """Method that tests finding the first amino that overlaps"""
+        directions = np.array([
+            [1, 2, -1, -2, 0],
+            [1, 2, -1, 2, 0],
+            [1, -1, 1, 2, 0],
+            [0, 0, 0, 0, 0],
+        ])
+        self.assertEqual(batch.overlaps(directions).tolist(), [4, -1, 2, 1])
+        self.assertEqual(batch.overlaps(np.zeros((2, 1))).tolist(), [-1, -1])
+
+    def test_batch_errors(self):
+        """Method that tests the errors raised for malformed batches"""
+        with self.assertRaises(ValueError):
+            batch.evaluate(TYPES, self.directions[:, 1:])
+        with self.assertRaises(ValueError):
+            batch.evaluate(TYPES, self.directions[0])
+        with self.assertRaises(ValueError):
+            batch.validate(self.directions * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from algorithms.beam import beam_search, has_room
+from algorithms.depth_first import DepthFirstFold
+from classes import batch
+from classes.protein import Protein
+
+
+class BeamTest(unittest.TestCase):
+    """Unit tests for beam search
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_has_room(self):
+        """Method that tests counting the room left for the rest of a fold"""
+        # the ninth amino is placed in the middle of the others
+        directions = [[2, 2, 1, 1, -2, -2, -1, 2, 0, 0]]
+        xs, ys = (values[0] for values in batch.coordinates(directions))
+        self.assertTrue(has_room(xs, ys, 8))
+        self.assertFalse(has_room(xs, ys, 9))
+        self.assertTrue(has_room(xs, ys, 9, limit=0))
+
+    def test_beam_search(self):
+        """Method that tests folding proteins with a beam, in place"""
+        protein = Protein("HHHHHHHPPP", [1, 2])
+        self.assertIs(beam_search(protein, 3, 1, random.Random(0)), protein)
+        self.assertTrue(protein.is_valid)
+        self.assertEqual(protein.directions[:2], (1, 2))
+        self.assertNotIn(0, protein.directions[:-1])
+
+        # a beam wide enough to hold every fold finds the best one
+        types = "HCPHPCPHC"
+        best = beam_search(types, 3 ** len(types), 0, random.Random(0))
+        self.assertEqual(best.score, DepthFirstFold(types).run().score)
+
+        # long proteins never run into a dead end
+        for seed in range(3):
+            protein = beam_search("HHP" * 100, 1, 0, random.Random(seed))
+            self.assertTrue(protein.is_valid)
+            self.assertLess(protein.score, -20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import random
+import unittest
+
+from classes.chain import Chain
+from classes.conformation import Conformation
+
+TYPES = "HHPHPPPPH"
+DIRECTION = (1, 2, -1, -1, 2, 2, 1, -2, 0)
+SCORE = -2
+
+
+class ChainTest(unittest.TestCase):
+    """Unit tests for the Chain class
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_chain_extend(self):
+        """Method that tests placing a chain one amino at a time"""
+        chain = Chain(TYPES)
+        self.assertEqual(chain.placed, 1)
+        self.assertEqual(chain.options(), [1])
+
+        for i, direction in enumerate(DIRECTION[:-1]):
+            self.assertIn(direction, chain.options())
+            self.assertEqual(
+                chain.extend(direction),
+                Conformation(TYPES, DIRECTION).energy_before(i + 1)
+            )
+
+        self.assertTrue(chain.is_complete())
+        self.assertEqual(chain.score, SCORE)
+        self.assertEqual(tuple(chain.directions), DIRECTION)
+        self.assertRaises(IndexError, chain.extend, 1)
+
+    def test_chain_retract(self):
+        """Method that tests taking aminos back and overlapping aminos"""
+        chain = Chain(TYPES, DIRECTION)
+        self.assertEqual(chain.score, SCORE)
+        for direction in reversed(DIRECTION[:-1]):
+            self.assertEqual(chain.retract(), direction)
+
+        self.assertEqual((chain.placed, chain.score), (1, 0))
+        self.assertEqual(set(chain.directions), {0})
+        self.assertRaises(IndexError, chain.retract)
+
+        # the fifth amino would land on the first
+        chain = Chain(TYPES, DIRECTION[:3])
+        self.assertIsNone(chain.gain(-2))
+        self.assertIsNone(chain.extend(-2))
+        self.assertEqual(chain.placed, 4)
+        self.assertEqual(chain.at(0, 0), 0)
+        self.assertRaises(ValueError, Chain, TYPES, (1, 2, -1, -2))
+
+    def test_chain_traps(self):
+        """Method that tests finding pockets too small for the rest of the
+        chain"""
+        # the last amino is at (-1, 1), right of it is a pocket of one point
+        pocket = (1, 2, 2, -1, -1, -2)
+        chain = Chain("H" * 20, pocket)
+        self.assertEqual(chain.traps(), [1])
+        self.assertEqual(chain.traps(limit=0), [])
+        self.assertEqual([chain.room(d) for d in (1, -1, -2)], [0, 3, 2])
+
+        # one more amino fits in the pocket
+        self.assertEqual(Chain("H" * 8, pocket).traps(), [])
+
+        # no room at all after going into the pocket
+        chain = Chain("H" * 10, pocket + (1,))
+        self.assertRaises(ValueError, chain.grow, random.choice)
+
+    def test_chain_grow(self):
+        """Method that tests growing long chains without backtracking"""
+        for seed in range(5):
+            chain = Chain("HP" * 100)
+            self.assertEqual(chain.grow(random.Random(seed).choice), 0)
+            self.assertTrue(chain.is_complete())
+            conformation = Conformation(chain.sequence, chain.directions)
+            self.assertTrue(conformation.is_valid())
+            self.assertEqual(conformation.score(), chain.score)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import pickle
+from tempfile import TemporaryFile
+import unittest
+
+from classes.conformation import Conformation
+from classes.occupancy import DenseOccupancy
+
+TYPES = "HHPHPPPPH"
+DIRECTION = (1, 2, -1, -1, 2, 2, 1, -2, 0)
+X = (0, 1, 1, 0, -1, -1, -1, 0, 0)
+Y = (0, 0, 1, 1, 1, 2, 3, 3, 2)
+SCORE = -2
+
+
+class ConformationTest(unittest.TestCase):
+    """Unit tests for the Conformation class
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def __init__(self, methodName: str = ...) -> None:
+        """constructor method
+
+        Parameters
+        ----------
+        methodName : str, optional
+            see unittest module, by default ...
+        """
+        self.conf1 = Conformation(TYPES, DIRECTION)
+        self.conf2 = Conformation(TYPES)
+        super().__init__(methodName)
+
+    def test_conformation_creation(self):
+        """Method that tests the buffers filled by the constructor"""
+        self.assertEqual(len(self.conf1), len(TYPES))
+        self.assertEqual(self.conf1.sequence, TYPES)
+        self.assertEqual(tuple(self.conf1.types), (1, 1, 0, 1, 0, 0, 0, 0, 1))
+        self.assertEqual(tuple(self.conf1.directions), DIRECTION)
+        self.assertEqual(tuple(self.conf1.x), X)
+        self.assertEqual(tuple(self.conf1.y), Y)
+        self.assertRaises(ValueError, Conformation, "HH", (3,))
+
+    def test_conformation_at(self):
+        """Method that tests looking up aminos by their coordinates"""
+        for i, (x, y) in enumerate(zip(X, Y)):
+            self.assertEqual(self.conf1.at(x, y), i)
+        self.assertEqual(self.conf1.at(1, 2), -1)
+        # wraps around the lattice, but should not find amino 0
+        self.assertEqual(self.conf1.at(len(TYPES), 0), -1)
+        self.assertTrue(self.conf1.is_empty(1, 1))
+        self.assertFalse(self.conf1.is_empty(3, -2))
+
+    def test_conformation_score(self):
+        """Method that tests the bonds and the score"""
+        self.assertEqual(self.conf1.score(), SCORE)
+        self.assertEqual(self.conf1.contacts().tolist(), [[0, 3], [3, 8]])
+        self.assertEqual(self.conf1.contacts([8]).tolist(), [[3, 8]])
+        self.assertEqual(self.conf2.score(), 0)
+
+    def test_conformation_validate(self):
+        """Method that tests whether overlap is detected"""
+        self.assertTrue(self.conf1.is_valid())
+        self.assertFalse(self.conf2.is_valid())
+        overlap = Conformation("HHHHH", (1, 2, -1, -2, 0))
+        self.assertFalse(overlap.is_valid())
+
+    def test_conformation_fold(self):
+        """Method that tests folding moves the aminos after the fold only"""
+        conf = self.conf1.copy()
+        conf.set_direction(6, -1)
+        self.assertEqual(tuple(conf.x[:7]), X[:7])
+        self.assertEqual((conf.x[7], conf.y[7]), (-2, 3))
+        self.assertEqual((conf.x[8], conf.y[8]), (-2, 2))
+        self.assertEqual(conf.at(0, 3), -1)
+        self.assertEqual(conf.score(), -1)
+        self.assertEqual(self.conf1.score(), SCORE)
+        self.assertRaises(IndexError, conf.set_direction, len(conf), 1)
+
+    def test_conformation_occupancy(self):
+        """Method that tests the dense occupancy gives the same results"""
+        conf = Conformation(TYPES, DIRECTION, occupancy=DenseOccupancy)
+        self.assertIsInstance(conf.copy().occupancy, DenseOccupancy)
+        self.assertEqual(conf.score(), SCORE)
+        self.assertTrue(conf.is_valid())
+        self.assertEqual(conf.delta_score(0, 2), 1)
+        conf.set_direction(6, -1)
+        self.assertEqual(conf.score(), SCORE + 1)
+
+    def test_conformation_delta_score(self):
+        """Method that tests the score difference of a fold"""
+        conf = self.conf1.copy()
+        self.assertEqual(conf.delta_score(6, 1), 0)
+        self.assertEqual(conf.delta_score(6, -1), 1)
+        self.assertEqual(conf.delta_score(0, 2), 1)
+        self.assertIsNone(conf.delta_score(2, -2))
+        self.assertRaises(IndexError, conf.delta_score, len(conf), 1)
+
+        # the cached score should follow the fold
+        self.assertEqual(conf.score(), SCORE)
+        conf.set_direction(6, -1)
+        self.assertEqual(conf.score(), SCORE + 1)
+
+    def test_conformation_move(self):
+        """Method that tests folding in place and undoing it"""
+        conf = self.conf1.copy()
+        self.assertEqual(conf.score(), SCORE)
+
+        # an end move, the score is updated without recalculating it
+        end = conf.apply_move([(7, 1)])
+        fresh = Conformation(TYPES, DIRECTION[:7] + (1, 0))
+        self.assertEqual((conf.x[8], conf.y[8]), (fresh.x[8], fresh.y[8]))
+        self.assertEqual(conf._score, fresh.score())
+
+        # a corner flip only moves a single amino, to where the end was
+        flip = conf.apply_move({5: 1, 6: 2})
+        fresh = Conformation(TYPES, conf.directions)
+        self.assertEqual((conf.x[6], conf.y[6]), (0, 2))
+        self.assertEqual((conf.x, conf.y), (fresh.x, fresh.y))
+        self.assertTrue(conf.is_valid())
+        self.assertEqual(conf._score, fresh.score())
+
+        # undoing both restores the original conformation
+        conf.undo(flip)
+        conf.undo(end)
+        self.assertEqual(tuple(conf.directions), DIRECTION)
+        self.assertEqual((tuple(conf.x), tuple(conf.y)), (X, Y))
+        self.assertTrue(conf.is_valid())
+        self.assertEqual(conf.score(), SCORE)
+        self.assertRaises(IndexError, conf.apply_move, [(len(conf), 1)])
+
+    def test_conformation_move_overlap(self):
+        """Method that tests moving the start of the chain while aminos
+        overlap, and undoing it"""
+        conf = Conformation("HHHPP", (1, 2, 1, 1, 0))
+        moves = [
+            conf.apply_move(changes)
+            for changes in ({0: -2}, {3: -2}, {2: -1, 3: 2}, {0: -1})
+        ]
+        fresh = Conformation("HHHPP", conf.directions)
+        self.assertEqual(tuple(conf.directions), (-1, 2, -1, 2, 0))
+        self.assertTrue(fresh.is_valid())
+        self.assertTrue(conf.is_valid())
+        self.assertEqual(conf.score(), fresh.score())
+
+        for move in reversed(moves):
+            conf.undo(move)
+            fresh = Conformation("HHHPP", conf.directions)
+            self.assertEqual(conf.is_valid(), fresh.is_valid())
+            for i in range(len(conf)):
+                self.assertEqual(
+                    conf.at(conf.x[i], conf.y[i]),
+                    fresh.at(fresh.x[i], fresh.y[i])
+                )
+        self.assertEqual(tuple(conf.directions), (1, 2, 1, 1, 0))
+        self.assertTrue(conf.is_valid())
+
+    def test_conformation_append(self):
+        """Method that tests appending aminos"""
+        conf = self.conf1.copy()
+        conf.set_direction(8, 1)
+        self.assertEqual(conf.append("h"), len(TYPES))
+        self.assertEqual(conf.sequence, TYPES + "H")
+        self.assertEqual((conf.x[-1], conf.y[-1]), (1, 2))
+        self.assertTrue(conf.is_valid())
+        self.assertEqual(conf.score(), SCORE)
+
+    def test_pickle_conformation(self):
+        """Method that tests pickling a conformation"""
+        with TemporaryFile() as fp:
+            pickle.dump(self.conf1, fp)
+            fp.seek(0)
+            result = pickle.load(fp)
+
+        self.assertEqual(result.directions, self.conf1.directions)
+        self.assertEqual(result.x, self.conf1.x)
+        self.assertEqual(result.score(), SCORE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+
+from algorithms import BaseAlgorithm
+from algorithms.depth_first import DepthFirstFold
+from algorithms.parallel_depth_first import ParallelDepthFirstFold
+from classes.conformation import Conformation
+from classes.protein import Protein
+
+TYPES = "HHPHPPPPH"
+DIRECTION = (1, 2, -1, -1, 2, 2, 1, -2, 0)
+SCORE = -2
+
+
+class DepthFirstTest(unittest.TestCase):
+    """Unit tests for the DepthFirstFold algorithm
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_depth_first_bound(self):
+        """Method that tests that the bound never exceeds the best score"""
+        conf = Conformation(TYPES)
+        slots = DepthFirstFold.slots(conf)
+        self.assertEqual(slots[-1], (0, 0, 0, 0))
+        self.assertEqual(slots[0][:2], (6, 4))
+
+        # nothing placed but the first amino
+        free = DepthFirstFold.free(conf, 0, 0, 0, (0, 0, 0, 0))
+        self.assertEqual(free, [4, 0, 0, 0])
+        self.assertLessEqual(DepthFirstFold.bound(free, slots[1]), SCORE)
+
+    def test_depth_first_prune(self):
+        """Method that tests that pruning finds an equally good solution"""
+        for types in (TYPES, "HCPHPCPHC"):
+            exhaustive = DepthFirstFold(types)
+            exhaustive.run(prune=False)
+            pruned = DepthFirstFold(types)
+            pruned.run()
+
+            self.assertTrue(pruned.best.is_valid)
+            self.assertEqual(pruned.best.score, exhaustive.best.score)
+            self.assertEqual(
+                pruned.best.score,
+                Protein(types, pruned.best.directions).score
+            )
+            self.assertLess(pruned.visited, exhaustive.visited)
+            self.assertGreater(pruned.pruned, 0)
+
+    def test_depth_first_prefixes(self):
+        """Method that tests splitting the search at the first directions"""
+        dfs = DepthFirstFold(TYPES)
+        self.assertEqual(dfs.prefixes(1), [(1,)])
+        self.assertEqual(sorted(dfs.prefixes(2)), [(1, 1), (1, 2)])
+        self.assertEqual(len(dfs.prefixes(3)), 6)
+
+        # together the prefixes find every solution exactly once
+        score = dfs.run(prune=False).score
+        solutions = dfs.solutions
+        results = [dfs.parallel(prefix, prune=False) for prefix in dfs.prefixes(4)]
+        self.assertEqual(
+            sum(result["solutions"] for result in results), solutions
+        )
+        self.assertEqual(min(result["score"] for result in results), score)
+
+    def test_parallel_depth_first(self):
+        """Method that tests searching the prefixes in several processes"""
+        dfs = ParallelDepthFirstFold("HCPHPCPHC")
+        best = dfs.run(processes=2, depth=3)
+        self.assertTrue(best.is_valid)
+        self.assertEqual(best.score, DepthFirstFold("HCPHPCPHC").run().score)
+        self.assertEqual(len(dfs.completed), len(dfs.prefixes(3)))
+        self.assertEqual(dfs.stop_reason, BaseAlgorithm.COMPLETED)
+
+        # stop as soon as the best score is known to be reached
+        best = dfs.run(processes=2, depth=3, target_score=best.score)
+        self.assertEqual(dfs.stop_reason, BaseAlgorithm.TARGET_SCORE)
+        self.assertTrue(best.is_valid)
+
+    def test_depth_first_limits(self):
+        """Method that tests stopping the search early"""
+        dfs = DepthFirstFold("HHPHHHPHPHHHPH")
+        best = dfs.run()
+        self.assertEqual(dfs.stop_reason, BaseAlgorithm.COMPLETED)
+        visited = dfs.visited
+
+        dfs.run(max_evaluations=100)
+        self.assertEqual(dfs.stop_reason, BaseAlgorithm.MAX_EVALUATIONS)
+        self.assertEqual(dfs.evaluations, 100)
+
+        found = dfs.run(target_score=best.score)
+        self.assertEqual(dfs.stop_reason, BaseAlgorithm.TARGET_SCORE)
+        self.assertEqual(found.score, best.score)
+        self.assertLess(dfs.visited, visited)
+
+        dfs.run(time_budget=0)
+        self.assertEqual(dfs.stop_reason, BaseAlgorithm.TIME_BUDGET)
+
+    def test_depth_first_limits_solution(self):
+        """Method that tests a solution is found before stopping, whichever
+        limit is reached first"""
+        limits = (
+            {"time_budget": 0}, {"max_evaluations": 1}, {"target_score": 0}
+        )
+        for limit in limits:
+            for dfs, options in (
+                    (DepthFirstFold("HHPHHHPHPHHHPH"), {}),
+                    (ParallelDepthFirstFold("HHPHHHPHPHHHPH"), {"processes": 2})):
+                best = dfs.run(**options, **limit)
+                self.assertTrue(best.is_valid)
+                self.assertNotEqual(dfs.stop_reason, BaseAlgorithm.COMPLETED)
+
+        # the process that reached the target may return after the others
+        for _ in range(3):
+            dfs = ParallelDepthFirstFold("HPHPPHHPHPPHPHHPPHPH")
+            best = dfs.run(processes=4, target_score=-7)
+            self.assertEqual(dfs.stop_reason, BaseAlgorithm.TARGET_SCORE)
+            self.assertTrue(best.is_valid)
+            self.assertLessEqual(best.score, -7)
+
+
+if __name__ == "__main__":
+    unittest.main()
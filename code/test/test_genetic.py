@@ -0,0 +1,122 @@
+import numpy as np
+import random
+import unittest
+
+from algorithms import BaseAlgorithm
+from algorithms.depth_first import DepthFirstFold
+from algorithms.genetic import GeneticAlgorithm, INVALID, ROTATIONS
+from algorithms.random_protein import random_folds
+from classes import batch
+
+
+class GeneticAlgorithmTest(unittest.TestCase):
+    """Unit tests for the GeneticAlgorithm class
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_rotations(self):
+        """Method that tests turning directions by quarter turns"""
+        self.assertEqual(ROTATIONS[0].tolist(), [-2, -1, 0, 1, 2])
+        self.assertEqual(ROTATIONS[1].tolist(), [1, -2, 0, 2, -1])
+        self.assertEqual(ROTATIONS[2].tolist(), [2, 1, 0, -1, -2])
+
+    def test_breed(self):
+        """Method that tests breeding and repairing children"""
+        types = "HPHPPHHPHPPHPHHPPHPH"
+        algorithm = GeneticAlgorithm(types, mutation=0.2)
+        rng = np.random.default_rng(0)
+        algorithm.population = random_folds(types, 50)
+        algorithm.fitness = algorithm.evaluate(algorithm.population)
+        self.assertEqual(algorithm.evaluations, 50)
+
+        children = algorithm.breed(200, rng)
+        self.assertEqual(children.shape, (200, len(types)))
+        self.assertTrue(np.isin(children[:, :-1], [-2, -1, 1, 2]).all())
+        self.assertTrue((children[:, -1] == 0).all())
+
+        # repairing leaves fewer children in which aminos overlap
+        overlapping = np.count_nonzero(batch.overlaps(children) >= 0)
+        algorithm.repair(children, rng)
+        self.assertLess(
+            np.count_nonzero(batch.overlaps(children) >= 0), overlapping
+        )
+        fitness = algorithm.evaluate(children)
+        self.assertTrue((fitness[fitness != INVALID] <= 0).all())
+
+    def test_genetic(self):
+        """Method that tests breeding generations of conformations"""
+        random.seed(0)
+        types = "HHPHHHPHPHHHPH"
+        algorithm = GeneticAlgorithm(types, size=50)
+        best = algorithm.run(generations=200)
+        self.assertTrue(best.is_valid)
+        self.assertEqual(best.score, DepthFirstFold(types).run().score)
+        self.assertEqual(algorithm.generations, 200)
+        self.assertEqual(algorithm.population.shape, (50, len(types)))
+        self.assertEqual(algorithm.stop_reason, BaseAlgorithm.COMPLETED)
+
+        algorithm.run(generations=200, target_score=-3)
+        self.assertEqual(algorithm.stop_reason, BaseAlgorithm.TARGET_SCORE)
+        self.assertLess(algorithm.generations, 200)
+
+        algorithm.run(generations=200, max_evaluations=100)
+        self.assertEqual(algorithm.stop_reason, BaseAlgorithm.MAX_EVALUATIONS)
+        self.assertEqual(algorithm.generations, 2)
+        self.assertEqual(algorithm.evaluations, 50 + 2 * 48)
+
+    def test_genetic_unbonded(self):
+        """Method that tests a valid fold is kept when no fold scores below
+        0, even once children in which aminos overlap take over"""
+        random.seed(0)
+        types = "HPHPHPHPH"
+        best = GeneticAlgorithm(types).run(generations=5)
+        self.assertTrue(best.is_valid)
+        self.assertEqual(best.score, 0)
+
+        algorithm = GeneticAlgorithm(types, elite=0, mutation=1.0, repairs=0)
+        best = algorithm.run(generations=5)
+        self.assertTrue((algorithm.fitness == INVALID).any())
+        self.assertTrue(best.is_valid)
+        self.assertEqual(best.score, 0)
+
+    def test_genetic_limits(self):
+        """Method that tests a valid conformation is bred before any limit is
+        honoured, even when none of the first population is valid"""
+        class Overlapping(GeneticAlgorithm):
+            def evaluate(self, population, pool=None, processes=1):
+                first = not self.evaluations
+                fitness = super().evaluate(population, pool, processes)
+                if first:
+                    fitness[:] = INVALID
+                return fitness
+
+        random.seed(0)
+        limits = (
+            {"time_budget": 0}, {"max_evaluations": 1}, {"target_score": 0}
+        )
+        for limit in limits:
+            algorithm = Overlapping("HHPHHHPHPHHHPH", size=20)
+            best = algorithm.run(generations=50, **limit)
+            self.assertNotEqual(algorithm.stop_reason, BaseAlgorithm.COMPLETED)
+            self.assertTrue(best.is_valid)
+            self.assertEqual(algorithm.generations, 1)
+
+    def test_genetic_parallel(self):
+        """Method that tests scoring the population in worker processes"""
+        random.seed(0)
+        algorithm = GeneticAlgorithm("HHPHHHPHPHHHPH", size=20)
+        best = algorithm.run(generations=5, processes=2)
+        self.assertTrue(best.is_valid)
+        self.assertEqual(algorithm.evaluations, 20 + 5 * 18)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import random
+import unittest
+
+from algorithms.greedy import greedy
+from classes.protein import Protein
+
+
+class GreedyTest(unittest.TestCase):
+    """Unit tests for the greedy algorithm
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_greedy(self):
+        """Method that tests folding proteins greedily, in place"""
+        protein = Protein("HHHHHHHPPP", [1, 2])
+        self.assertIs(greedy(protein, random.Random(0)), protein)
+        self.assertTrue(protein.is_valid)
+        self.assertEqual(protein.directions[:2], (1, 2))
+        self.assertEqual(protein.directions[-1], 0)
+        self.assertNotIn(0, protein.directions[:-1])
+
+        # every amino adds as many bonds as it can, so a chain of H folds
+        # into a block no matter how long it is
+        protein = greedy("H" * 300, random.Random(0))
+        self.assertTrue(protein.is_valid)
+        self.assertLess(protein.score, -200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+from multiprocessing import get_context
+import random
+import unittest
+
+from algorithms import BaseAlgorithm
+from algorithms.hillclimber import HillClimber
+from algorithms.parallel_hillclimber import Islands, ParallelHillClimber
+from classes import batch
+from classes.protein import Protein
+
+
+class HillClimberTest(unittest.TestCase):
+    """Unit tests for the HillClimber class
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_neighbours(self):
+        """Method that tests listing the whole neighbourhood of a protein"""
+        protein = Protein("HHPHPPPPH", [1, 2, -1, -1, 2, 2, 1, -2, 0])
+        moves, folds = HillClimber(protein, "pull").neighbours(protein)
+        self.assertEqual(folds.shape, (len(moves), len(protein)))
+        scores, valid = batch.evaluate(protein.types, folds)
+        self.assertTrue(valid.all())
+        for move, row, score in zip(moves, folds, scores):
+            made = protein.apply_move(move)
+            self.assertEqual(protein.directions, tuple(row))
+            self.assertEqual(protein.score, score)
+            protein.undo(made)
+
+    def test_mutate(self):
+        """Method that tests making several moves at once and reverting them"""
+        random.seed(0)
+        for move_set in ("pivot", "pull"):
+            climber = HillClimber("HHPHHHPHPHHHPH", move_set)
+            protein = climber.get_starting_point(climber.protein)
+            for _ in range(200):
+                old = protein.directions
+                moves = climber.mutate(protein, mutations=3)
+                fresh = Protein(protein.types, list(protein.directions))
+                self.assertTrue(protein.is_valid)
+                self.assertEqual(protein.is_valid, fresh.is_valid)
+                self.assertEqual(protein.score, fresh.score)
+                if moves is not None:
+                    climber.revert(protein, moves)
+                fresh = Protein(protein.types, list(protein.directions))
+                self.assertEqual(protein.directions, old)
+                self.assertTrue(protein.is_valid)
+                self.assertEqual(protein.score, fresh.score)
+
+    def test_single_amino(self):
+        """Method that tests a protein of a single amino, which has no moves
+        """
+        climber = HillClimber("H")
+        self.assertEqual(climber.mutate(Protein("H")), [])
+        for mode in ("random", "steepest", "first"):
+            best = climber.run(runs=2, iterations=10, mode=mode)
+            self.assertTrue(best.is_valid)
+            self.assertEqual(best.directions, (0,))
+
+    def test_steepest(self):
+        """Method that tests climbing to a local minimum of the neighbourhood"""
+        climber = HillClimber("HHPHHHPHPHHHPH" * 2, "pull")
+        for mode in ("steepest", "first"):
+            random.seed(0)
+            best = climber.run(runs=2, mode=mode)
+            self.assertTrue(best.is_valid)
+            self.assertIsNone(climber.descend(Protein.copy(best)))
+        self.assertRaises(ValueError, climber.run, mode="best")
+
+    def test_limits(self):
+        """Method that tests stopping runs early"""
+        climber = HillClimber("HHPHHHPHPHHHPH", "pull")
+        climber.run(runs=100, max_evaluations=200)
+        self.assertEqual(climber.stop_reason, BaseAlgorithm.MAX_EVALUATIONS)
+        self.assertEqual(climber.evaluations, 200)
+
+        best = climber.run(runs=100, target_score=-1)
+        self.assertEqual(climber.stop_reason, BaseAlgorithm.TARGET_SCORE)
+        self.assertLessEqual(best.score, -1)
+
+        climber.run(runs=100, time_budget=0, mode="steepest")
+        self.assertEqual(climber.stop_reason, BaseAlgorithm.TIME_BUDGET)
+        climber.run(runs=1, iterations=10)
+        self.assertEqual(climber.stop_reason, BaseAlgorithm.COMPLETED)
+
+        climber = ParallelHillClimber("HHPHHHPHPHHHPH")
+        climber.run(runs=50, processes=2, max_evaluations=100)
+        self.assertEqual(climber.stop_reason, BaseAlgorithm.MAX_EVALUATIONS)
+        self.assertLess(climber.runs_completed, 50)
+
+        # a valid fold is returned, even when no fold scores below 0 or the
+        # runs are stopped at once
+        climber = ParallelHillClimber("PPPPPP")
+        self.assertTrue(climber.run(runs=2, processes=2).is_valid)
+        climber = ParallelHillClimber("HHPHHHPHPHHHPH")
+        best = climber.run(runs=4, processes=2, time_budget=0)
+        self.assertEqual(climber.stop_reason, BaseAlgorithm.TIME_BUDGET)
+        self.assertTrue(best.is_valid)
+
+    def test_parallel(self):
+        """Method that tests doing runs on a pool of processes"""
+        climber = ParallelHillClimber("HHPHHHPHPHHHPH")
+        completed = []
+        best = climber.run(
+            runs=5, iterations=50, processes=2,
+            callback=lambda solution, run: completed.append((run, solution))
+        )
+        self.assertEqual(climber.runs_completed, 5)
+        self.assertEqual(sorted(run for run, _ in completed), list(range(5)))
+        self.assertTrue(all(solution.is_valid for _, solution in completed))
+        self.assertEqual(
+            best.score, min(solution.score for _, solution in completed)
+        )
+
+    def test_islands(self):
+        """Method that tests trading folds between islands"""
+        protein = Protein("HHPHPPPPH", [1, 2, -1, -1, 2, 2, 1, -2, 0])
+        islands = Islands(get_context(), 3, len(protein))
+        self.assertIsNone(islands.migrant(1))
+
+        # in a ring, every island takes migrants from the one before it
+        islands.publish(0, protein)
+        self.assertEqual(islands.migrant(1), (-2, list(protein.directions)))
+        self.assertIsNone(islands.migrant(2))
+
+        # worse folds are not published
+        islands.publish(0, Protein(protein.types, [1] * 8 + [0]))
+        self.assertEqual(islands.migrant(1)[0], -2)
+        self.assertRaises(
+            ValueError, Islands, get_context(), 3, len(protein), "star"
+        )
+
+        climber = ParallelHillClimber("HHPHHHPHPHHHPH")
+        best = climber.run(
+            runs=3, iterations=50, processes=3, interval=10, topology="all"
+        )
+        self.assertEqual(climber.runs_completed, 3)
+        self.assertTrue(best.is_valid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import random
+import unittest
+
+from algorithms import BaseAlgorithm
+from algorithms.depth_first import DepthFirstFold
+from algorithms.mcts import MonteCarloTreeSearch
+from classes.chain import Chain
+
+TYPES = "HHPHHHPHPHHHPH"
+
+
+class MonteCarloTreeSearchTest(unittest.TestCase):
+    """Unit tests for the MonteCarloTreeSearch class
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_visit(self):
+        """Method that tests forgetting the least recently visited nodes"""
+        search = MonteCarloTreeSearch(TYPES, nodes=2)
+        search.visit(b"a")[0] += 1
+        search.visit(b"b")
+        self.assertEqual(search.visit(b"a"), [1, 0.0])
+        search.visit(b"c")
+        self.assertEqual(list(search.table), [b"a", b"c"])
+        self.assertEqual(search.evictions, 1)
+
+    def test_iterate(self):
+        """Method that tests walking down the tree once"""
+        random.seed(0)
+        search = MonteCarloTreeSearch(TYPES)
+        chain = Chain(TYPES)
+        score = search.iterate(chain)
+        self.assertEqual(chain.placed, 1)
+        self.assertEqual(search.evaluations, 1)
+        self.assertEqual(search.best.score, score)
+
+        # the root and its only child were visited once, with that score
+        self.assertEqual(len(search.table), 2)
+        for visits, total in search.table.values():
+            self.assertEqual((visits, total), (1, -score))
+
+    def test_mcts(self):
+        """Method that tests searching the tree"""
+        random.seed(0)
+        search = MonteCarloTreeSearch(TYPES, nodes=100)
+        best = search.run(iterations=1000)
+        self.assertTrue(best.is_valid)
+        self.assertEqual(best.score, DepthFirstFold(TYPES).run().score)
+        self.assertLessEqual(len(search.table), 100)
+        self.assertGreater(search.evictions, 0)
+        self.assertEqual(search.stop_reason, BaseAlgorithm.COMPLETED)
+
+        # every worker grows a tree of its own
+        search = MonteCarloTreeSearch(TYPES)
+        best = search.run(iterations=50, processes=2, max_evaluations=30)
+        self.assertTrue(best.is_valid)
+        self.assertGreaterEqual(search.evaluations, 30)
+        self.assertEqual(search.stop_reason, BaseAlgorithm.MAX_EVALUATIONS)
+
+    def test_mcts_limits(self):
+        """Method that tests a fold is grown before any limit is honoured"""
+        random.seed(0)
+        limits = (
+            {"time_budget": 0}, {"max_evaluations": 1}, {"target_score": 0}
+        )
+        for limit in limits:
+            for processes in (1, 2):
+                search = MonteCarloTreeSearch("HHPHHPH")
+                best = search.run(iterations=50, processes=processes, **limit)
+                self.assertNotEqual(search.stop_reason, BaseAlgorithm.COMPLETED)
+                self.assertTrue(best.is_valid)
+                self.assertGreater(search.evaluations, 0)
+
+    def test_mcts_unbonded(self):
+        """Method that tests a valid fold is found when no fold scores below
+        0"""
+        random.seed(0)
+        for processes in (1, 2):
+            search = MonteCarloTreeSearch("HPHPHPHPH")
+            best = search.run(iterations=5, processes=processes)
+            self.assertTrue(best.is_valid)
+            self.assertEqual(best.score, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import random
+import unittest
+
+from algorithms import moves
+from algorithms.hillclimber import HillClimber
+from classes.conformation import Conformation
+
+TYPES = "HHPHPPPPH"
+DIRECTION = (1, 2, -1, -1, 2, 2, 1, -2, 0)
+SCORE = -2
+
+
+class MovesTest(unittest.TestCase):
+    """Unit tests for the move sets
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def setUp(self):
+        """Sets up a folded conformation"""
+        self.conf = Conformation(TYPES, DIRECTION)
+
+    def check_move(self, conf, move):
+        """Applies a move, checks the result and undoes it again"""
+        token = conf.apply_move(move)
+        fresh = Conformation(conf.sequence, conf.directions)
+        self.assertTrue(conf.is_valid())
+        self.assertEqual(conf.score(), fresh.score())
+        conf.undo(token)
+
+    def test_end_moves(self):
+        """Method that tests moving the ends of the chain"""
+        self.assertEqual(len(moves.end_moves(self.conf, 0)), 2)
+        self.assertEqual(len(moves.end_moves(self.conf, 8)), 2)
+        self.assertEqual(moves.end_moves(self.conf, 4), [])
+        for move in moves.end_moves(self.conf, 0):
+            self.check_move(self.conf, move)
+
+    def test_crankshafts(self):
+        """Method that tests moving a U-shape to its other side"""
+        conf = Conformation("HPPH", (1, 2, -1, 0))
+        self.assertEqual(moves.crankshafts(conf, 1), [{0: -1, 2: 1}])
+        self.assertEqual(moves.crankshafts(self.conf, 1), [])
+
+        conf.apply_move({0: -1, 2: 1})
+        self.assertEqual((conf.x[3], conf.y[3]), (0, 1))
+        self.assertEqual((conf.x[1], conf.y[1]), (-1, 0))
+
+    def test_all_moves(self):
+        """Method that tests that no local move makes aminos overlap"""
+        kinds = (
+            moves.end_moves, moves.corner_flips,
+            moves.crankshafts, moves.pull_moves
+        )
+        for index in range(len(self.conf)):
+            for kind in kinds:
+                for move in kind(self.conf, index):
+                    self.check_move(self.conf, move)
+
+        self.assertEqual(tuple(self.conf.directions), DIRECTION)
+        self.assertEqual(self.conf.score(), SCORE)
+
+    def test_pull_moves_fold(self):
+        """Method that tests that every pull move folds at least one amino,
+        even when it pulls the whole chain along"""
+        conf = Conformation("HHH", (-2, -2, 0))
+        for index in range(len(conf)):
+            self.assertNotIn({}, moves.pull_moves(conf, index))
+        for index in range(len(self.conf)):
+            self.assertNotIn({}, moves.pull_moves(self.conf, index))
+
+    def test_random_moves(self):
+        """Method that tests a random walk of pull moves"""
+        rng = random.Random(0)
+        for _ in range(200):
+            self.conf.apply_move(moves.random_move(self.conf, "pull", rng))
+            self.assertTrue(self.conf.is_valid())
+
+        fresh = Conformation(TYPES, self.conf.directions)
+        self.assertEqual(self.conf.score(), fresh.score())
+
+    def test_move_sets(self):
+        """Method that tests selecting move sets"""
+        self.assertRaises(ValueError, moves.check_move_set, "teleport")
+        self.assertRaises(ValueError, HillClimber, TYPES, "teleport")
+        self.assertEqual(HillClimber(TYPES, "pull").move_set, "pull")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import numpy as np
+import unittest
+
+from classes.occupancy import DenseOccupancy, HashOccupancy, pack, pack_all
+
+XS = (0, 1, 1, 0, 0)
+YS = (0, 0, 1, 1, 0)
+
+
+class OccupancyTest(unittest.TestCase):
+    """Unit tests for the Occupancy classes
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_pack(self):
+        """Method that tests packing coordinates into unique integers"""
+        points = [(x, y) for x in range(-3, 4) for y in range(-3, 4)]
+        keys = {pack(x, y) for x, y in points}
+        self.assertEqual(len(keys), len(points))
+        self.assertEqual(
+            pack_all(np.array([-3, 2]), np.array([1, -2])).tolist(),
+            [pack(-3, 1), pack(2, -2)]
+        )
+
+    def check_occupancy(self, occupancy):
+        """Runs the same checks against any kind of occupancy"""
+        # the last amino overlaps with the first, which keeps its point
+        occupancy.claim(XS, YS, range(len(XS)))
+        self.assertEqual(len(occupancy), 4)
+        self.assertEqual(occupancy.get(0, 0), 0)
+        self.assertEqual(occupancy.get(1, 1), 2)
+        self.assertEqual(occupancy.get(2, 2), -1)
+        self.assertEqual(
+            occupancy.lookup(np.array([1, 0, 9]), np.array([0, 1, 9])).tolist(),
+            [1, 3, -1]
+        )
+
+        # releasing only empties points held by the given amino
+        copy = occupancy.copy()
+        occupancy.release([0, 1], [0, 0], [4, 1])
+        self.assertEqual(occupancy.get(0, 0), 0)
+        self.assertEqual(occupancy.get(1, 0), -1)
+        self.assertEqual(copy.get(1, 0), 1)
+
+        # points far away from the start can still be claimed
+        occupancy.claim([40], [-35], [5])
+        self.assertEqual(occupancy.get(40, -35), 5)
+        self.assertEqual(occupancy.get(1, 1), 2)
+
+    def test_hash_occupancy(self):
+        """Method that tests the dict based occupancy"""
+        self.check_occupancy(HashOccupancy(len(XS)))
+
+    def test_dense_occupancy(self):
+        """Method that tests the array based occupancy"""
+        self.check_occupancy(DenseOccupancy(len(XS)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+from math import exp, inf, log
+import random
+import unittest
+
+from algorithms import BaseAlgorithm
+from algorithms.depth_first import DepthFirstFold
+from algorithms.perm import PERM, log_add
+
+
+class PERMTest(unittest.TestCase):
+    """Unit tests for the PERM class
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_log_add(self):
+        """Method that tests adding weights as logarithms"""
+        self.assertAlmostEqual(exp(log_add(log(2), log(3))), 5)
+        self.assertEqual(log_add(-inf, 1.5), 1.5)
+        self.assertEqual(log_add(1.5, -inf), 1.5)
+        self.assertAlmostEqual(log_add(1000, 1000), 1000 + log(2))
+
+    def test_perm(self):
+        """Method that tests growing chains with pruning and enrichment"""
+        random.seed(0)
+        types = "HHPHHHPHPHHHPH"
+        algorithm = PERM(types)
+        self.assertEqual(algorithm.thresholds(5), (inf, -inf))
+
+        best = algorithm.run(tours=200)
+        self.assertTrue(best.is_valid)
+        self.assertEqual(best.score, DepthFirstFold(types).run().score)
+        self.assertEqual(algorithm.tours, 200)
+        self.assertGreater(algorithm.clones, 0)
+        self.assertGreater(algorithm.solutions, 0)
+        self.assertEqual(algorithm.stop_reason, BaseAlgorithm.COMPLETED)
+
+        # the thresholds follow the weights of the chains grown so far
+        upper, lower = algorithm.thresholds(5)
+        self.assertLess(upper, inf)
+        self.assertAlmostEqual(upper - lower, log(5))
+
+        algorithm.run(tours=200, max_evaluations=50)
+        self.assertEqual(algorithm.stop_reason, BaseAlgorithm.MAX_EVALUATIONS)
+        self.assertEqual(algorithm.evaluations, 50)
+
+        # a complete chain is grown before any limit is honoured
+        for limit in ({"time_budget": 0}, {"max_evaluations": 1}):
+            best = algorithm.run(tours=200, **limit)
+            self.assertNotEqual(algorithm.stop_reason, BaseAlgorithm.COMPLETED)
+            self.assertTrue(best.is_valid)
+            self.assertEqual(algorithm.tours, 1)
+
+    def test_perm_unbonded(self):
+        """Method that tests a valid chain is found when no chain scores
+        below 0"""
+        random.seed(0)
+        best = PERM("HPHPHPHPH").run(tours=5)
+        self.assertTrue(best.is_valid)
+        self.assertEqual(best.score, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -45,7 +45,7 @@ class ProteinTest(unittest.TestCase):
         self.assertEqual(DIRECTION, self.prot1.directions)
 
     def test_protein_aminos(self):
-        self.assertEqual(self.prot1.aminos, instanceof(tuple))
+        self.assertIsInstance(self.prot1.aminos, tuple)
         self.assertIsInstance(self.prot2.aminos[0], Amino)
 
     def test_protein_score(self):
@@ -66,6 +66,18 @@ class ProteinTest(unittest.TestCase):
         self.assertFalse(Protein.validate(self.prot2))
         self.assertEqual(self.prot1.is_valid, Protein.validate(self.prot1))
 
+    def test_protein_move(self):
+        """Method that tests folding a protein in place and undoing it"""
+        prot = Protein.copy(self.prot1)
+        move = prot.apply_move([(6, -1)])
+        self.assertEqual(prot.directions[6], -1)
+        self.assertEqual(prot.score, SCORE + 1)
+        self.assertEqual(prot, Protein(TYPES, prot.directions))
+
+        prot.undo(move)
+        self.assertEqual(prot, self.prot1)
+        self.assertEqual(prot.score, SCORE)
+
     def test_protein_hash(self):
         """Method that tests protein hash euqality"""
         self.assertNotEqual(self.prot1, self.prot2)
@@ -73,6 +85,21 @@ class ProteinTest(unittest.TestCase):
         self.assertEqual(self.prot1, prot3)
         self.assertEqual(hash(self.prot1), hash(prot3))
 
+    def test_protein_key(self):
+        """Method that tests that rotated and mirrored folds share a key"""
+        turn = {1: 2, 2: -1, -1: -2, -2: 1, 0: 0}
+        rotated = Protein(TYPES, [turn[d] for d in DIRECTION])
+        mirrored = Protein(TYPES, [-d if abs(d) == 2 else d for d in DIRECTION])
+        for prot in (rotated, mirrored):
+            self.assertNotEqual(prot, self.prot1)
+            self.assertEqual(prot.key, self.prot1.key)
+            self.assertEqual(hash(prot), hash(self.prot1))
+            self.assertEqual(Protein.to_sha1(prot), Protein.to_sha1(self.prot1))
+
+        self.assertNotEqual(self.prot1.key, self.prot2.key)
+        straight = Protein(TYPES, [1] * (len(TYPES) - 1))
+        self.assertNotEqual(straight.key, self.prot1.key)
+
     def test_pickle_protein(self):
         """Method that tests pickeling a protein"""
         pickle_result = None
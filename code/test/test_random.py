@@ -1,6 +1,10 @@
+import random
 import unittest
 
-from algorithms.random_protein import fold_randomly
+from algorithms.random_protein import (
+    fold_randomly, iter_random_folds, random_directions, random_folds
+)
+from classes import batch
 from classes.protein import Protein
 
 
@@ -36,13 +40,54 @@ class RandomTest(unittest.TestCase):
         prot2 = Protein.copy(self.test_prot)
         self.assertIsInstance(prot1, Protein)
         self.assertIsInstance(prot2, Protein)
-        fold_randomly(prot1, prot1.aminos[0])
-        fold_randomly(prot2, prot2.aminos[0])
+        fold_randomly(prot1)
+        fold_randomly(prot2)
         self.assertIsInstance(prot1, Protein)
         self.assertIsInstance(prot2, Protein)
         self.assertTrue(Protein.validate(prot1))
         self.assertTrue(Protein.validate(prot1))
         self.assertNotEqual(prot1, prot2)
+        self.assertEqual(prot1.score, Protein(prot1.types, prot1.directions).score)
+
+    def test_random_directions(self):
+        """Method that tests folding long proteins without recursion"""
+        types = "HP" * 1000
+        directions = random_directions(types, random.Random(0))
+        self.assertEqual(len(directions), len(types))
+        self.assertEqual(directions[-1], 0)
+        self.assertTrue(Protein(types, directions).is_valid)
+        self.assertEqual(directions, random_directions(types, random.Random(0)))
+
+    def test_random_folds(self):
+        """Method that tests making many random folds at once"""
+        folds = random_folds(self.test_prot.types, 100, random.Random(1))
+        self.assertEqual(folds.shape, (100, len(self.test_prot)))
+        self.assertTrue(batch.validate(folds).all())
+        self.assertGreater(len({fold.tobytes() for fold in folds}), 1)
+
+    def test_iter_random_folds(self):
+        """Method that tests streaming random folds"""
+        types = self.test_prot.types
+        folds = list(iter_random_folds(types, seed=2, batch=7, amount=30))
+        self.assertEqual(len(folds), 30)
+        self.assertTrue(batch.validate(folds).all())
+
+        # the same seed gives the same folds, in any amount of processes
+        pooled = iter_random_folds(
+            types, seed=2, batch=7, amount=30, processes=2
+        )
+        self.assertEqual(
+            [fold.tolist() for fold in folds],
+            [fold.tolist() for fold in pooled]
+        )
+
+        # without an amount, the folds never run out
+        stream = iter_random_folds(types, batch=3, proteins=True)
+        for _ in range(10):
+            protein = next(stream)
+            self.assertIsInstance(protein, Protein)
+            self.assertTrue(protein.is_valid)
+        self.assertRaises(ValueError, next, iter_random_folds(types, batch=0))
 
 
 if __name__ == "__main__":
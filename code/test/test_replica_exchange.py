@@ -0,0 +1,60 @@
+import random
+import unittest
+
+from algorithms.replica_exchange import ReplicaExchange, temperatures
+from classes.protein import Protein
+
+
+class ReplicaExchangeTest(unittest.TestCase):
+    """Unit tests for the ReplicaExchange class
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_temperatures(self):
+        """Method that tests the ladder of temperatures"""
+        ladder = temperatures(4, 0.5, 4)
+        self.assertEqual(len(ladder), 4)
+        self.assertAlmostEqual(ladder[0], 0.5)
+        self.assertAlmostEqual(ladder[-1], 4)
+        self.assertAlmostEqual(ladder[1] / ladder[0], ladder[3] / ladder[2])
+        self.assertEqual(temperatures(1, 0.5, 4), [0.5])
+
+    def test_exchange(self):
+        """Method that tests swapping replicas between temperatures"""
+        folded = Protein("HHPHPPPPH", [1, 2, -1, -1, 2, 2, 1, -2, 0])
+        straight = Protein("HHPHPPPPH", [1] * 8 + [0])
+        algorithm = ReplicaExchange(folded)
+        algorithm.temperatures = [0.5, 1.0, 2.0]
+        algorithm.swaps_tried = [0, 0]
+        algorithm.swaps_accepted = [0, 0]
+
+        # a worse fold at a lower temperature is always swapped up
+        replicas = [straight, folded, straight]
+        algorithm.exchange(replicas, False)
+        self.assertEqual(replicas, [folded, straight, straight])
+        self.assertEqual(algorithm.swaps_tried, [1, 0])
+        self.assertEqual(algorithm.swap_rates(), [1.0, 0.0])
+
+    def test_replica_exchange(self):
+        """Method that tests running several replicas"""
+        random.seed(0)
+        algorithm = ReplicaExchange("HHPHHHPHPHHHPH")
+        best = algorithm.run(iterations=200, replicas=4)
+        self.assertTrue(best.is_valid)
+        self.assertLess(best.score, 0)
+        self.assertEqual(len(algorithm.swaps_tried), 3)
+        self.assertEqual(sum(algorithm.swaps_tried), 200 // 10 * 3 // 2)
+        self.assertTrue(all(0 <= rate <= 1 for rate in algorithm.swap_rates()))
+        self.assertEqual(algorithm.evaluations, 800)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from algorithms.schedules import SCHEDULES, Adaptive, check_schedule
+from algorithms.simulated_annealing import SimulatedAnnealing
+
+
+class SimulatedAnnealingTest(unittest.TestCase):
+    """Unit tests for the SimulatedAnnealing class and its schedules
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_schedules(self):
+        """Method that tests cooling down and heating up again"""
+        for name, schedule in SCHEDULES.items():
+            schedule = check_schedule(name)(2.0, 100)
+            self.assertAlmostEqual(schedule.temperature(0), 2.0)
+            if name != "adaptive":
+                self.assertLess(schedule.temperature(99), 2.0)
+                self.assertLess(
+                    schedule.temperature(60), schedule.temperature(50)
+                )
+            schedule.reheat(50)
+            self.assertAlmostEqual(schedule.temperature(50), 2.0)
+
+        self.assertRaises(ValueError, check_schedule, "exponential")
+        self.assertRaises(ValueError, SCHEDULES["linear"], 0, 100)
+
+        # accepting too many worse folds cools the adaptive schedule down
+        schedule = Adaptive(2.0, 100)
+        schedule.temperature(50)
+        for _ in range(10):
+            schedule.update(True)
+        self.assertLess(schedule.temperature(50), 2.0)
+
+    def test_accept(self):
+        """Method that tests the Metropolis criterion"""
+        self.assertEqual(SimulatedAnnealing.accept(-3, 1.0), 1.0)
+        self.assertEqual(SimulatedAnnealing.accept(0, 1.0), 1.0)
+        self.assertAlmostEqual(SimulatedAnnealing.accept(1, 1.0), 0.3678794)
+        self.assertLess(
+            SimulatedAnnealing.accept(1, 0.5), SimulatedAnnealing.accept(1, 1)
+        )
+
+    def test_simulated_annealing(self):
+        """Method that tests counting the moves kept and undone"""
+        random.seed(0)
+        annealing = SimulatedAnnealing("HHPHHHPHPHHHPH", schedule="geometric")
+        best = annealing.run(iterations=500, reheat=50)
+        self.assertTrue(best.is_valid)
+        self.assertEqual(
+            annealing.accepted + annealing.rejected, annealing.evaluations
+        )
+        self.assertEqual(annealing.evaluations, 500)
+        self.assertGreater(annealing.reheats, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import random
+import unittest
+
+from algorithms.tabu import TabuList, TabuSearch
+from classes import batch
+from classes.protein import Protein
+
+
+class TabuTest(unittest.TestCase):
+    """Unit tests for the TabuSearch class
+
+    Parameters
+    ----------
+    TestCase :
+        unittest superclass needed for unittest;
+`
+    See Also
+    --------
+    `unittest module <https://docs.python.org/3/library/unittest.html#unittest.main>`_:
+        for more information about the methods used here
+    """
+    def test_tabu_list(self):
+        """Method that tests forgetting the oldest keys"""
+        tabu = TabuList(2)
+        tabu.add(b"a")
+        tabu.add(b"b")
+        tabu.add(b"a")
+        self.assertEqual(len(tabu), 2)
+        self.assertIn(b"a", tabu)
+        self.assertIn(b"b", tabu)
+
+        # a key added twice is only forgotten with its last addition
+        tabu.add(b"c")
+        self.assertIn(b"a", tabu)
+        self.assertNotIn(b"b", tabu)
+        tabu.add(b"d")
+        self.assertNotIn(b"a", tabu)
+
+        empty = TabuList(0)
+        empty.add(b"a")
+        self.assertNotIn(b"a", empty)
+        self.assertEqual(len(empty), 0)
+
+    def test_search(self):
+        """Method that tests making the best move that is not tabu"""
+        random.seed(0)
+        protein = Protein("HHPHPPPPH", [1, 2, -1, -1, 2, 2, 1, -2, 0])
+        algorithm = TabuSearch(protein)
+        algorithm.tabu = TabuList(10)
+        best = Protein.copy(protein)
+
+        # a local minimum is left for the best fold that's not tabu
+        found = algorithm.search(protein, best)
+        self.assertIs(found, best)
+        self.assertTrue(protein.is_valid)
+        self.assertGreaterEqual(protein.score, best.score)
+        key = batch.turns([protein.directions])[0].tobytes()
+        self.assertIn(key, algorithm.tabu)
+
+    def test_tabu_search(self):
+        """Method that tests running tabu search"""
+        random.seed(0)
+        algorithm = TabuSearch("HHPHHHPHPHHHPH")
+        best = algorithm.run(iterations=100, tenure=20)
+        self.assertTrue(best.is_valid)
+        self.assertLessEqual(best.score, -6)
+        self.assertEqual(algorithm.stop_reason, "completed")
+        self.assertLessEqual(len(algorithm.tabu), 20)
+
+        algorithm.run(iterations=100, max_evaluations=50)
+        self.assertEqual(algorithm.stop_reason, "max_evaluations")
+
+    def test_tabu_search_unbonded(self):
+        """Method that tests a valid fold is found when no fold scores below
+        0, and that the shortest proteins have room to run"""
+        random.seed(0)
+        for types in ("HPHPHPHPH", "HP", "H"):
+            best = TabuSearch(types).run(iterations=20)
+            self.assertTrue(best.is_valid)
+            self.assertEqual(best.score, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,6 @@ if __name__ == "__main__":
     test_prot = Protein("HHHHHHHPPP", [1, 2])
     print(test_prot)
     visualize_protein(test_prot)
-    greedy(test_prot, prev=test_prot.aminos[1])
+    greedy(test_prot)
     print(test_prot)
     visualize_protein(test_prot)
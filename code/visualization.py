@@ -1,15 +1,23 @@
 # Module imports
+from collections import Counter
+from itertools import islice
 import matplotlib.pyplot as plot
 from matplotlib.path import Path
 import matplotlib.patches as patches
+import numpy as np
 import os
 import pandas as pd
-from typing import Any, Callable, Union
+from typing import Any, Callable, Optional, Union
 
 # Local imports
+from algorithms.random_protein import iter_random_folds
+from classes import batch
 from classes.amino import Amino
 from classes.protein import Protein
 
+# the amount of random folds to score at once in `visualize_scores`
+SCORE_CHUNK = 10000
+
 
 def visualize_protein(
             prot: Protein,
@@ -31,7 +39,7 @@ def visualize_protein(
     save_fig_filename : Union[str, bytes]
         the filename to save the figure to, if the save_fig flag is set,
         by default it is set to a string of amino types of the given protein,
-        followed by a sha1 hash of the given protein instance (using hash()),
+        followed by a sha1 hash of the given protein instance (`Protein.to_sha1`),
         followed by the file extension '.png'
 
     See Also
@@ -178,17 +186,31 @@ def visualize_protein(
 
 def visualize_scores(
         prot_str: str,
-        algorithm: Callable[[Union[str, Protein]], Any], iterations=100
+        algorithm: Optional[Callable[[Union[str, Protein]], Any]] = None,
+        iterations=100,
+        seed: Optional[int] = None,
+        processes: Optional[int] = None
         ) -> None:
     """Assesses average performance of an algorithm and visualizes the results
 
+    Only the amount of times every score was found is kept, so any amount of
+    iterations fits in memory.
+
     Parameters
     ----------
     prot_str : str
         string representing the protein to test the algorithm with
-    algorithm : Callable[[Union[str, Protein]], Any]
-        the algorithm to test
-
+    algorithm : Callable[[Union[str, Protein]], Any], optional
+        the algorithm to test, which folds the protein it is given in place;
+        by default the protein is folded randomly, see
+        `random_protein.iter_random_folds`, and scored many folds at a time
+    iterations : int, optional
+        the amount of times to fold the protein, by default 100
+    seed : int, optional
+        the seed of the random folds, when no algorithm is given
+    processes : int, optional
+        the amount of processes to make the random folds with, when no
+        algorithm is given; by default only this one
 
     Notes
     --------
@@ -197,18 +219,27 @@ def visualize_scores(
     for example of counting occurances with pandas, which goes nicely with
     matplotlib
     """
-    scores = []
-    for i in range(0, iterations):
-        prot = Protein(prot_str)
-        algorithm(prot)
-        scores.append(prot.score)
-
-    score_freq = pd.Series(scores).value_counts()
+    scores = Counter()
+    if algorithm is None:
+        folds = iter_random_folds(
+            prot_str, seed, amount=iterations, processes=processes
+        )
+        chunk = list(islice(folds, SCORE_CHUNK))
+        while chunk:
+            scores.update(batch.score(prot_str, np.array(chunk)).tolist())
+            chunk = list(islice(folds, SCORE_CHUNK))
+    else:
+        for i in range(0, iterations):
+            prot = Protein(prot_str)
+            algorithm(prot)
+            scores[prot.score] += 1
+
+    score_freq = pd.Series(scores).sort_values(ascending=False)
     ax = score_freq.plot.bar(x="frequency", y="scores")
     ax.set_xlabel("Frequency")
     ax.set_ylabel("Score")
     ax.set_title(
-        f"Distribution of scores for '{prot.types}' "
+        f"Distribution of scores for '{prot_str.upper()}' "
         f"at {iterations} iterations"
     )
     plot.show()